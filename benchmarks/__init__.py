@@ -0,0 +1 @@
+"""Benchmarks for the NoIP Monitor integration."""
@@ -0,0 +1,271 @@
+"""Benchmark NoIPClient and NoIPDataUpdateCoordinator against a local stand-in server.
+
+Run from the repository root with Home Assistant installed:
+
+    python -m benchmarks.run_benchmarks --sizes 10 100 1000 10000 --output bench.json
+
+Compare against an earlier run and fail on a cycle-time regression:
+
+    python -m benchmarks.run_benchmarks --baseline bench.json --tolerance 0.25
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.noip_monitor import NoIPDataUpdateCoordinator, noip_api
+from custom_components.noip_monitor.const import (
+    CONF_BATCH_SIZE,
+    CONF_HOSTNAMES,
+    CONF_MAX_CONCURRENCY,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_CONCURRENCY,
+    DOMAIN,
+)
+from custom_components.noip_monitor.models import HostStatus
+from custom_components.noip_monitor.noip_api import NoIPClient
+from custom_components.noip_monitor.resilience import TokenBucket
+from custom_components.noip_monitor.shared import DISPATCHER_KEY
+
+from .stub_server import ErrorMix, StubDynupdateServer
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+# High enough that the account rate limiter never throttles a benchmark
+BENCH_RATE_LIMIT = 10_000_000
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def instrument(client: NoIPClient, latencies: list[float]) -> None:
+    """Record the latency of every request the client makes."""
+    original = client.async_get_hosts_ip
+
+    async def timed(hostnames: list[str], *args: Any, **kwargs: Any) -> dict[str, HostStatus]:
+        started = time.perf_counter()
+        try:
+            return await original(hostnames, *args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    client.async_get_hosts_ip = timed  # type: ignore[method-assign]
+
+
+def make_hostnames(count: int) -> list[str]:
+    """Return a deterministic list of hostnames."""
+    return [f"host{index}.ddns.net" for index in range(count)]
+
+
+async def run_client(
+    client: NoIPClient, hostnames: list[str], batch_size: int, concurrency: int
+) -> dict[str, HostStatus]:
+    """Fetch every hostname through the client alone."""
+    semaphore = asyncio.Semaphore(concurrency)
+    batches = [hostnames[i:i + batch_size] for i in range(0, len(hostnames), batch_size)]
+
+    async def fetch(batch: list[str]) -> dict[str, HostStatus]:
+        async with semaphore:
+            return await client.async_get_hosts_ip(batch)
+
+    results: dict[str, HostStatus] = {}
+    for result in await asyncio.gather(*(fetch(batch) for batch in batches)):
+        results.update(result)
+    return results
+
+
+async def run_coordinator(
+    hass: HomeAssistant, client: NoIPClient, hostnames: list[str], batch_size: int, concurrency: int
+) -> dict[str, HostStatus]:
+    """Run one full refresh cycle through a fresh coordinator."""
+    entry = SimpleNamespace(
+        entry_id="benchmark",
+        data={"username": client.username, "password": client.password},
+        async_on_unload=lambda func: None,
+        options={
+            CONF_HOSTNAMES: hostnames,
+            CONF_BATCH_SIZE: batch_size,
+            CONF_MAX_CONCURRENCY: concurrency,
+        },
+    )
+    # Fresh dispatcher per run: no results shared from the previous run, no global throttling
+    hass.data.get(DOMAIN, {}).pop(DISPATCHER_KEY, None)
+    coordinator = NoIPDataUpdateCoordinator(hass, client, entry)  # type: ignore[arg-type]
+    coordinator.dispatcher.rate_limiter = TokenBucket(BENCH_RATE_LIMIT / 60, BENCH_RATE_LIMIT)
+    coordinator.dispatcher.semaphore = asyncio.Semaphore(concurrency)
+    await coordinator.async_refresh()
+    if not coordinator.last_update_success:
+        raise RuntimeError(f"Refresh failed: {coordinator.last_exception}")
+    data: dict[str, HostStatus] = coordinator.data
+    return data
+
+
+async def measure(
+    server: StubDynupdateServer,
+    runner: Callable[[NoIPClient], Awaitable[dict[str, HostStatus]]],
+    track_memory: bool,
+) -> dict[str, Any]:
+    """Time one run (and optionally a second one under tracemalloc)."""
+    latencies: list[float] = []
+    client = NoIPClient(
+        "bench", "bench", requests_per_minute=BENCH_RATE_LIMIT, cache_ttl=0
+    )
+    instrument(client, latencies)
+    server.reset_counters()
+
+    started = time.perf_counter()
+    results = await runner(client)
+    elapsed = time.perf_counter() - started
+    requests = server.requests
+    await client.close()
+
+    # A run that never reached the server measures nothing
+    if not requests:
+        raise RuntimeError("No request reached the stand-in server")
+    if results and all(not host.connected for host in results.values()):
+        raise RuntimeError(f"Every one of {len(results)} hostnames is disconnected")
+
+    peak_memory = None
+    if track_memory:
+        client = NoIPClient(
+            "bench", "bench", requests_per_minute=BENCH_RATE_LIMIT, cache_ttl=0
+        )
+        tracemalloc.start()
+        await runner(client)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        await client.close()
+
+    return {
+        "cycle_seconds": round(elapsed, 4),
+        "requests": requests,
+        "requests_per_second": round(requests / elapsed, 1) if elapsed else None,
+        "hosts_per_second": round(len(results) / elapsed, 1) if elapsed else None,
+        "latency_p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "latency_p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "peak_memory_bytes": peak_memory,
+        "disconnected": sum(1 for host in results.values() if not host.connected),
+    }
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every benchmark and return the report."""
+    server = StubDynupdateServer(
+        latency=args.latency / 1000,
+        jitter=args.jitter / 1000,
+        errors=ErrorMix.parse(args.errors),
+        hang=args.hang,
+        seed=args.seed,
+    )
+    noip_api.NOIP_API_BASE_URL = await server.start()
+
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            for size in args.sizes:
+                hostnames = make_hostnames(size)
+                targets: dict[str, Callable[[NoIPClient], Awaitable[dict[str, HostStatus]]]] = {
+                    "client": lambda client, h=hostnames: run_client(
+                        client, h, args.batch_size, args.concurrency
+                    ),
+                    "coordinator": lambda client, h=hostnames: run_coordinator(
+                        hass, client, h, args.batch_size, args.concurrency
+                    ),
+                }
+                for target in args.targets:
+                    result = {"target": target, "hosts": size}
+                    result.update(await measure(server, targets[target], not args.no_memory))
+                    results.append(result)
+                    print(json.dumps(result), file=sys.stderr)
+        finally:
+            await hass.async_stop(force=True)
+            await server.stop()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "latency_ms": args.latency,
+            "jitter_ms": args.jitter,
+            "errors": args.errors,
+            "batch_size": args.batch_size,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def find_regressions(
+    report: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Return a description of every run slower than the baseline allows."""
+    previous = {(r["target"], r["hosts"]): r for r in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        old = previous.get((result["target"], result["hosts"]))
+        if old and result["cycle_seconds"] > old["cycle_seconds"] * (1 + tolerance):
+            regressions.append(
+                f"{result['target']} @ {result['hosts']} hosts: "
+                f"{result['cycle_seconds']}s vs {old['cycle_seconds']}s"
+            )
+    return regressions
+
+
+def main() -> int:
+    """Parse arguments, run the benchmarks and write the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--targets", nargs="+", choices=["client", "coordinator"],
+                        default=["client", "coordinator"])
+    parser.add_argument("--latency", type=float, default=20.0, help="Server latency in ms")
+    parser.add_argument("--jitter", type=float, default=5.0, help="Extra random latency in ms")
+    parser.add_argument("--errors", default="", help='Error mix, e.g. "nohost=0.05,server_error=0.01"')
+    parser.add_argument("--hang", type=float, default=60.0, help="Seconds a timed-out request hangs")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed cycle-time increase over the baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions = find_regressions(report, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
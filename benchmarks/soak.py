@@ -0,0 +1,374 @@
+"""Soak test: run the integration for many refresh cycles and reloads, watching for growth.
+
+Run from the repository root with pytest-homeassistant-custom-component
+installed (it provides the minimal Home Assistant test instance):
+
+    python -m benchmarks.soak --hosts 5000 --cycles 2000 --output soak.json
+
+The integration is set up through its config entry against a local
+stand-in server. Every cycle makes every hostname due and refreshes;
+every --reload-every cycles the entry is reloaded, its options changed,
+or its hostname list edited in place, in turn. Memory (tracemalloc),
+open sockets, live client sessions and live coordinators are sampled
+after every reload. The run fails when any of them grew beyond the
+allowed threshold after warm-up.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import patch
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.loader import DATA_CUSTOM_COMPONENTS
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.noip_monitor import NoIPDataUpdateCoordinator, noip_api, shared
+from custom_components.noip_monitor.const import (
+    CONF_BATCH_SIZE,
+    CONF_CACHE_TTL,
+    CONF_HOSTNAMES,
+    CONF_MAX_CONCURRENCY,
+    CONF_VERIFY_INTERVAL,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_VERIFY_INTERVAL,
+    DOMAIN,
+)
+
+from .run_benchmarks import make_hostnames
+from .stub_server import StubDynupdateServer
+
+# Large enough that neither the account nor the global rate limiter throttles the soak
+SOAK_RATE_BURST = 10**12
+# Hostnames removed and added back by each in-place hostname edit
+CHURN_FRACTION = 0.01
+RELOAD_KINDS = ("reload", "options", "hostnames")
+SETUP_TIMEOUT = 300  # seconds
+
+
+@contextmanager
+def memory_storage() -> Iterator[dict[str, Any]]:
+    """Keep Home Assistant storage in memory.
+
+    Unlike the test helper's mock storage, writes are not recorded as mock
+    calls, which would otherwise show up as growth.
+    """
+    files: dict[str, Any] = {}
+    original_load = Store._async_load
+
+    async def load(store: Store) -> Any:
+        if store._data is None:
+            if store.key not in files:
+                store._load_task = None
+                return None
+            store._data = files[store.key]
+        return await original_load(store)
+
+    async def write(store: Store, path: str, data: dict[str, Any]) -> None:
+        files[store.key] = data
+
+    async def remove(store: Store) -> None:
+        files.pop(store.key, None)
+
+    with (
+        patch.object(Store, "_async_load", load),
+        patch.object(Store, "_async_write_data", write),
+        patch.object(Store, "async_remove", remove),
+    ):
+        yield files
+
+
+def open_sockets() -> int | None:
+    """Return the number of sockets this process has open (Linux only)."""
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return None
+    count = 0
+    for fd in fds:
+        try:
+            if os.readlink(f"/proc/self/fd/{fd}").startswith("socket:"):
+                count += 1
+        except OSError:
+            continue
+    return count
+
+
+def live_objects(kind: type) -> int:
+    """Return how many instances of a class are still alive."""
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, kind))
+
+
+def sample(cycle: int, entry: MockConfigEntry) -> dict[str, Any]:
+    """Collect garbage and record the resource counters."""
+    gc.collect()
+    traced, _ = tracemalloc.get_traced_memory()
+    return {
+        "cycle": cycle,
+        "traced_bytes": traced,
+        "sockets": open_sockets(),
+        "client_sessions": live_objects(aiohttp.ClientSession),
+        "coordinators": live_objects(NoIPDataUpdateCoordinator),
+        # Callbacks of the current setup; they pile up when unloads skip them
+        "unload_callbacks": len(entry._on_unload or []),
+    }
+
+
+async def wait_for_refresh(hass: HomeAssistant, entry: MockConfigEntry) -> NoIPDataUpdateCoordinator:
+    """Wait until the entry's first background refresh has run and return its coordinator."""
+    deadline = time.monotonic() + SETUP_TIMEOUT
+    while True:
+        coordinator: NoIPDataUpdateCoordinator | None = hass.data.get(DOMAIN, {}).get(
+            entry.entry_id
+        )
+        if coordinator is not None and coordinator.metrics.cycles:
+            await hass.async_block_till_done()
+            return coordinator
+        if time.monotonic() > deadline:
+            raise RuntimeError("First refresh did not finish")
+        await asyncio.sleep(0.01)
+
+
+async def refresh_all(coordinator: NoIPDataUpdateCoordinator) -> None:
+    """Make every hostname due and run one refresh cycle."""
+    for hostname in coordinator.monitored_hostnames():
+        coordinator.scheduler.mark_due(hostname, 0)
+    await coordinator.async_refresh()
+    if not coordinator.last_update_success:
+        raise RuntimeError(f"Refresh failed: {coordinator.last_exception}")
+
+
+async def change_entry(
+    hass: HomeAssistant, entry: MockConfigEntry, kind: str, hostnames: list[str]
+) -> None:
+    """Reload the entry, change an option, or edit the hostname list in place."""
+    if kind == "reload":
+        await hass.config_entries.async_reload(entry.entry_id)
+    elif kind == "options":
+        # Toggling an option that does not matter with the WAN probe off forces a full reload
+        verify_interval = entry.options.get(CONF_VERIFY_INTERVAL, DEFAULT_VERIFY_INTERVAL)
+        hass.config_entries.async_update_entry(
+            entry,
+            options={**entry.options, CONF_VERIFY_INTERVAL: verify_interval % 1440 + 1},
+        )
+    else:
+        # Drop a few hostnames, then add the same ones back on the next edit
+        churn = max(1, int(len(hostnames) * CHURN_FRACTION))
+        current = entry.options[CONF_HOSTNAMES]
+        edited = hostnames[:-churn] if len(current) == len(hostnames) else hostnames
+        hass.config_entries.async_update_entry(
+            entry, options={**entry.options, CONF_HOSTNAMES: edited}
+        )
+    await hass.async_block_till_done()
+
+
+async def soak(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the soak test and return the report."""
+    server = StubDynupdateServer(latency=args.latency / 1000, seed=args.seed)
+    hostnames = make_hostnames(args.hosts)
+
+    with (
+        memory_storage(),
+        patch.object(noip_api, "NOIP_API_BASE_URL", await server.start()),
+        patch.object(noip_api, "RATE_LIMIT_BURST", SOAK_RATE_BURST),
+        patch.object(shared, "GLOBAL_RATE_BURST", SOAK_RATE_BURST),
+        patch.object(shared, "STAGGER_DELAY", 0),
+        # Every cycle must reach the server instead of reusing the previous results
+        patch.object(shared, "SHARE_WINDOW", 0),
+    ):
+        try:
+            async with async_test_home_assistant() as hass:
+                # The test instance hides custom integrations until this is dropped
+                hass.data.pop(DATA_CUSTOM_COMPONENTS, None)
+                return await run(hass, server, hostnames, args)
+        finally:
+            await server.stop()
+
+
+async def run(
+    hass: HomeAssistant,
+    server: StubDynupdateServer,
+    hostnames: list[str],
+    args: argparse.Namespace,
+) -> dict[str, Any]:
+    """Set the entry up, then refresh and reload it while sampling resources."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"username": "soak", "password": "soak"},
+        options={
+            CONF_HOSTNAMES: hostnames,
+            CONF_BATCH_SIZE: args.batch_size,
+            CONF_MAX_CONCURRENCY: args.concurrency,
+            # Like the share window, the result cache would answer every cycle
+            CONF_CACHE_TTL: 0,
+        },
+    )
+    entry.add_to_hass(hass)
+    tracemalloc.start()
+    before_setup = sample(0, entry)
+    started = time.perf_counter()
+    if not await hass.config_entries.async_setup(entry.entry_id):
+        raise RuntimeError("Setup failed")
+    coordinator = await wait_for_refresh(hass, entry)
+    setup_seconds = time.perf_counter() - started
+    after_setup = sample(0, entry)
+    entities = len(hass.states.async_entity_ids("sensor"))
+    setup_bytes = after_setup["traced_bytes"] - before_setup["traced_bytes"]
+
+    samples: list[dict[str, Any]] = []
+    baseline: dict[str, Any] | None = None
+    baseline_snapshot: tracemalloc.Snapshot | None = None
+    cycle_seconds: list[float] = []
+    for cycle in range(1, args.cycles + 1):
+        started = time.perf_counter()
+        await refresh_all(coordinator)
+        cycle_seconds.append(time.perf_counter() - started)
+
+        if cycle % args.reload_every:
+            continue
+        kind = RELOAD_KINDS[(cycle // args.reload_every - 1) % len(RELOAD_KINDS)]
+        await change_entry(hass, entry, kind, hostnames)
+        if kind != "hostnames":
+            coordinator = await wait_for_refresh(hass, entry)
+        point = sample(cycle, entry)
+        point["after"] = kind
+        samples.append(point)
+        print(json.dumps(point), file=sys.stderr)
+        # Growth is measured from the first sample after a full round of changes
+        if baseline is None and cycle >= args.reload_every * len(RELOAD_KINDS):
+            baseline = point
+            baseline_snapshot = tracemalloc.take_snapshot()
+
+    final = sample(args.cycles, entry)
+    top_growth: list[str] = []
+    if baseline_snapshot is not None:
+        stats = tracemalloc.take_snapshot().compare_to(baseline_snapshot, "lineno")
+        top_growth = [str(stat) for stat in stats[:10]]
+    tracemalloc.stop()
+
+    # Drop our own reference so only a leak can keep the coordinator alive
+    del coordinator
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    gc.collect()
+    after_unload = {
+        "client_sessions": live_objects(aiohttp.ClientSession),
+        "coordinators": live_objects(NoIPDataUpdateCoordinator),
+    }
+
+    report: dict[str, Any] = {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "hosts": args.hosts,
+            "cycles": args.cycles,
+            "reload_every": args.reload_every,
+            "batch_size": args.batch_size,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency,
+            "seed": args.seed,
+        },
+        "setup": {
+            "seconds": round(setup_seconds, 3),
+            "entities": entities,
+            "traced_bytes": setup_bytes,
+            "bytes_per_host": round(setup_bytes / args.hosts) if args.hosts else None,
+        },
+        "cycle_seconds_mean": round(sum(cycle_seconds) / len(cycle_seconds), 4)
+        if cycle_seconds
+        else None,
+        "requests": server.requests,
+        "samples": samples,
+        "baseline": baseline,
+        "final": final,
+        "after_unload": after_unload,
+        "top_growth": top_growth,
+    }
+    report["failures"] = find_growth(report, args)
+    return report
+
+
+def find_growth(report: dict[str, Any], args: argparse.Namespace) -> list[str]:
+    """Return a description of every resource that grew beyond its threshold."""
+    baseline, final = report["baseline"], report["final"]
+    if baseline is None:
+        return ["Not enough cycles for a baseline; raise --cycles or lower --reload-every"]
+
+    failures = []
+    allowed = max(args.max_growth * report["setup"]["traced_bytes"], args.min_growth_bytes)
+    growth = final["traced_bytes"] - baseline["traced_bytes"]
+    if growth > allowed:
+        failures.append(f"memory grew by {growth} bytes after warm-up (allowed {round(allowed)})")
+    if (
+        baseline["sockets"] is not None
+        and final["sockets"] is not None
+        and final["sockets"] > baseline["sockets"] + args.concurrency
+    ):
+        failures.append(f"open sockets grew from {baseline['sockets']} to {final['sockets']}")
+    if final["client_sessions"] > baseline["client_sessions"]:
+        failures.append(
+            f"client sessions grew from {baseline['client_sessions']} "
+            f"to {final['client_sessions']}"
+        )
+    if final["unload_callbacks"] > baseline["unload_callbacks"]:
+        failures.append(
+            f"entry unload callbacks grew from {baseline['unload_callbacks']} "
+            f"to {final['unload_callbacks']}"
+        )
+    if final["coordinators"] > 1:
+        failures.append(f"{final['coordinators']} coordinators alive for one entry")
+    if report["after_unload"]["coordinators"]:
+        failures.append("coordinator still alive after unloading the entry")
+    return failures
+
+
+def main() -> int:
+    """Parse arguments, run the soak test and write the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hosts", type=int, default=5000)
+    parser.add_argument("--cycles", type=int, default=300)
+    parser.add_argument("--reload-every", type=int, default=25,
+                        help="Cycles between reloads, option changes and hostname edits")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY)
+    parser.add_argument("--latency", type=float, default=1.0, help="Server latency in ms")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-growth", type=float, default=0.05,
+                        help="Allowed memory growth after warm-up, relative to the setup cost")
+    parser.add_argument("--min-growth-bytes", type=int, default=1 << 20,
+                        help="Memory growth always allowed, for small host counts")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(soak(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    for failure in report["failures"]:
+        print(f"GROWTH: {failure}", file=sys.stderr)
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""Local stand-ins for the NoIP dynupdate endpoint and a DNS resolver."""
+from __future__ import annotations
+
+import asyncio
+import random
+import struct
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from aiohttp import web
+
+UPDATE_PATH = "/nic/update"
+ECHO_PATH = "/ip"
+
+# DNS wire format
+_DNS_HEADER = struct.Struct("!HHHHHH")
+_DNS_RECORD = struct.Struct("!HHIH")
+_DNS_FLAGS_RESPONSE = 0x8180  # QR, RD and RA set
+_DNS_RCODE_NXDOMAIN = 3
+_DNS_TYPE_A = 1
+_DNS_TYPE_CNAME = 5
+_DNS_CLASS_IN = 1
+# Compression pointer to the question name, right after the header
+_DNS_QUESTION_POINTER = b"\xc0\x0c"
+
+
+@dataclass
+class ErrorMix:
+    """Probability of each failure mode, per request or per hostname.
+
+    nohost applies to individual hostnames; the others answer the whole
+    request, like the real service does for account-level errors.
+    """
+
+    nohost: float = 0.0
+    abuse: float = 0.0
+    badauth: float = 0.0
+    server_error: float = 0.0
+    timeout: float = 0.0
+
+    @classmethod
+    def parse(cls, spec: str) -> ErrorMix:
+        """Parse "nohost=0.05,server_error=0.01" style specifications."""
+        mix = cls()
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            name, _, value = item.partition("=")
+            if not hasattr(mix, name):
+                raise ValueError(f"Unknown error kind: {name}")
+            setattr(mix, name, float(value))
+        return mix
+
+
+@dataclass
+class StubDynupdateServer:
+    """aiohttp server emulating dynupdate responses with latency and errors."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    errors: ErrorMix = field(default_factory=ErrorMix)
+    hang: float = 60.0
+    seed: int = 0
+    ips: dict[str, str] = field(default_factory=dict)
+    wan_ip: str = "203.0.113.1"
+    requests: int = 0
+    echo_requests: int = 0
+    hostnames: int = 0
+    bytes_sent: int = 0
+
+    def __post_init__(self) -> None:
+        """Set up the random source and the web application."""
+        self._random = random.Random(self.seed)
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+        self.echo_url = ""
+
+    def ip_for(self, hostname: str) -> str:
+        """Return the address a hostname currently points at."""
+        if hostname not in self.ips:
+            index = len(self.ips)
+            self.ips[hostname] = f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}"
+        return self.ips[hostname]
+
+    async def _handle_update(self, request: web.Request) -> web.Response:
+        """Answer a (multi-host) dynupdate request."""
+        hostnames = [h for h in request.query.get("hostname", "").split(",") if h]
+        self.requests += 1
+        self.hostnames += len(hostnames)
+
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        roll = self._random.random
+        errors = self.errors
+        if roll() < errors.timeout:
+            await asyncio.sleep(self.hang)
+        if roll() < errors.server_error:
+            return self._respond("911", status=503)
+        if roll() < errors.badauth:
+            return self._respond("badauth", status=401)
+        if roll() < errors.abuse:
+            return self._respond("abuse")
+
+        lines = [
+            "nohost" if roll() < errors.nohost else f"nochg {self.ip_for(hostname)}"
+            for hostname in hostnames
+        ]
+        return self._respond("\n".join(lines))
+
+    async def _handle_echo(self, request: web.Request) -> web.Response:
+        """Answer an IP-echo request with the configured WAN IP."""
+        self.echo_requests += 1
+        return web.Response(text=self.wan_ip)
+
+    def _respond(self, text: str, status: int = 200) -> web.Response:
+        """Build a plain-text response and account for its size."""
+        self.bytes_sent += len(text)
+        return web.Response(text=text, status=status)
+
+    def reset_counters(self) -> None:
+        """Reset request statistics between runs."""
+        self.requests = 0
+        self.hostnames = 0
+        self.bytes_sent = 0
+        self.echo_requests = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the update URL.
+
+        The IP-echo endpoint is served alongside, at echo_url.
+        """
+        app = web.Application()
+        app.router.add_get(UPDATE_PATH, self._handle_update)
+        app.router.add_get(ECHO_PATH, self._handle_echo)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.url = f"http://{host}:{bound_port}{UPDATE_PATH}"
+        self.echo_url = f"http://{host}:{bound_port}{ECHO_PATH}"
+        return self.url
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def _encode_name(name: str) -> bytes:
+    """Encode a name as uncompressed DNS labels."""
+    return b"".join(
+        bytes([len(label)]) + label for label in (part.encode() for part in name.split("."))
+    ) + b"\x00"
+
+
+@dataclass
+class StubDNSServer:
+    """UDP server answering A queries for a fixed set of hostnames.
+
+    Hostnames in records get an A record (behind a CNAME when listed in
+    cnames), those in empty get NOERROR without an answer, those in drop
+    get no response at all and those in misdirected get an answer with
+    the wrong query ID. Any other hostname is answered with NXDOMAIN.
+    """
+
+    records: dict[str, str] = field(default_factory=dict)
+    cnames: dict[str, str] = field(default_factory=dict)
+    empty: set[str] = field(default_factory=set)
+    drop: set[str] = field(default_factory=set)
+    misdirected: set[str] = field(default_factory=set)
+    queries: int = 0
+
+    def __post_init__(self) -> None:
+        """Set up the transport slot."""
+        self._transport: asyncio.DatagramTransport | None = None
+        self.address = ""
+
+    def answer(self, query: bytes) -> bytes | None:
+        """Build the response to a query, or None to drop it."""
+        query_id, _, _, _, _, _ = _DNS_HEADER.unpack_from(query)
+        labels: list[str] = []
+        offset = _DNS_HEADER.size
+        while length := query[offset]:
+            labels.append(query[offset + 1:offset + 1 + length].decode("ascii"))
+            offset += length + 1
+        question = query[_DNS_HEADER.size:offset + 5]
+        hostname = ".".join(labels).lower()
+
+        if hostname in self.drop:
+            return None
+        if hostname in self.misdirected:
+            query_id ^= 0xFFFF
+
+        answers: list[bytes] = []
+        rcode = 0
+        if hostname in self.records:
+            owner = _DNS_QUESTION_POINTER
+            if hostname in self.cnames:
+                target = _encode_name(self.cnames[hostname])
+                answers.append(
+                    owner
+                    + _DNS_RECORD.pack(_DNS_TYPE_CNAME, _DNS_CLASS_IN, 60, len(target))
+                    + target
+                )
+                owner = target
+            address = bytes(int(octet) for octet in self.records[hostname].split("."))
+            answers.append(
+                owner + _DNS_RECORD.pack(_DNS_TYPE_A, _DNS_CLASS_IN, 60, 4) + address
+            )
+        elif hostname not in self.empty:
+            rcode = _DNS_RCODE_NXDOMAIN
+
+        header = _DNS_HEADER.pack(
+            query_id, _DNS_FLAGS_RESPONSE | rcode, 1, len(answers), 0, 0
+        )
+        return header + question + b"".join(answers)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the resolver address as "host:port"."""
+        server = self
+
+        class _Protocol(asyncio.DatagramProtocol):
+            def connection_made(self, transport: asyncio.BaseTransport) -> None:
+                server._transport = cast(asyncio.DatagramTransport, transport)
+
+            def datagram_received(self, data: bytes, addr: tuple[str | Any, int]) -> None:
+                server.queries += 1
+                response = server.answer(data)
+                if response is not None and server._transport is not None:
+                    server._transport.sendto(response, addr)
+
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            _Protocol, local_addr=(host, port)
+        )
+        bound_port = transport.get_extra_info("sockname")[1]
+        self.address = f"{host}:{bound_port}"
+        return self.address
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
@@ -1,47 +1,176 @@
 """The NoIP Monitor integration."""
 from __future__ import annotations
 
+import asyncio
+import inspect
 import logging
+import time
+from collections import deque
+from collections.abc import Iterable
+from contextlib import AbstractContextManager, nullcontext
 from datetime import timedelta
+from functools import partial
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN
+from .const import (
+    BACKEND_DNS,
+    CONF_BACKEND,
+    CONF_BATCH_SIZE,
+    CONF_CACHE_TTL,
+    CONF_CONNECT_TIMEOUT,
+    CONF_DNS_RESOLVER,
+    CONF_HEDGE_PERCENTILE,
+    CONF_HISTORY_DEPTH,
+    CONF_HOSTNAMES,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_RATE_LIMIT,
+    CONF_READ_TIMEOUT,
+    CONF_RETRIES,
+    CONF_SAFETY_INTERVAL,
+    CONF_TRIGGER_ENTITY,
+    CONF_TRIGGER_EVENT,
+    CONF_VERIFY_INTERVAL,
+    CONF_WAN_PROBE,
+    CONF_WAN_PROBE_URL,
+    DEFAULT_BACKEND,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DNS_RESOLVER,
+    DEFAULT_HEDGE_PERCENTILE,
+    DEFAULT_HISTORY_DEPTH,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_RETRIES,
+    DEFAULT_SAFETY_INTERVAL,
+    DEFAULT_VERIFY_INTERVAL,
+    DEFAULT_WAN_PROBE,
+    DEFAULT_WAN_PROBE_URL,
+    DOMAIN,
+    EVENT_IP_CHANGED,
+    MAX_PROFILE_CYCLES,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .aggregates import HostAggregates
+from .dns_backend import DNSResolverClient
+from .history import HistoryTracker
+from .hostnames import normalize_hostname
+from .models import HostStatus, ResponseCode
 from .noip_api import NoIPClient
+from .profiling import CycleProfiler
+from .resilience import CircuitOpenError
+from .scheduler import HostScheduler
+from .services import async_setup_services
+from .shared import get_dispatcher
+from .trigger import RefreshTrigger
+from .wan_probe import WANProbe
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
 
-UPDATE_INTERVAL = timedelta(minutes=5)
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Hosts due within this many seconds are fetched in the current tick
+SCHEDULE_SLACK = 15
+MIN_TICK = timedelta(seconds=SCHEDULE_SLACK)
+# On-demand refresh requests arriving within this many seconds share one lookup
+REFRESH_DEBOUNCE = 1.0
+# Stands in for a profiling span while no profiler is armed
+NO_SPAN: AbstractContextManager[None] = nullcontext()
+# Newer Home Assistant versions take the coordinator's config entry as an
+# argument; older ones only pick it up from the entry being set up
+COORDINATOR_TAKES_ENTRY = (
+    "config_entry" in inspect.signature(DataUpdateCoordinator.__init__).parameters
+)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the NoIP Monitor services."""
+    async_setup_services(hass)
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up NoIP Monitor from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
+    session = async_get_clientsession(hass)
+
     # Create API client
     client = NoIPClient(
         username=entry.data["username"],
         password=entry.data["password"],
         token_2fa=entry.data.get("2fa_token"),
+        session=session,
+        requests_per_minute=entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+        connect_timeout=entry.options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+        read_timeout=entry.options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+        retries=entry.options.get(CONF_RETRIES, DEFAULT_RETRIES),
+        hedge_percentile=entry.options.get(CONF_HEDGE_PERCENTILE, DEFAULT_HEDGE_PERCENTILE),
+        cache_ttl=entry.options.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL),
     )
 
-    # Create coordinator
-    coordinator = NoIPDataUpdateCoordinator(hass, client, entry)
-    
-    await coordinator.async_config_entry_first_refresh()
+    # Create the lookup backend; the NoIP client is used unless DNS is selected
+    backend: NoIPClient | DNSResolverClient = client
+    if entry.options.get(CONF_BACKEND, DEFAULT_BACKEND) == BACKEND_DNS:
+        backend = DNSResolverClient(
+            entry.options.get(CONF_DNS_RESOLVER, DEFAULT_DNS_RESOLVER),
+            metrics=client.metrics,
+        )
+
+    # Optionally detect the WAN IP once per cycle to skip hosts that match it
+    wan_probe = None
+    if entry.options.get(CONF_WAN_PROBE, DEFAULT_WAN_PROBE):
+        wan_probe = WANProbe(
+            session, entry.options.get(CONF_WAN_PROBE_URL, DEFAULT_WAN_PROBE_URL)
+        )
+
+    # Create coordinator, starting from the last known results
+    coordinator = NoIPDataUpdateCoordinator(hass, client, entry, backend, wan_probe)
+    await coordinator.async_restore()
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     # Forward the setup to the sensor platform
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Refresh right away when the linked entity or event signals a WAN change
+    if coordinator.trigger is not None:
+        entry.async_on_unload(coordinator.trigger.async_start())
+
+    # Run the first refresh in the background so startup does not wait on NoIP,
+    # staggered so the cycles of several entries do not line up
+    start_delay = coordinator.dispatcher.register(entry.entry_id)
+
+    async def _async_first_refresh() -> None:
+        if start_delay:
+            await asyncio.sleep(start_delay)
+        await coordinator.async_refresh()
+
+    entry.async_create_background_task(
+        hass, _async_first_refresh(), f"{DOMAIN}_first_refresh_{entry.entry_id}"
+    )
+
     # Register update listener for options changes
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     return True
 
@@ -51,18 +180,95 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok: bool = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: NoIPDataUpdateCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN].pop(f"{entry.entry_id}_entities", None)
+        coordinator.dispatcher.unregister(entry.entry_id)
+        await coordinator.client.close()
+        if coordinator.backend is not coordinator.client:
+            await coordinator.backend.close()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored state of a deleted config entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an old config entry."""
+    if entry.version == 1 and entry.minor_version < 2:
+        # 1.2 stores hostnames normalized; rename the ones saved before that
+        # once, together with their sensors and persisted state
+        renamed: dict[str, str] = {}
+        hostnames: list[str] = []
+        for hostname in entry.options.get(CONF_HOSTNAMES, []):
+            normalized = normalize_hostname(hostname) or hostname
+            if normalized != hostname:
+                renamed[hostname] = normalized
+            if normalized not in hostnames:
+                hostnames.append(normalized)
+
+        if renamed:
+            registry = er.async_get(hass)
+            for old, new in renamed.items():
+                entity_id = registry.async_get_entity_id(
+                    Platform.SENSOR, DOMAIN, f"{entry.entry_id}_{old}"
+                )
+                if entity_id is None or registry.async_get_entity_id(
+                    Platform.SENSOR, DOMAIN, f"{entry.entry_id}_{new}"
+                ):
+                    continue
+                registry.async_update_entity(
+                    entity_id, new_unique_id=f"{entry.entry_id}_{new}"
+                )
+
+            store: Store[dict[str, Any]] = Store(
+                hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+            )
+            if stored := await store.async_load():
+                hosts = {}
+                for hostname, host in stored.get("hosts", {}).items():
+                    hostname = renamed.get(hostname, hostname)
+                    hosts[hostname] = {**host, "hostname": hostname}
+                stored["hosts"] = hosts
+                history = stored.get("history", {})
+                for key in ("last_ip", "transitions"):
+                    if key in history:
+                        history[key] = {
+                            renamed.get(hostname, hostname): value
+                            for hostname, value in history[key].items()
+                        }
+                await store.async_save(stored)
+
+        options = dict(entry.options)
+        if CONF_HOSTNAMES in options:
+            options[CONF_HOSTNAMES] = hostnames
+        hass.config_entries.async_update_entry(entry, options=options, minor_version=2)
+        _LOGGER.debug("Migrated config entry to version 1.2, renamed %s", renamed)
+
+    return True
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options, in place when only the hostnames changed."""
+    coordinator: NoIPDataUpdateCoordinator | None = hass.data[DOMAIN].get(entry.entry_id)
+    if coordinator is not None and coordinator.can_apply_in_place(entry):
+        await coordinator.async_apply_hostnames()
+        return
+    await async_reload_entry(hass, entry)
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry when options change."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    """Reload config entry when options change.
+
+    The reload goes through the config entries manager, so the entry passes
+    through its regular unload and setup states and its unload callbacks run.
+    """
+    await hass.config_entries.async_reload(entry.entry_id)
 
 
-class NoIPDataUpdateCoordinator(DataUpdateCoordinator):
+class NoIPDataUpdateCoordinator(DataUpdateCoordinator[dict[str, HostStatus]]):
     """Class to manage fetching NoIP data."""
 
     def __init__(
@@ -70,20 +276,317 @@ class NoIPDataUpdateCoordinator(DataUpdateCoordinator):
         hass: HomeAssistant,
         client: NoIPClient,
         entry: ConfigEntry,
+        backend: NoIPClient | DNSResolverClient | None = None,
+        wan_probe: WANProbe | None = None,
     ) -> None:
         """Initialize."""
         self.client = client
+        self.backend = backend if backend is not None else client
+        self.wan_probe = wan_probe
+        # Last detected public IP and when each hostname was last looked up
+        self.wan_ip: str | None = None
+        self._verified_at: dict[str, float] = {}
+        self.verify_interval = 60 * float(
+            entry.options.get(CONF_VERIFY_INTERVAL, DEFAULT_VERIFY_INTERVAL)
+        )
         self.entry = entry
+        # Entry settings the client, backend and scheduler were built from
+        self._applied_data = dict(entry.data)
+        self._applied_options = dict(entry.options)
+        # Shared by the client and backend created in async_setup_entry
+        self.metrics = self.backend.metrics
+        self.dispatcher = get_dispatcher(hass)
+        self.last_cycle_duration: float | None = None
+        self.last_cycle_hosts = 0
+        # Hostnames whose result changed in the last refresh
+        self.changed_hosts: set[str] = set()
+        # Bumped whenever the set of hostnames in the data changes
+        self.hostnames_version = 0
+        self.aggregates = HostAggregates()
+        self.history = HistoryTracker(
+            int(entry.options.get(CONF_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH))
+        )
+        # On-demand refreshes: a future per hostname queued or being looked up
+        self._refreshing: dict[str, asyncio.Future[HostStatus | None]] = {}
+        self._refresh_queue: list[str] = []
+        self._refresh_force = False
+        self._refresh_task: asyncio.Task[None] | None = None
+        # Armed by the profile service; reports of the latest profiled cycles
+        self.profiler: CycleProfiler | None = None
+        self.profiles: deque[dict[str, Any]] = deque(maxlen=MAX_PROFILE_CYCLES)
+        # Monotonic time the refresh timer was last set to fire at
+        self._next_tick: float | None = None
+
+        min_interval = timedelta(
+            minutes=entry.options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)
+        )
+        max_interval = timedelta(
+            minutes=entry.options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL)
+        )
+        self.trigger: RefreshTrigger | None = None
+        trigger_entity = entry.options.get(CONF_TRIGGER_ENTITY) or None
+        trigger_event = entry.options.get(CONF_TRIGGER_EVENT) or None
+        if trigger_entity or trigger_event:
+            self.trigger = RefreshTrigger(
+                hass, trigger_entity, trigger_event, self.async_handle_trigger
+            )
+            # Changes are signalled, so stable hostnames only need a safety poll
+            max_interval = max(
+                max_interval,
+                timedelta(
+                    minutes=entry.options.get(CONF_SAFETY_INTERVAL, DEFAULT_SAFETY_INTERVAL)
+                ),
+            )
+        self.scheduler = HostScheduler(
+            min_interval.total_seconds(), max_interval.total_seconds()
+        )
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"
+        )
 
+        # The entry runs async_shutdown, and so the final snapshot save, on unload
+        entry_kwargs: dict[str, Any] = {"config_entry": entry} if COORDINATOR_TAKES_ENTRY else {}
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=UPDATE_INTERVAL,
+            update_interval=min_interval,
+            **entry_kwargs,
+        )
+
+    async def async_shutdown(self) -> None:
+        """Stop refreshing and write the pending snapshot right away.
+
+        A delayed save left pending would keep this coordinator alive after
+        unload and could overwrite what its replacement saved in the meantime.
+        """
+        await super().async_shutdown()
+        if self.data is not None:
+            await self._store.async_save(self._snapshot())
+
+    def can_apply_in_place(self, entry: ConfigEntry) -> bool:
+        """Return whether the entry's changes are limited to the hostnames."""
+        if dict(entry.data) != self._applied_data:
+            return False
+        new_options = {k: v for k, v in entry.options.items() if k != CONF_HOSTNAMES}
+        old_options = {k: v for k, v in self._applied_options.items() if k != CONF_HOSTNAMES}
+        return new_options == old_options
+
+    async def async_apply_hostnames(self) -> None:
+        """Pick up an edited hostname list without rebuilding anything.
+
+        The next refresh looks up only the added hostnames (they are due
+        right away) and drops the removed ones; the others keep their data,
+        schedule and sensors.
+        """
+        old = set(self._applied_options.get(CONF_HOSTNAMES, []))
+        new = set(self.entry.options.get(CONF_HOSTNAMES, []))
+        self._applied_options = dict(self.entry.options)
+        _LOGGER.info(
+            "Hostnames updated in place: %d added, %d removed", len(new - old), len(old - new)
         )
+        await self.async_request_refresh()
+
+    async def async_restore(self) -> None:
+        """Load the last known results persisted by a previous run."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+
+        self.history.load(stored.get("history", {}))
+        restored = {
+            hostname: HostStatus.from_dict(host)
+            for hostname, host in stored.get("hosts", {}).items()
+        }
+        hostnames = self.entry.options.get("hostnames") or list(restored)
+        self.data = self._merge_results(hostnames, restored)
+        _LOGGER.debug("Restored last known state of %d hostnames", len(self.data))
+
+    @callback
+    def async_arm_profiler(self, cycles: int) -> None:
+        """Profile the next refresh cycles; their reports go to diagnostics."""
+        self.profiles.clear()
+        self.profiler = CycleProfiler(cycles, self.profiles.append)
+        _LOGGER.info("Profiling the next %d refresh cycles", cycles)
+
+    async def _async_refresh(
+        self,
+        log_failures: bool = True,
+        raise_on_auth_failed: bool = False,
+        scheduled: bool = False,
+        raise_on_entry_error: bool = False,
+    ) -> None:
+        """Refresh data, profiling the whole cycle while a profiler is armed."""
+        profiler = self.profiler
+        if profiler is None:
+            await super()._async_refresh(
+                log_failures, raise_on_auth_failed, scheduled, raise_on_entry_error
+            )
+            return
+
+        with profiler.cycle():
+            await super()._async_refresh(
+                log_failures, raise_on_auth_failed, scheduled, raise_on_entry_error
+            )
+        if profiler.done and self.profiler is profiler:
+            self.profiler = None
+            _LOGGER.info("Profiling finished; the reports are in the diagnostics")
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, timed while profiling."""
+        with self._span("notify"):
+            super().async_update_listeners()
+
+    def _span(self, name: str) -> AbstractContextManager[None]:
+        """Return a profiling span, or a no-op one when no profiler is armed."""
+        return NO_SPAN if self.profiler is None else self.profiler.span(name)
 
-    async def _async_update_data(self) -> dict:
+    async def async_refresh_hosts(
+        self, hostnames: Iterable[str], force: bool = False
+    ) -> dict[str, HostStatus]:
+        """Look up the given hostnames now, outside the regular schedule.
+
+        Lookups are single-flight per hostname: a hostname already queued or
+        being looked up is joined instead of fetched again, and requests
+        arriving within REFRESH_DEBOUNCE seconds of each other are sent
+        together. Hostnames that are not monitored are ignored. Results
+        still within the cache TTL are reused unless force is set; a
+        forced request forces the whole batch it is sent with. Results other
+        entries fetched within the share window are not reused.
+        """
+        monitored = set(self.monitored_hostnames())
+        futures: dict[str, asyncio.Future[HostStatus | None]] = {}
+        for hostname in hostnames:
+            if hostname not in monitored or hostname in futures:
+                continue
+            future = self._refreshing.get(hostname)
+            if future is None:
+                future = self._refreshing[hostname] = self.hass.loop.create_future()
+                self._refresh_queue.append(hostname)
+                self._refresh_force |= force
+            futures[hostname] = future
+
+        if self._refresh_queue and self._refresh_task is None:
+            self._refresh_task = self.entry.async_create_background_task(
+                self.hass,
+                self._async_run_refresh(),
+                f"{DOMAIN}_refresh_{self.entry.entry_id}",
+            )
+
+        results: dict[str, HostStatus] = {}
+        for hostname, future in futures.items():
+            result = await asyncio.shield(future)
+            if result is not None:
+                results[hostname] = result
+        return results
+
+    async def _async_run_refresh(self) -> None:
+        """Look up the queued hostnames once the debounce delay has passed."""
+        batch: list[str] = []
+        results: dict[str, HostStatus] = {}
+        try:
+            await asyncio.sleep(REFRESH_DEBOUNCE)
+            force = self._refresh_force
+            batch = self._take_refresh_queue()
+            _LOGGER.debug("Refreshing on demand (force: %s): %s", force, batch)
+            results = await self._async_fetch_hosts(batch, force=force, share=False)
+            self._merge_refreshed(results)
+        finally:
+            # Resolve every waiting caller, even when cancelled on unload
+            for hostname in batch or self._take_refresh_queue():
+                self._refreshing.pop(hostname).set_result(results.get(hostname))
+
+    def _take_refresh_queue(self) -> list[str]:
+        """Return the queued on-demand hostnames and start a new queue."""
+        batch, self._refresh_queue = self._refresh_queue, []
+        self._refresh_force = False
+        self._refresh_task = None
+        return batch
+
+    @callback
+    def _merge_refreshed(self, results: dict[str, HostStatus]) -> None:
+        """Merge on-demand results into the data, leaving the refresh timer alone.
+
+        Only hostnames that changed or failed are rescheduled (back to the
+        minimum interval), exactly as a regular refresh would.
+        """
+        hostnames = self.monitored_hostnames()
+        results = {hostname: results[hostname] for hostname in hostnames if hostname in results}
+        if not results:
+            return
+
+        now = time.monotonic()
+        previous = self.data or {}
+        for hostname, result in results.items():
+            old = previous.get(hostname)
+            changed = old is None or (old.ip, old.connected) != (result.ip, result.connected)
+            if changed or not result.connected:
+                self.scheduler.record(hostname, now, changed, not result.connected)
+            self._verified_at[hostname] = now
+
+        # async_set_updated_data would reschedule the regular refresh
+        self.data = self._merge_results(hostnames, results)
+        self.async_update_listeners()
+        self._bring_tick_forward()
+        if self.changed_hosts:
+            self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_handle_trigger(self, old_ip: str | None, hostnames: list[str] | None) -> None:
+        """Refresh the hostnames affected by a WAN change signalled by the trigger.
+
+        When the previous WAN IP is known, only the hostnames pointing at it
+        (or not looked up yet) are refreshed; otherwise every hostname given,
+        or every monitored hostname.
+        """
+        data = self.data or {}
+        candidates = hostnames if hostnames is not None else self.monitored_hostnames()
+        affected = [
+            hostname
+            for hostname in candidates
+            if old_ip is None or (host := data.get(hostname)) is None or host.ip == old_ip
+        ]
+        if not affected:
+            _LOGGER.debug("Trigger fired, but no hostname points at %s", old_ip)
+            return
+        self.entry.async_create_background_task(
+            self.hass,
+            self._async_refresh_triggered(affected, old_ip),
+            f"{DOMAIN}_trigger_{self.entry.entry_id}",
+        )
+
+    async def _async_refresh_triggered(self, hostnames: list[str], old_ip: str | None) -> None:
+        """Look up hostnames after a trigger, rechecking those NoIP has not updated yet."""
+        _LOGGER.debug("Refreshing after trigger: %s", hostnames)
+        results = await self.async_refresh_hosts(hostnames, force=True)
+        if old_ip is None:
+            return
+        # The DNS update usually lands after the WAN change; poll the hostnames
+        # still pointing at the old address at the minimum interval until it does
+        now = time.monotonic()
+        stale = [hostname for hostname, result in results.items() if result.ip == old_ip]
+        for hostname in stale:
+            self.scheduler.record(hostname, now, False, True)
+        if stale:
+            _LOGGER.info("%d hostnames still point at %s; rechecking soon", len(stale), old_ip)
+            self._bring_tick_forward()
+
+    def monitored_hostnames(self) -> list[str]:
+        """Return the configured hostnames, or the known ones when none are configured."""
+        return list(self.entry.options.get(CONF_HOSTNAMES) or self.data or [])
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the data to persist."""
+        return {
+            "hosts": {hostname: host.as_dict() for hostname, host in (self.data or {}).items()},
+            "history": self.history.as_dict(),
+        }
+
+    async def _async_update_data(self) -> dict[str, HostStatus]:
         """Update data via library."""
+        self.changed_hosts = set()
         try:
             hostnames = self.entry.options.get("hostnames", [])
             
@@ -95,21 +598,260 @@ class NoIPDataUpdateCoordinator(DataUpdateCoordinator):
                 hostnames_data = await self.client.async_get_hosts()
                 if hostnames_data:
                     _LOGGER.debug("Retrieved %d hosts from account", len(hostnames_data))
-                    return hostnames_data
+                    return self._merge_results(list(hostnames_data), hostnames_data)
                 _LOGGER.warning("No hostnames configured and unable to retrieve from account. Please configure hostnames manually.")
-                return {}
-            
-            # Fetch data for configured hostnames
-            data = {}
-            for hostname in hostnames:
-                _LOGGER.debug("Fetching data for hostname: %s", hostname)
-                host_data = await self.client.async_get_host_ip(hostname)
-                data[hostname] = host_data
-                _LOGGER.debug("Data for %s: %s", hostname, host_data)
+                return self._merge_results([], {})
             
-            _LOGGER.info("Successfully updated data for %d hostnames", len(data))
+            # Fetch only the hostnames that are due
+            started = time.monotonic()
+            self.scheduler.sync(hostnames, started)
+            if self.wan_probe is not None:
+                with self._span("probe"):
+                    await self._async_probe_wan(started)
+            due = self.scheduler.pop_due(started + SCHEDULE_SLACK)
+            due, matched = self._split_matching_wan(due, started)
+            with self._span("fetch"):
+                results = await self._async_fetch_hosts(due)
+            self.last_cycle_duration = time.monotonic() - started
+            self.last_cycle_hosts = len(results)
+            self.metrics.cycle_finished(self.last_cycle_duration)
+
+            with self._span("diff"):
+                for hostname in matched:
+                    # Still pointing at the WAN IP; back off without asking NoIP
+                    self.scheduler.record(hostname, started, False, False)
+
+                previous = self.data or {}
+                for hostname in due:
+                    if hostname not in results:
+                        # Skipped while the circuit was open; retry at the minimum interval
+                        self.scheduler.record(hostname, started, False, True)
+                for hostname, result in results.items():
+                    old = previous.get(hostname)
+                    changed = (
+                        old is None or (old.ip, old.connected) != (result.ip, result.connected)
+                    )
+                    failed = not result.connected
+                    self.scheduler.record(hostname, started, changed, failed)
+                    self._verified_at[hostname] = started
+
+                data = self._merge_results(hostnames, results)
+                self.aggregates.changed_last_cycle = len(self.changed_hosts & data.keys())
+                self._schedule_next_tick()
+                if self.changed_hosts:
+                    self._store.async_delay_save(self._snapshot, STORAGE_SAVE_DELAY)
+
+            _LOGGER.info(
+                "Successfully updated data for %d of %d hostnames in %.2fs "
+                "(%d matched the WAN IP)",
+                len(results),
+                len(data),
+                self.last_cycle_duration,
+                len(matched),
+            )
             return data
             
         except Exception as err:
             _LOGGER.error("Error communicating with NoIP API: %s", err, exc_info=True)
             raise UpdateFailed(f"Error communicating with NoIP API: {err}") from err
+
+    def _merge_results(
+        self, hostnames: list[str], results: dict[str, HostStatus]
+    ) -> dict[str, HostStatus]:
+        """Merge fresh results into the previous data and record what changed.
+
+        Hostnames that were not looked up keep their previous result. Every
+        address change is added to the history and fired as an event, and
+        the aggregates are updated from the changed hostnames only.
+        """
+        previous = self.data or {}
+        data = {
+            hostname: previous[hostname]
+            for hostname in hostnames
+            if hostname in previous
+        }
+        data.update(results)
+
+        self.changed_hosts = {
+            hostname
+            for hostname, result in results.items()
+            if previous.get(hostname) != result
+        }
+        if data.keys() != previous.keys():
+            removed = previous.keys() - data.keys()
+            self.changed_hosts.update(removed)
+            self.history.remove(removed)
+            for hostname in removed:
+                self._verified_at.pop(hostname, None)
+            self.hostnames_version += 1
+        _LOGGER.debug("Changed hostnames: %s", self.changed_hosts)
+
+        for hostname in self.changed_hosts:
+            self.aggregates.update(previous.get(hostname), data.get(hostname))
+
+        now = dt_util.utcnow().timestamp()
+        for hostname in self.changed_hosts:
+            result = data.get(hostname)
+            if result is None or result.ip is None or not result.connected:
+                continue
+            transition = self.history.record(hostname, result.ip, now)
+            if transition is not None:
+                _LOGGER.info(
+                    "IP of %s changed from %s to %s",
+                    hostname,
+                    transition.old_ip,
+                    transition.new_ip,
+                )
+                self.hass.bus.async_fire(
+                    EVENT_IP_CHANGED,
+                    {
+                        "entry_id": self.entry.entry_id,
+                        "hostname": hostname,
+                        "old_ip": transition.old_ip,
+                        "new_ip": transition.new_ip,
+                    },
+                )
+        return data
+
+    async def _async_probe_wan(self, now: float) -> None:
+        """Detect the WAN IP and make hosts that pointed at the old one due."""
+        assert self.wan_probe is not None
+        wan_ip = await self.wan_probe.async_get_ip()
+        previous, self.wan_ip = self.wan_ip, wan_ip
+        if wan_ip is None or previous is None or wan_ip == previous:
+            return
+
+        _LOGGER.info("WAN IP changed from %s to %s", previous, wan_ip)
+        for hostname, host in (self.data or {}).items():
+            if host.ip == previous:
+                self.scheduler.mark_due(hostname, now)
+
+    def _split_matching_wan(
+        self, hostnames: list[str], now: float
+    ) -> tuple[list[str], list[str]]:
+        """Split due hostnames into those to look up and those matching the WAN IP.
+
+        A hostname whose last known address is the WAN IP is skipped until
+        its verification interval has passed.
+        """
+        if self.wan_probe is None or self.wan_ip is None:
+            return hostnames, []
+
+        data = self.data or {}
+        lookup: list[str] = []
+        matched: list[str] = []
+        for hostname in hostnames:
+            host = data.get(hostname)
+            verified_at = self._verified_at.get(hostname)
+            if (
+                host is not None
+                and host.connected
+                and host.ip == self.wan_ip
+                and verified_at is not None
+                and now - verified_at < self.verify_interval
+            ):
+                matched.append(hostname)
+            else:
+                lookup.append(hostname)
+        return lookup, matched
+
+    def _schedule_next_tick(self) -> None:
+        """Wake up when the next hostname is due.
+
+        In WAN probe mode the probe runs at least every minimum interval.
+        """
+        next_due = self.scheduler.next_due()
+        if next_due is None:
+            delay = timedelta(seconds=self.scheduler.max_interval)
+        else:
+            delay = max(timedelta(seconds=next_due - time.monotonic()), MIN_TICK)
+        if self.wan_probe is not None:
+            delay = min(delay, timedelta(seconds=self.scheduler.min_interval))
+        self.update_interval = delay
+        self._next_tick = time.monotonic() + delay.total_seconds()
+
+    def _bring_tick_forward(self) -> None:
+        """Re-arm the refresh timer when a hostname is now due before it fires.
+
+        Refreshes outside the regular cycle leave the timer alone, which with
+        a long safety interval would hold back hostnames they rescheduled.
+        """
+        next_due = self.scheduler.next_due()
+        if next_due is None or self._next_tick is None or next_due >= self._next_tick:
+            return
+        self._schedule_next_tick()
+        if self._listeners:
+            self._schedule_refresh()
+
+    @property
+    def max_concurrency(self) -> int:
+        """Return the maximum number of concurrent NoIP requests."""
+        return int(self.entry.options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY))
+
+    @property
+    def batch_size(self) -> int:
+        """Return the number of hostnames packed into a single NoIP request."""
+        return int(self.entry.options.get(CONF_BATCH_SIZE, DEFAULT_BATCH_SIZE))
+
+    async def _async_fetch_hosts(
+        self, hostnames: list[str], force: bool = False, share: bool = True
+    ) -> dict[str, HostStatus]:
+        """Fetch all hostnames, sharing lookups with the other config entries.
+
+        Without share, results other entries fetched moments ago are not
+        reused; with force, the client's cached results are not either.
+        """
+        # Preserve configured order while dropping duplicates
+        unique_hostnames = list(dict.fromkeys(hostnames))
+        return await self.dispatcher.async_fetch(
+            self.backend.backend_key,
+            unique_hostnames,
+            partial(self._async_fetch_batches, force=force),
+            share,
+        )
+
+    async def _async_fetch_batches(
+        self, unique_hostnames: list[str], force: bool = False
+    ) -> dict[str, HostStatus]:
+        """Fetch hostnames in concurrent batches, bounded by the concurrency limits.
+
+        Both this entry's limit and the budget shared by every entry apply.
+        A failure for one batch is recorded in the results of its hostnames
+        instead of failing the whole refresh. Batches skipped because the
+        circuit breaker is open are left out of the results.
+        """
+        batch_size = self.batch_size
+        batches = [
+            unique_hostnames[index:index + batch_size]
+            for index in range(0, len(unique_hostnames), batch_size)
+        ]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        dispatcher = self.dispatcher
+
+        async def _fetch(batch: list[str]) -> dict[str, HostStatus]:
+            async with semaphore, dispatcher.semaphore:
+                await dispatcher.rate_limiter.acquire()
+                _LOGGER.debug("Fetching data for hostnames: %s", batch)
+                return await self.backend.async_get_hosts_ip(batch, force=force)
+
+        fetch = _fetch if self.profiler is None else self.profiler.time_task(_fetch)
+        results = await asyncio.gather(
+            *(fetch(batch) for batch in batches),
+            return_exceptions=True,
+        )
+
+        data: dict[str, HostStatus] = {}
+        for batch, result in zip(batches, results):
+            if isinstance(result, CircuitOpenError):
+                _LOGGER.debug("Skipped %s: %s", batch, result)
+            elif isinstance(result, Exception):
+                _LOGGER.warning("Error fetching data for %s: %s", batch, result)
+                for hostname in batch:
+                    data[hostname] = HostStatus(hostname, ResponseCode.ERROR, error=str(result))
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                data.update(result)
+                _LOGGER.debug("Data for %s: %s", batch, result)
+
+        return data
@@ -0,0 +1,52 @@
+"""Account-wide hostname totals for NoIP Monitor."""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any
+
+from .models import HostStatus, ResponseCode
+
+
+class HostAggregates:
+    """Connected and disconnected hostname counts of one config entry.
+
+    The totals are updated from the old and new result of each changed
+    hostname, so keeping them costs nothing for unchanged hostnames.
+    """
+
+    __slots__ = ("connected", "disconnected", "disconnected_by_code", "changed_last_cycle")
+
+    def __init__(self) -> None:
+        """Initialize empty totals."""
+        self.connected = 0
+        self.disconnected = 0
+        self.disconnected_by_code: Counter[ResponseCode] = Counter()
+        self.changed_last_cycle = 0
+
+    def update(self, old: HostStatus | None, new: HostStatus | None) -> None:
+        """Replace the contribution of a hostname's old result with its new one."""
+        if old is not None:
+            self._add(old, -1)
+        if new is not None:
+            self._add(new, 1)
+
+    def _add(self, host: HostStatus, delta: int) -> None:
+        """Add (or with a negative delta, remove) one result."""
+        if host.connected:
+            self.connected += delta
+            return
+        self.disconnected += delta
+        self.disconnected_by_code[host.code] += delta
+        if not self.disconnected_by_code[host.code]:
+            del self.disconnected_by_code[host.code]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the totals for diagnostics."""
+        return {
+            "connected": self.connected,
+            "disconnected": self.disconnected,
+            "disconnected_by_code": {
+                str(code): count for code, count in self.disconnected_by_code.items()
+            },
+            "changed_last_cycle": self.changed_last_cycle,
+        }
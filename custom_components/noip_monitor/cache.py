@@ -0,0 +1,86 @@
+"""Result cache of the NoIP client."""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any
+
+from .models import HostStatus, ResponseCode
+
+# Hostnames kept by default; well above what one account monitors
+DEFAULT_CACHE_SIZE = 10000
+
+
+def is_cacheable(result: HostStatus) -> bool:
+    """Return whether a result may be served again from the cache.
+
+    Answers about the hostname itself (its address, or that NoIP does not
+    know it) are cached; failures of the request are not.
+    """
+    return result.connected or result.code is ResponseCode.NOHOST
+
+
+class ResultCache:
+    """Lookup results by hostname, kept for a fixed time.
+
+    Entries expire ttl seconds after they were stored and the least
+    recently used ones are evicted once size entries are held. A ttl of 0
+    disables the cache.
+    """
+
+    __slots__ = ("ttl", "size", "hits", "misses", "_entries")
+
+    def __init__(self, ttl: float, size: int = DEFAULT_CACHE_SIZE) -> None:
+        """Initialize an empty cache."""
+        self.ttl = ttl
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, HostStatus]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of entries, expired ones included."""
+        return len(self._entries)
+
+    def get(self, hostname: str) -> HostStatus | None:
+        """Return the cached result of a hostname, or None if there is no fresh one."""
+        entry = self._entries.get(hostname)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[hostname]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(hostname)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, result: HostStatus) -> None:
+        """Store a result if it is cacheable, evicting the least recently used."""
+        if not self.ttl or not is_cacheable(result):
+            self._entries.pop(result.hostname, None)
+            return
+        self._entries[result.hostname] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(result.hostname)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def has_fresh(self) -> bool:
+        """Return whether any entry has not expired yet."""
+        now = time.monotonic()
+        return any(expires > now for expires, _ in self._entries.values())
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cache state for diagnostics."""
+        return {
+            "ttl": self.ttl,
+            "size": self.size,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -1,26 +1,108 @@
 """Config flow for NoIP Monitor integration."""
 from __future__ import annotations
 
+import asyncio
+import io
 import logging
+from itertools import chain
 from typing import Any
 
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import callback
+from homeassistant.components.file_upload import process_uploaded_file
+from homeassistant.const import (
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    EVENT_STATE_CHANGED,
+    MATCH_ALL,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.selector import (
+    EntitySelector,
+    EntitySelectorConfig,
+    FileSelector,
+    FileSelectorConfig,
+    TextSelector,
+    TextSelectorConfig,
+)
 
-from .const import CONF_HOSTNAMES, CONF_2FA_TOKEN, DOMAIN
+from .const import (
+    BACKENDS,
+    CONF_2FA_TOKEN,
+    CONF_BACKEND,
+    CONF_BATCH_SIZE,
+    CONF_CACHE_TTL,
+    CONF_CONNECT_TIMEOUT,
+    CONF_DNS_RESOLVER,
+    CONF_HEDGE_PERCENTILE,
+    CONF_HISTORY_DEPTH,
+    CONF_HOSTNAMES,
+    CONF_MAX_CONCURRENCY,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+    CONF_RATE_LIMIT,
+    CONF_READ_TIMEOUT,
+    CONF_RETRIES,
+    CONF_SAFETY_INTERVAL,
+    CONF_TRIGGER_ENTITY,
+    CONF_TRIGGER_EVENT,
+    CONF_VERIFY_INTERVAL,
+    CONF_WAN_PROBE,
+    CONF_WAN_PROBE_URL,
+    DEFAULT_BACKEND,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_DNS_RESOLVER,
+    DEFAULT_HEDGE_PERCENTILE,
+    DEFAULT_HISTORY_DEPTH,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_RETRIES,
+    DEFAULT_SAFETY_INTERVAL,
+    DEFAULT_VERIFY_INTERVAL,
+    DEFAULT_WAN_PROBE,
+    DEFAULT_WAN_PROBE_URL,
+    DOMAIN,
+    EVENT_IP_CHANGED,
+    MAX_BATCH_SIZE_LIMIT,
+    MAX_CACHE_TTL,
+    MAX_CONCURRENCY_LIMIT,
+    MAX_HEDGE_PERCENTILE,
+    MAX_HISTORY_DEPTH_LIMIT,
+    MAX_INTERVAL_LIMIT,
+    MAX_RATE_LIMIT,
+    MAX_RETRIES_LIMIT,
+    MAX_TIMEOUT_LIMIT,
+)
+from .dns_backend import parse_resolver
+from .hostnames import ParsedHostnames, parse_hostnames
+from .models import ACCOUNT_ERROR_CODES, HostStatus, ResponseCode
 from .noip_api import NoIPClient
+from .resilience import CircuitOpenError
 
 _LOGGER = logging.getLogger(__name__)
 
+# Bulk hostname import
+CONF_FILE = "file"
+CONF_REPLACE = "replace"
+CONF_VALIDATE = "validate"
+# Invalid hostnames listed in the form before the rest are summarized
+MAX_LISTED_INVALID = 20
+
 
 class NoIPConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[call-arg]
     """Handle a config flow for NoIP Monitor."""
 
     VERSION = 1
+    MINOR_VERSION = 2
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -39,6 +121,7 @@ class NoIPConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[
                 username=username,
                 password=password,
                 token_2fa=token_2fa,
+                session=async_get_clientsession(self.hass),
             )
             
             try:
@@ -103,6 +186,7 @@ class NoIPConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore[
                 username=username,
                 password=password,
                 token_2fa=token_2fa,
+                session=async_get_clientsession(self.hass),
             )
             
             try:
@@ -165,40 +249,341 @@ class NoIPOptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         """Initialize options flow."""
         self.config_entry = config_entry
+        self._import_hostnames: list[str] = []
+        self._import_placeholders: dict[str, str] = {}
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Choose between the settings and the bulk hostname import."""
+        return self.async_show_menu(
+            step_id="init", menu_options=["settings", "import_hostnames"]
+        )
+
+    async def async_step_settings(
+        self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
+        invalid_hostnames = ""
+
         if user_input is not None:
-            # Process comma-separated hostnames
-            hostnames_input = user_input.get(CONF_HOSTNAMES, "")
-            if hostnames_input:
-                # Split by comma and clean up whitespace
-                hostnames = [h.strip() for h in hostnames_input.split(",") if h.strip()]
-            else:
-                hostnames = []
-            
+            # Comma-separated hostnames, normalized and de-duplicated
+            parsed = parse_hostnames([user_input.get(CONF_HOSTNAMES, "")])
+            hostnames = parsed.valid
+            if parsed.invalid:
+                errors[CONF_HOSTNAMES] = "invalid_hostnames"
+                invalid_hostnames = _summarize(parsed.invalid)
+
+            dns_resolver = user_input.get(CONF_DNS_RESOLVER, DEFAULT_DNS_RESOLVER)
+            try:
+                parse_resolver(dns_resolver)
+            except ValueError:
+                errors[CONF_DNS_RESOLVER] = "invalid_resolver"
+
+            min_interval = user_input.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)
+            max_interval = user_input.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL)
+            if max_interval < min_interval:
+                errors[CONF_MAX_INTERVAL] = "invalid_intervals"
+
+            wan_probe_url = user_input.get(CONF_WAN_PROBE_URL, DEFAULT_WAN_PROBE_URL)
+            try:
+                cv.url(wan_probe_url)
+            except vol.Invalid:
+                errors[CONF_WAN_PROBE_URL] = "invalid_url"
+
+            # Listening to these would refresh on every state write, or on our own events
+            trigger_event = user_input.get(CONF_TRIGGER_EVENT, "").strip()
+            if trigger_event in (MATCH_ALL, EVENT_STATE_CHANGED, EVENT_IP_CHANGED):
+                errors[CONF_TRIGGER_EVENT] = "invalid_trigger_event"
+
+        if user_input is not None and not errors:
             return self.async_create_entry(
                 title="",
-                data={CONF_HOSTNAMES: hostnames},
+                data={
+                    CONF_HOSTNAMES: hostnames,
+                    CONF_MAX_CONCURRENCY: user_input.get(
+                        CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+                    ),
+                    CONF_BATCH_SIZE: user_input.get(CONF_BATCH_SIZE, DEFAULT_BATCH_SIZE),
+                    CONF_BACKEND: user_input.get(CONF_BACKEND, DEFAULT_BACKEND),
+                    CONF_DNS_RESOLVER: dns_resolver,
+                    CONF_MIN_INTERVAL: min_interval,
+                    CONF_MAX_INTERVAL: max_interval,
+                    CONF_RATE_LIMIT: user_input.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                    CONF_HISTORY_DEPTH: user_input.get(
+                        CONF_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH
+                    ),
+                    CONF_WAN_PROBE: user_input.get(CONF_WAN_PROBE, DEFAULT_WAN_PROBE),
+                    CONF_WAN_PROBE_URL: wan_probe_url,
+                    CONF_VERIFY_INTERVAL: user_input.get(
+                        CONF_VERIFY_INTERVAL, DEFAULT_VERIFY_INTERVAL
+                    ),
+                    CONF_CONNECT_TIMEOUT: user_input.get(
+                        CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT
+                    ),
+                    CONF_READ_TIMEOUT: user_input.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+                    CONF_RETRIES: user_input.get(CONF_RETRIES, DEFAULT_RETRIES),
+                    CONF_HEDGE_PERCENTILE: user_input.get(
+                        CONF_HEDGE_PERCENTILE, DEFAULT_HEDGE_PERCENTILE
+                    ),
+                    CONF_CACHE_TTL: user_input.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL),
+                    CONF_TRIGGER_ENTITY: user_input.get(CONF_TRIGGER_ENTITY, ""),
+                    CONF_TRIGGER_EVENT: trigger_event,
+                    CONF_SAFETY_INTERVAL: user_input.get(
+                        CONF_SAFETY_INTERVAL, DEFAULT_SAFETY_INTERVAL
+                    ),
+                },
             )
 
-        # Get current hostnames
-        current_hostnames = self.config_entry.options.get(CONF_HOSTNAMES, [])
+        # Get current options
+        options = self.config_entry.options
+        current_hostnames = options.get(CONF_HOSTNAMES, [])
         hostnames_str = ", ".join(current_hostnames) if current_hostnames else ""
 
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_HOSTNAMES,
+                    description={"suggested_value": hostnames_str},
+                ): str,
+                vol.Optional(
+                    CONF_MAX_CONCURRENCY,
+                    default=options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_CONCURRENCY_LIMIT)),
+                vol.Optional(
+                    CONF_BATCH_SIZE,
+                    default=options.get(CONF_BATCH_SIZE, DEFAULT_BATCH_SIZE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_BATCH_SIZE_LIMIT)),
+                vol.Optional(
+                    CONF_BACKEND,
+                    default=options.get(CONF_BACKEND, DEFAULT_BACKEND),
+                ): vol.In(BACKENDS),
+                vol.Optional(
+                    CONF_DNS_RESOLVER,
+                    default=options.get(CONF_DNS_RESOLVER, DEFAULT_DNS_RESOLVER),
+                ): str,
+                vol.Optional(
+                    CONF_MIN_INTERVAL,
+                    default=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_INTERVAL_LIMIT)),
+                vol.Optional(
+                    CONF_MAX_INTERVAL,
+                    default=options.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_INTERVAL_LIMIT)),
+                vol.Optional(
+                    CONF_RATE_LIMIT,
+                    default=options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_RATE_LIMIT)),
+                vol.Optional(
+                    CONF_HISTORY_DEPTH,
+                    default=options.get(CONF_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_HISTORY_DEPTH_LIMIT)),
+                vol.Optional(
+                    CONF_WAN_PROBE,
+                    default=options.get(CONF_WAN_PROBE, DEFAULT_WAN_PROBE),
+                ): bool,
+                vol.Optional(
+                    CONF_WAN_PROBE_URL,
+                    default=options.get(CONF_WAN_PROBE_URL, DEFAULT_WAN_PROBE_URL),
+                ): str,
+                vol.Optional(
+                    CONF_VERIFY_INTERVAL,
+                    default=options.get(CONF_VERIFY_INTERVAL, DEFAULT_VERIFY_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_INTERVAL_LIMIT)),
+                vol.Optional(
+                    CONF_CONNECT_TIMEOUT,
+                    default=options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_TIMEOUT_LIMIT)),
+                vol.Optional(
+                    CONF_READ_TIMEOUT,
+                    default=options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_TIMEOUT_LIMIT)),
+                vol.Optional(
+                    CONF_RETRIES,
+                    default=options.get(CONF_RETRIES, DEFAULT_RETRIES),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_RETRIES_LIMIT)),
+                vol.Optional(
+                    CONF_HEDGE_PERCENTILE,
+                    default=options.get(CONF_HEDGE_PERCENTILE, DEFAULT_HEDGE_PERCENTILE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_HEDGE_PERCENTILE)),
+                vol.Optional(
+                    CONF_CACHE_TTL,
+                    default=options.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_CACHE_TTL)),
+                vol.Optional(
+                    CONF_TRIGGER_ENTITY,
+                    description={"suggested_value": options.get(CONF_TRIGGER_ENTITY)},
+                ): EntitySelector(EntitySelectorConfig()),
+                vol.Optional(
+                    CONF_TRIGGER_EVENT,
+                    default=options.get(CONF_TRIGGER_EVENT, ""),
+                ): str,
+                vol.Optional(
+                    CONF_SAFETY_INTERVAL,
+                    default=options.get(CONF_SAFETY_INTERVAL, DEFAULT_SAFETY_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_INTERVAL_LIMIT)),
+            }
+        )
+        if user_input is not None:
+            # Show the rejected input again rather than the saved options
+            data_schema = self.add_suggested_values_to_schema(data_schema, user_input)
+
         return self.async_show_form(
-            step_id="init",
+            step_id="settings",
+            data_schema=data_schema,
+            description_placeholders={
+                "hostnames_example": "example.ddns.net, myhost.hopto.org",
+                "invalid": invalid_hostnames,
+            },
+            errors=errors,
+        )
+
+    async def async_step_import_hostnames(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Import a large hostname list from text or an uploaded file."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            current: list[str] = []
+            if not user_input.get(CONF_REPLACE):
+                current = list(self.config_entry.options.get(CONF_HOSTNAMES, []))
+            text = user_input.get(CONF_HOSTNAMES, "")
+            if file_id := user_input.get(CONF_FILE):
+                parsed = await self.hass.async_add_executor_job(
+                    _parse_upload, self.hass, text, file_id, current
+                )
+            else:
+                parsed = parse_hostnames(io.StringIO(text), known=current)
+
+            unknown: list[str] = []
+            if not parsed.valid and not parsed.invalid:
+                errors["base"] = "no_hostnames"
+            elif parsed.valid and user_input.get(CONF_VALIDATE, True):
+                try:
+                    unknown = await self._async_find_unknown(parsed.valid)
+                except CircuitOpenError:
+                    errors["base"] = "cannot_connect"
+                except _AccountError:
+                    errors["base"] = "invalid_auth"
+
+            if not errors:
+                unknown_set = set(unknown)
+                added = [hostname for hostname in parsed.valid if hostname not in unknown_set]
+                self._import_hostnames = current + added
+                rejected = parsed.invalid + unknown
+                if not rejected:
+                    return self._async_save_hostnames()
+                self._import_placeholders = {
+                    "added": str(len(added)),
+                    "duplicates": str(parsed.duplicates),
+                    "rejected": str(len(rejected)),
+                    "invalid": _summarize(rejected),
+                }
+                return await self.async_step_import_confirm()
+
+        return self.async_show_form(
+            step_id="import_hostnames",
             data_schema=vol.Schema(
                 {
-                    vol.Optional(
-                        CONF_HOSTNAMES,
-                        description={"suggested_value": hostnames_str},
-                    ): str,
+                    vol.Optional(CONF_HOSTNAMES): TextSelector(
+                        TextSelectorConfig(multiline=True)
+                    ),
+                    vol.Optional(CONF_FILE): FileSelector(
+                        FileSelectorConfig(accept=".txt,.csv,text/plain,text/csv")
+                    ),
+                    vol.Optional(CONF_REPLACE, default=False): bool,
+                    vol.Optional(CONF_VALIDATE, default=True): bool,
                 }
             ),
-            description_placeholders={
-                "hostnames_example": "example.ddns.net, myhost.hopto.org"
-            },
+            errors=errors,
+        )
+
+    async def async_step_import_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Show the hostnames left out of an import before saving the rest."""
+        if user_input is not None:
+            return self._async_save_hostnames()
+        return self.async_show_form(
+            step_id="import_confirm",
+            data_schema=vol.Schema({}),
+            description_placeholders=self._import_placeholders,
+        )
+
+    @callback
+    def _async_save_hostnames(self) -> FlowResult:
+        """Save the imported hostname list, keeping every other option."""
+        return self.async_create_entry(
+            title="",
+            data={**self.config_entry.options, CONF_HOSTNAMES: self._import_hostnames},
+        )
+
+    async def _async_find_unknown(self, hostnames: list[str]) -> list[str]:
+        """Look hostnames up in concurrent batches and return those NoIP does not know.
+
+        Lookups that fail for other reasons (timeouts, server errors) do not
+        reject a hostname.
+
+        Raises:
+            CircuitOpenError: NoIP calls are paused after repeated errors.
+            _AccountError: NoIP rejected the account.
+        """
+        options = self.config_entry.options
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        if coordinator is not None:
+            # Share the account's rate limit and circuit breaker with polling
+            client: NoIPClient = coordinator.client
+        else:
+            client = NoIPClient(
+                username=self.config_entry.data[CONF_USERNAME],
+                password=self.config_entry.data[CONF_PASSWORD],
+                token_2fa=self.config_entry.data.get(CONF_2FA_TOKEN),
+                session=async_get_clientsession(self.hass),
+                requests_per_minute=options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+            )
+
+        batch_size = int(options.get(CONF_BATCH_SIZE, DEFAULT_BATCH_SIZE))
+        semaphore = asyncio.Semaphore(
+            int(options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY))
         )
+
+        async def _lookup(batch: list[str]) -> dict[str, HostStatus]:
+            async with semaphore:
+                return await client.async_get_hosts_ip(batch)
+
+        batches = [
+            hostnames[index:index + batch_size] for index in range(0, len(hostnames), batch_size)
+        ]
+        unknown: list[str] = []
+        for results in await asyncio.gather(*(_lookup(batch) for batch in batches)):
+            for hostname, result in results.items():
+                if result.code in ACCOUNT_ERROR_CODES:
+                    raise _AccountError(result.error or str(result.code))
+                if result.code is ResponseCode.NOHOST:
+                    unknown.append(hostname)
+        _LOGGER.debug("Validated %d hostnames, %d unknown to NoIP", len(hostnames), len(unknown))
+        return unknown
+
+
+class _AccountError(Exception):
+    """Raised when NoIP rejects the account during hostname validation."""
+
+
+def _parse_upload(
+    hass: HomeAssistant, text: str, file_id: str, known: list[str]
+) -> ParsedHostnames:
+    """Parse pasted text followed by an uploaded file, streaming the file line by line."""
+    with process_uploaded_file(hass, file_id) as path, path.open(
+        encoding="utf-8", errors="replace"
+    ) as file:
+        return parse_hostnames(chain(io.StringIO(text), file), known=known)
+
+
+def _summarize(hostnames: list[str]) -> str:
+    """Return a readable, bounded list of hostnames for a form."""
+    listed = ", ".join(hostnames[:MAX_LISTED_INVALID])
+    if len(hostnames) > MAX_LISTED_INVALID:
+        listed += f" (+{len(hostnames) - MAX_LISTED_INVALID} more)"
+    return listed
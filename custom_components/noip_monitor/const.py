@@ -5,9 +5,78 @@ DOMAIN = "noip_monitor"
 # Configuration
 CONF_HOSTNAMES = "hostnames"
 CONF_2FA_TOKEN = "2fa_token"
+CONF_MAX_CONCURRENCY = "max_concurrency"
+CONF_BATCH_SIZE = "batch_size"
+CONF_BACKEND = "backend"
+CONF_DNS_RESOLVER = "dns_resolver"
+CONF_MIN_INTERVAL = "min_interval"
+CONF_MAX_INTERVAL = "max_interval"
+CONF_RATE_LIMIT = "rate_limit"
+CONF_HISTORY_DEPTH = "history_depth"
+CONF_WAN_PROBE = "wan_probe"
+CONF_WAN_PROBE_URL = "wan_probe_url"
+CONF_VERIFY_INTERVAL = "verify_interval"
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_READ_TIMEOUT = "read_timeout"
+CONF_RETRIES = "retries"
+CONF_HEDGE_PERCENTILE = "hedge_percentile"
+CONF_CACHE_TTL = "cache_ttl"
+CONF_TRIGGER_ENTITY = "trigger_entity"
+CONF_TRIGGER_EVENT = "trigger_event"
+CONF_SAFETY_INTERVAL = "safety_interval"
+
+# Monitoring backends
+BACKEND_DYNUPDATE = "dynupdate"
+BACKEND_DNS = "dns"
+BACKENDS = [BACKEND_DYNUPDATE, BACKEND_DNS]
 
 # Defaults
 DEFAULT_NAME = "NoIP Monitor"
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_BATCH_SIZE = 20
+DEFAULT_BACKEND = BACKEND_DYNUPDATE
+DEFAULT_DNS_RESOLVER = "8.8.8.8"
+DEFAULT_MIN_INTERVAL = 5  # minutes
+DEFAULT_MAX_INTERVAL = 60  # minutes
+DEFAULT_RATE_LIMIT = 60  # requests per minute
+DEFAULT_HISTORY_DEPTH = 10  # transitions per hostname
+DEFAULT_WAN_PROBE = False
+DEFAULT_WAN_PROBE_URL = "https://api.ipify.org"
+DEFAULT_VERIFY_INTERVAL = 360  # minutes
+DEFAULT_CONNECT_TIMEOUT = 10  # seconds
+DEFAULT_READ_TIMEOUT = 20  # seconds
+DEFAULT_RETRIES = 2
+DEFAULT_HEDGE_PERCENTILE = 0  # disabled
+DEFAULT_CACHE_TTL = 60  # seconds
+DEFAULT_SAFETY_INTERVAL = 360  # minutes
+
+# Limits
+MAX_CONCURRENCY_LIMIT = 100
+MAX_BATCH_SIZE_LIMIT = 100
+MAX_INTERVAL_LIMIT = 1440  # minutes
+MAX_RATE_LIMIT = 600  # requests per minute
+MAX_HISTORY_DEPTH_LIMIT = 100
+MAX_TIMEOUT_LIMIT = 120  # seconds
+MAX_RETRIES_LIMIT = 5
+MAX_HEDGE_PERCENTILE = 99
+MAX_CACHE_TTL = 3600  # seconds
+MAX_PROFILE_CYCLES = 20
+
+# Storage
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30  # seconds
+
+# Events
+EVENT_IP_CHANGED = f"{DOMAIN}_ip_changed"
+
+# Services
+SERVICE_GET_IP_HISTORY = "get_ip_history"
+SERVICE_REFRESH = "refresh"
+SERVICE_PROFILE = "profile"
+ATTR_HOSTNAMES = "hostnames"
+ATTR_CYCLES = "cycles"
+ATTR_FORCE = "force"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
 
 # States
 STATE_DISCONNECTED = "Disconnected"
@@ -0,0 +1,51 @@
+"""Diagnostics support for NoIP Monitor."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from . import NoIPDataUpdateCoordinator
+from .const import CONF_2FA_TOKEN, DOMAIN
+
+TO_REDACT = {"username", "password", CONF_2FA_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: NoIPDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": (
+                coordinator.update_interval.total_seconds()
+                if coordinator.update_interval
+                else None
+            ),
+            "last_cycle_duration": coordinator.last_cycle_duration,
+            "last_cycle_hosts": coordinator.last_cycle_hosts,
+            "scheduled_hosts": len(coordinator.scheduler),
+            "wan_ip": coordinator.wan_ip,
+            "trigger": coordinator.trigger.as_dict() if coordinator.trigger else None,
+        },
+        "aggregates": coordinator.aggregates.as_dict(),
+        "circuit_breaker": coordinator.client.circuit_breaker.as_dict(),
+        "cache": coordinator.client.cache.as_dict(),
+        "metrics": coordinator.metrics.as_dict(),
+        "hosts": {
+            hostname: host.as_dict() for hostname, host in (coordinator.data or {}).items()
+        },
+        "history": coordinator.history.as_dict(),
+        "profiling": {
+            "remaining_cycles": coordinator.profiler.remaining if coordinator.profiler else 0,
+            "cycles": list(coordinator.profiles),
+        },
+    }
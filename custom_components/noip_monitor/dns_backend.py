@@ -0,0 +1,255 @@
+"""DNS resolution backend for NoIP Monitor."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import struct
+import time
+from typing import Any, cast
+
+from .const import BACKEND_DNS
+from .metrics import Metrics, request_outcome
+from .models import HostStatus, ResponseCode
+
+_LOGGER = logging.getLogger(__name__)
+
+DNS_PORT = 53
+DNS_TIMEOUT = 5.0
+
+# DNS wire format
+_HEADER = struct.Struct("!HHHHHH")
+_QUESTION = struct.Struct("!HH")
+_ANSWER = struct.Struct("!HHIH")
+_FLAG_RD = 0x0100
+_TYPE_A = 1
+_CLASS_IN = 1
+_RCODE_NXDOMAIN = 3
+
+
+def parse_resolver(resolver: str) -> tuple[str, int]:
+    """Split a resolver setting into host and port.
+
+    Accepts "1.1.1.1", "1.1.1.1:53", "[2606:4700::1111]:53" and bare IPv6.
+    """
+    resolver = resolver.strip()
+    if resolver.startswith("["):
+        host, _, rest = resolver[1:].partition("]")
+        return host, int(rest[1:]) if rest.startswith(":") else DNS_PORT
+    if resolver.count(":") == 1:
+        host, port = resolver.split(":")
+        return host, int(port)
+    return resolver, DNS_PORT
+
+
+def build_query(query_id: int, hostname: str) -> bytes:
+    """Build an A record query for a hostname."""
+    qname = b"".join(
+        bytes([len(label)]) + label
+        for label in (part.encode("idna") for part in hostname.rstrip(".").split("."))
+    )
+    return (
+        _HEADER.pack(query_id, _FLAG_RD, 1, 0, 0, 0)
+        + qname
+        + b"\x00"
+        + _QUESTION.pack(_TYPE_A, _CLASS_IN)
+    )
+
+
+def _read_name(data: bytes, offset: int) -> tuple[str, int]:
+    """Read a possibly compressed name, returning it and the offset after it."""
+    labels: list[str] = []
+    end: int | None = None
+    for _ in range(128):
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | data[offset + 1]
+            continue
+        if length == 0:
+            return ".".join(labels), end if end is not None else offset + 1
+        labels.append(data[offset + 1:offset + 1 + length].decode("ascii", "replace"))
+        offset += length + 1
+    raise ValueError("DNS name compression loop")
+
+
+def parse_response(hostname: str, data: bytes) -> HostStatus:
+    """Parse a DNS response into the status used by the sensors."""
+    _, flags, qdcount, ancount, _, _ = _HEADER.unpack_from(data)
+    rcode = flags & 0x000F
+
+    if rcode == _RCODE_NXDOMAIN:
+        return HostStatus(hostname, ResponseCode.NOHOST, error="Host not found")
+    if rcode:
+        return HostStatus(hostname, ResponseCode.ERROR, error=f"DNS error {rcode}")
+
+    offset = _HEADER.size
+    for _ in range(qdcount):
+        _, offset = _read_name(data, offset)
+        offset += _QUESTION.size
+
+    for _ in range(ancount):
+        _, offset = _read_name(data, offset)
+        rtype, rclass, _, rdlength = _ANSWER.unpack_from(data, offset)
+        offset += _ANSWER.size
+        if rtype == _TYPE_A and rclass == _CLASS_IN and rdlength == 4:
+            ip_address = ".".join(str(octet) for octet in data[offset:offset + 4])
+            return HostStatus(hostname, ResponseCode.DNS, ip=ip_address)
+        offset += rdlength
+
+    return HostStatus(hostname, ResponseCode.NOHOST, error="No address record")
+
+
+class _DNSProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol matching responses to pending queries by ID."""
+
+    def __init__(self) -> None:
+        """Initialize the protocol."""
+        self.transport: asyncio.DatagramTransport | None = None
+        self.pending: dict[int, asyncio.Future[bytes]] = {}
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Store the transport."""
+        self.transport = cast(asyncio.DatagramTransport, transport)
+
+    def datagram_received(self, data: bytes, addr: tuple[str | Any, int]) -> None:
+        """Resolve the query waiting for this response."""
+        if len(data) < _HEADER.size:
+            return
+        (query_id,) = struct.unpack_from("!H", data)
+        future = self.pending.pop(query_id, None)
+        if future is not None and not future.done():
+            future.set_result(data)
+
+    def error_received(self, exc: Exception) -> None:
+        """Log socket errors; pending queries time out on their own."""
+        _LOGGER.debug("DNS socket error: %s", exc)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Fail every pending query."""
+        self.transport = None
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("DNS socket closed"))
+        self.pending.clear()
+
+
+class DNSResolverClient:
+    """Resolve monitored hostnames with pipelined UDP DNS queries.
+
+    Drop-in alternative to NoIPClient for looking up the current address of
+    each hostname: it exposes the same lookup methods and returns the same
+    HostStatus results, without authenticated calls against the NoIP API.
+    """
+
+    def __init__(
+        self, resolver: str, timeout: float = DNS_TIMEOUT, metrics: Metrics | None = None
+    ) -> None:
+        """Initialize the resolver client.
+
+        Args:
+            resolver: Resolver address as "host" or "host:port"
+            timeout: Seconds to wait for the answers of one batch
+            metrics: Optional metrics to record each batch of queries into
+        """
+        self.host, self.port = parse_resolver(resolver)
+        self.timeout = timeout
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.backend_key = f"{BACKEND_DNS}:{self.host}:{self.port}"
+        self._protocol: _DNSProtocol | None = None
+        self._lock = asyncio.Lock()
+
+    async def _get_protocol(self) -> _DNSProtocol:
+        """Get the connected datagram protocol, opening the socket if needed."""
+        async with self._lock:
+            if self._protocol is None or self._protocol.transport is None:
+                loop = asyncio.get_running_loop()
+                _, protocol = await loop.create_datagram_endpoint(
+                    _DNSProtocol, remote_addr=(self.host, self.port)
+                )
+                self._protocol = protocol
+            return self._protocol
+
+    async def async_get_host_ip(self, hostname: str) -> HostStatus:
+        """Get IP address for a specific hostname."""
+        results = await self.async_get_hosts_ip([hostname])
+        return results[hostname]
+
+    async def async_get_hosts_ip(
+        self, hostnames: list[str], force: bool = False
+    ) -> dict[str, HostStatus]:
+        """Resolve several hostnames, sending all queries before awaiting answers.
+
+        Every call queries the resolver, which does its own caching; force
+        is accepted so both backends can be called alike.
+        """
+        try:
+            protocol = await self._get_protocol()
+        except OSError as err:
+            _LOGGER.error("Error opening DNS socket to %s:%s: %s", self.host, self.port, err)
+            return {
+                hostname: HostStatus(hostname, ResponseCode.ERROR, error=str(err))
+                for hostname in hostnames
+            }
+
+        loop = asyncio.get_running_loop()
+        futures: dict[str, asyncio.Future[bytes]] = {}
+        sent = 0
+        started = time.monotonic()
+        for hostname in hostnames:
+            query_id = random.getrandbits(16)
+            while query_id in protocol.pending:
+                query_id = random.getrandbits(16)
+            future: asyncio.Future[bytes] = loop.create_future()
+            protocol.pending[query_id] = future
+            futures[hostname] = future
+            assert protocol.transport is not None
+            query = build_query(query_id, hostname)
+            protocol.transport.sendto(query)
+            sent += len(query)
+
+        self.metrics.request_started()
+        try:
+            await asyncio.wait(futures.values(), timeout=self.timeout)
+        except BaseException:
+            self.metrics.request_abandoned()
+            raise
+        elapsed = time.monotonic() - started
+
+        results: dict[str, HostStatus] = {}
+        received = 0
+        for hostname, future in futures.items():
+            if not future.done():
+                future.cancel()
+                results[hostname] = HostStatus(hostname, ResponseCode.TIMEOUT, error="Timeout")
+            elif future.exception() is not None:
+                results[hostname] = HostStatus(
+                    hostname, ResponseCode.ERROR, error=str(future.exception())
+                )
+            else:
+                received += len(future.result())
+                try:
+                    results[hostname] = parse_response(hostname, future.result())
+                except (ValueError, IndexError, struct.error) as err:
+                    results[hostname] = HostStatus(
+                        hostname, ResponseCode.ERROR, error=f"Malformed DNS response: {err}"
+                    )
+            _LOGGER.debug("DNS result for %s: %s", hostname, results[hostname])
+
+        codes = [result.code for result in results.values()]
+        self.metrics.request_finished(
+            request_outcome(codes), elapsed, codes, bytes_sent=sent, bytes_received=received
+        )
+
+        # Drop IDs of queries that timed out
+        for query_id in [qid for qid, fut in protocol.pending.items() if fut.cancelled()]:
+            del protocol.pending[query_id]
+
+        return results
+
+    async def close(self) -> None:
+        """Close the DNS socket."""
+        if self._protocol is not None and self._protocol.transport is not None:
+            self._protocol.transport.close()
+        self._protocol = None
@@ -0,0 +1,122 @@
+"""Bounded per-hostname IP change history."""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from typing import Any, NamedTuple
+
+
+class IPTransition(NamedTuple):
+    """A change of a hostname's address."""
+
+    timestamp: float
+    old_ip: str
+    new_ip: str
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the transition as a plain dict."""
+        return {"timestamp": self.timestamp, "old_ip": self.old_ip, "new_ip": self.new_ip}
+
+
+class IPHistory:
+    """Fixed-size ring buffer of the latest transitions of one hostname.
+
+    Slots are allocated up front, so memory stays the same however many
+    transitions are recorded.
+    """
+
+    __slots__ = ("depth", "_timestamps", "_old", "_new", "_start", "_size")
+
+    def __init__(self, depth: int) -> None:
+        """Initialize an empty buffer holding up to depth transitions."""
+        self.depth = depth
+        self._timestamps = array("d", bytes(8 * depth))
+        self._old: list[str] = [""] * depth
+        self._new: list[str] = [""] * depth
+        self._start = 0
+        self._size = 0
+
+    def append(self, transition: IPTransition) -> None:
+        """Add a transition, overwriting the oldest one when full."""
+        index = (self._start + self._size) % self.depth
+        self._timestamps[index] = transition.timestamp
+        self._old[index] = transition.old_ip
+        self._new[index] = transition.new_ip
+        if self._size < self.depth:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.depth
+
+    def __len__(self) -> int:
+        """Return the number of transitions held."""
+        return self._size
+
+    def __iter__(self) -> Iterator[IPTransition]:
+        """Iterate over the transitions from oldest to newest."""
+        for offset in range(self._size):
+            index = (self._start + offset) % self.depth
+            yield IPTransition(self._timestamps[index], self._old[index], self._new[index])
+
+
+class HistoryTracker:
+    """IP change history of every hostname of a config entry."""
+
+    def __init__(self, depth: int) -> None:
+        """Initialize the tracker with the number of transitions kept per hostname."""
+        self.depth = depth
+        self._history: dict[str, IPHistory] = {}
+        # Latest connected address of each hostname, survives lookup errors
+        self._last_ip: dict[str, str] = {}
+
+    def record(self, hostname: str, ip: str, timestamp: float) -> IPTransition | None:
+        """Record the current address of a hostname.
+
+        Returns the transition if the address differs from the last one
+        seen; the first address seen for a hostname is not a transition.
+        """
+        old_ip = self._last_ip.get(hostname)
+        self._last_ip[hostname] = ip
+        if old_ip is None or old_ip == ip:
+            return None
+
+        transition = IPTransition(timestamp, old_ip, ip)
+        history = self._history.get(hostname)
+        if history is None:
+            history = self._history[hostname] = IPHistory(self.depth)
+        history.append(transition)
+        return transition
+
+    def get(self, hostname: str) -> list[IPTransition]:
+        """Return the transitions of a hostname, oldest first."""
+        history = self._history.get(hostname)
+        return list(history) if history is not None else []
+
+    def remove(self, hostnames: Iterable[str]) -> None:
+        """Forget hostnames that are no longer monitored."""
+        for hostname in hostnames:
+            self._history.pop(hostname, None)
+            self._last_ip.pop(hostname, None)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the history for storage and diagnostics."""
+        return {
+            "last_ip": dict(self._last_ip),
+            "transitions": {
+                hostname: [transition.as_dict() for transition in history]
+                for hostname, history in self._history.items()
+            },
+        }
+
+    def load(self, data: dict[str, Any]) -> None:
+        """Restore the output of as_dict, keeping the latest depth transitions."""
+        self._last_ip = dict(data.get("last_ip", {}))
+        self._history = {}
+        for hostname, transitions in data.get("transitions", {}).items():
+            history = IPHistory(self.depth)
+            for transition in transitions[-self.depth:]:
+                history.append(
+                    IPTransition(
+                        transition["timestamp"], transition["old_ip"], transition["new_ip"]
+                    )
+                )
+            self._history[hostname] = history
@@ -0,0 +1,63 @@
+"""Hostname list parsing for NoIP Monitor."""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+MAX_HOSTNAME_LENGTH = 253
+_LABEL = re.compile(r"^(?!-)[a-z0-9-]{1,63}(?<!-)$")
+# Hostnames may be separated by commas, semicolons or any whitespace
+_SEPARATORS = re.compile(r"[,;\s]+")
+
+
+@dataclass
+class ParsedHostnames:
+    """Result of parsing a hostname list."""
+
+    valid: list[str] = field(default_factory=list)
+    invalid: list[str] = field(default_factory=list)
+    duplicates: int = 0
+
+
+def normalize_hostname(hostname: str) -> str | None:
+    """Return the canonical form of a hostname, or None if it is not valid."""
+    hostname = hostname.strip().lower().rstrip(".")
+    try:
+        hostname = hostname.encode("idna").decode("ascii")
+    except UnicodeError:
+        return None
+    if len(hostname) > MAX_HOSTNAME_LENGTH:
+        return None
+    labels = hostname.split(".")
+    if len(labels) < 2 or not all(_LABEL.match(label) for label in labels):
+        return None
+    return hostname
+
+
+def parse_hostnames(lines: Iterable[str], known: Iterable[str] = ()) -> ParsedHostnames:
+    """Parse hostnames line by line, normalizing and de-duplicating them.
+
+    Lines are consumed one at a time, so a file object can be passed
+    without reading it whole. Hostnames in known are counted as
+    duplicates instead of being returned again. Text after a "#" on a
+    line is ignored.
+    """
+    parsed = ParsedHostnames()
+    seen = set(known)
+    rejected: set[str] = set()
+    for line in lines:
+        for token in _SEPARATORS.split(line.partition("#")[0]):
+            if not token:
+                continue
+            hostname = normalize_hostname(token)
+            if hostname is None:
+                if token not in rejected:
+                    rejected.add(token)
+                    parsed.invalid.append(token)
+            elif hostname in seen:
+                parsed.duplicates += 1
+            else:
+                seen.add(hostname)
+                parsed.valid.append(hostname)
+    return parsed
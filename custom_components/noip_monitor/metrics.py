@@ -0,0 +1,172 @@
+"""Lightweight runtime metrics for NoIP Monitor."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any
+
+from .models import ResponseCode
+
+# Upper bounds (seconds) of the latency histogram buckets; the last one catches the rest
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf"))
+
+# A request answering several hostnames is filed under its most significant outcome
+OUTCOME_PRIORITY = (
+    ResponseCode.BADAUTH,
+    ResponseCode.ABUSE,
+    ResponseCode.BADAGENT,
+    ResponseCode.SERVER_ERROR,
+    ResponseCode.HTTP_ERROR,
+    ResponseCode.TIMEOUT,
+    ResponseCode.ERROR,
+    ResponseCode.UNKNOWN,
+    ResponseCode.NOHOST,
+    ResponseCode.GOOD,
+    ResponseCode.NOCHG,
+    ResponseCode.DNS,
+)
+
+
+def request_outcome(codes: Iterable[ResponseCode]) -> ResponseCode:
+    """Return the outcome a request is filed under."""
+    seen = set(codes)
+    for code in OUTCOME_PRIORITY:
+        if code in seen:
+            return code
+    return ResponseCode.UNKNOWN
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one sample."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket holding the given percentile."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, bucket_count in zip(LATENCY_BUCKETS, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return LATENCY_BUCKETS[-1]
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """Add the samples of another histogram to this one."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(LATENCY_BUCKETS, self.counts)
+            },
+        }
+
+
+class Metrics:
+    """Counters, gauges and latency histograms for one config entry.
+
+    Recording is a handful of integer updates, cheap enough to stay on.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.latency: dict[ResponseCode, LatencyHistogram] = {}
+        self.requests = 0
+        self.host_outcomes: Counter[ResponseCode] = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.in_flight = 0
+        self.in_flight_peak = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.cycles = 0
+        self.cycle_duration = LatencyHistogram()
+        self.last_cycle_duration: float | None = None
+
+    def request_started(self) -> None:
+        """Mark a request as in flight."""
+        self.in_flight += 1
+        if self.in_flight > self.in_flight_peak:
+            self.in_flight_peak = self.in_flight
+
+    def request_finished(
+        self,
+        outcome: ResponseCode,
+        seconds: float,
+        host_codes: Iterable[ResponseCode] = (),
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+    ) -> None:
+        """Record a finished request."""
+        self.in_flight -= 1
+        self.requests += 1
+        histogram = self.latency.get(outcome)
+        if histogram is None:
+            histogram = self.latency[outcome] = LatencyHistogram()
+        histogram.observe(seconds)
+        self.host_outcomes.update(host_codes)
+        self.bytes_sent += bytes_sent
+        self.bytes_received += bytes_received
+
+    def request_abandoned(self) -> None:
+        """Record a request cancelled before it finished."""
+        self.in_flight -= 1
+
+    def cycle_finished(self, seconds: float) -> None:
+        """Record a finished refresh cycle."""
+        self.cycles += 1
+        self.last_cycle_duration = seconds
+        self.cycle_duration.observe(seconds)
+
+    def overall_latency(self) -> LatencyHistogram:
+        """Return the latency histogram across every outcome."""
+        overall = LatencyHistogram()
+        for histogram in self.latency.values():
+            overall.merge(histogram)
+        return overall
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every metric for diagnostics."""
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "in_flight_peak": self.in_flight_peak,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "host_outcomes": {str(code): count for code, count in self.host_outcomes.items()},
+            "latency": {
+                str(outcome): histogram.as_dict() for outcome, histogram in self.latency.items()
+            },
+            "cycles": self.cycles,
+            "last_cycle_duration": self.last_cycle_duration,
+            "cycle_duration": self.cycle_duration.as_dict(),
+        }
@@ -0,0 +1,73 @@
+"""Data models for the NoIP Monitor integration."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+
+class ResponseCode(StrEnum):
+    """Outcome of a hostname lookup."""
+
+    GOOD = "good"
+    NOCHG = "nochg"
+    DNS = "dns"
+    NOHOST = "nohost"
+    ABUSE = "abuse"
+    BADAUTH = "badauth"
+    BADAGENT = "badagent"
+    SERVER_ERROR = "911"
+    HTTP_ERROR = "http_error"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+    UNKNOWN = "unknown"
+
+
+CONNECTED_CODES = frozenset({ResponseCode.GOOD, ResponseCode.NOCHG, ResponseCode.DNS})
+ACCOUNT_ERROR_CODES = frozenset(
+    {ResponseCode.BADAUTH, ResponseCode.ABUSE, ResponseCode.BADAGENT}
+)
+
+
+@dataclass(frozen=True, slots=True)
+class HostStatus:
+    """Result of looking up one hostname."""
+
+    hostname: str
+    code: ResponseCode
+    ip: str | None = None
+    error: str | None = None
+
+    @property
+    def connected(self) -> bool:
+        """Return whether the hostname resolved to an address."""
+        return self.ip is not None and self.code in CONNECTED_CODES
+
+    @property
+    def status(self) -> str:
+        """Return the connection status shown in the sensor attributes."""
+        return "connected" if self.connected else "disconnected"
+
+    @property
+    def response(self) -> str | None:
+        """Return the raw response keyword for successful lookups."""
+        return str(self.code) if self.connected else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the status as a plain dict, for storage and diagnostics."""
+        return {
+            "hostname": self.hostname,
+            "code": str(self.code),
+            "ip": self.ip,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HostStatus:
+        """Build a status from the output of as_dict."""
+        return cls(
+            hostname=data["hostname"],
+            code=ResponseCode(data["code"]),
+            ip=data.get("ip"),
+            error=data.get("error"),
+        )
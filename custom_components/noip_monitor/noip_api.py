@@ -4,20 +4,77 @@ from __future__ import annotations
 import asyncio
 import base64
 import logging
-from typing import Any
+import random
+import time
+from typing import NamedTuple
 
 import aiohttp
 
+from .cache import DEFAULT_CACHE_SIZE, ResultCache
+from .const import (
+    BACKEND_DYNUPDATE,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_HEDGE_PERCENTILE,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_RETRIES,
+)
+from .metrics import Metrics, request_outcome
+from .models import ACCOUNT_ERROR_CODES, HostStatus, ResponseCode
+from .resilience import CircuitBreaker, CircuitOpenError, CircuitState, TokenBucket
+
 _LOGGER = logging.getLogger(__name__)
 
 NOIP_API_BASE_URL = "https://dynupdate.no-ip.com/nic/update"
 NOIP_API_HOST_INFO = "https://www.noip.com/api/host"
 
+# Connection pool tuning for the standalone session
+CONNECTOR_LIMIT = 100
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 60
+
+# Rate limiting
+RATE_LIMIT_BURST = 10
+
+# Retry backoff: full jitter over an exponentially growing window (seconds)
+RETRY_BACKOFF_BASE = 1.0
+RETRY_BACKOFF_MAX = 10.0
+
+# Requests observed before hedging kicks in, and the share of requests that may be hedged
+HEDGE_MIN_SAMPLES = 20
+HEDGE_BUDGET = 0.1
+
+# First token of a response line -> (code, error message)
+RESPONSE_TABLE: dict[str, tuple[ResponseCode, str | None]] = {
+    "good": (ResponseCode.GOOD, None),
+    "nochg": (ResponseCode.NOCHG, None),
+    "nohost": (ResponseCode.NOHOST, "Host not found"),
+    "abuse": (ResponseCode.ABUSE, "Account blocked for abuse"),
+    "badauth": (ResponseCode.BADAUTH, "Invalid credentials"),
+    "badagent": (ResponseCode.BADAGENT, "Client blocked by NoIP"),
+    "911": (ResponseCode.SERVER_ERROR, "NoIP server error"),
+}
+
 
 class NoIPClient:
     """NoIP API Client."""
 
-    def __init__(self, username: str, password: str, token_2fa: str | None = None) -> None:
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        token_2fa: str | None = None,
+        session: aiohttp.ClientSession | None = None,
+        requests_per_minute: float = DEFAULT_RATE_LIMIT,
+        metrics: Metrics | None = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        read_timeout: float = DEFAULT_READ_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        hedge_percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
         """Initialize the NoIP client.
         
         Note: For accounts with 2FA enabled, you can either:
@@ -28,11 +85,39 @@ class NoIPClient:
             username: NoIP account username or email
             password: NoIP account password (or app-specific password)
             token_2fa: Optional 2FA token (6-digit code from authenticator app)
+            session: Optional shared aiohttp session. When given, the client
+                reuses its pooled keep-alive connections and never closes it.
+            requests_per_minute: Rate limit shared by every request of this client
+            metrics: Optional metrics to record requests into
+            connect_timeout: Seconds to wait for a connection to NoIP
+            read_timeout: Seconds to wait for each read of the response
+            retries: Extra attempts after a transient failure (timeout,
+                connection error, HTTP 429/5xx, 911)
+            hedge_percentile: Latency percentile after which a duplicate
+                request is sent; 0 disables hedging
+            cache_ttl: Seconds a lookup result is served again without asking
+                NoIP; 0 disables the cache
+            cache_size: Hostnames kept in the cache before the least recently
+                used are evicted
         """
         self.username = username
         self.password = password
         self.token_2fa = token_2fa
-        self._session: aiohttp.ClientSession | None = None
+        self._session: aiohttp.ClientSession | None = session
+        self._owns_session = session is None
+        self.rate_limiter = TokenBucket(requests_per_minute / 60, RATE_LIMIT_BURST)
+        self.circuit_breaker = CircuitBreaker()
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.timeout = aiohttp.ClientTimeout(
+            total=connect_timeout + read_timeout,
+            sock_connect=connect_timeout,
+            sock_read=read_timeout,
+        )
+        self.retries = retries
+        self.hedge_percentile = hedge_percentile
+        self.cache = ResultCache(cache_ttl, cache_size)
+        # Lookups through the same account give the same answers
+        self.backend_key = f"{BACKEND_DYNUPDATE}:{username.lower()}"
 
     def _get_auth_header(self) -> dict[str, str]:
         """Get authorization header."""
@@ -51,137 +136,336 @@ class NoIPClient:
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get aiohttp session."""
-        if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+        if self._session is None or (self._owns_session and self._session.closed):
+            # Standalone use only; inside Home Assistant the shared session is passed in
+            connector = aiohttp.TCPConnector(
+                limit=CONNECTOR_LIMIT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
         return self._session
 
-    async def async_get_host_ip(self, hostname: str) -> dict[str, Any]:
+    async def async_get_host_ip(self, hostname: str) -> HostStatus:
         """Get IP address for a specific hostname."""
+        results = await self.async_get_hosts_ip([hostname])
+        return results[hostname]
+
+    async def async_get_hosts_ip(
+        self, hostnames: list[str], force: bool = False
+    ) -> dict[str, HostStatus]:
+        """Get IP addresses for several hostnames with a single request.
+
+        The dynupdate protocol accepts a comma-separated hostname list and
+        answers with one line per hostname, in the same order. Transient
+        failures are retried with jittered exponential backoff; only the
+        final outcome is reported to the circuit breaker.
+
+        Hostnames answered within the cache TTL are served from the cache
+        and only the others are requested, unless force is set.
+
+        Raises:
+            CircuitOpenError: The request was skipped because the circuit is open.
+        """
+        if force or not self.cache.ttl:
+            return await self._async_get_uncached(hostnames)
+
+        results: dict[str, HostStatus] = {}
+        missing: list[str] = []
+        for hostname in hostnames:
+            cached = self.cache.get(hostname)
+            if cached is None:
+                missing.append(hostname)
+            else:
+                results[hostname] = cached
+        if missing:
+            results.update(await self._async_get_uncached(missing))
+        return results
+
+    async def _async_get_uncached(self, hostnames: list[str]) -> dict[str, HostStatus]:
+        """Request hostnames from NoIP and store the answers in the cache."""
+        breaker = self.circuit_breaker
+        if not breaker.allow_request():
+            raise CircuitOpenError(f"NoIP API circuit open: {breaker.reason}")
+        is_trial = breaker.state is CircuitState.HALF_OPEN
+
+        try:
+            attempt = await self._async_hedged_request(hostnames)
+            for retry in range(1, self.retries + 1):
+                if not attempt.retryable:
+                    break
+                delay = _backoff(retry)
+                _LOGGER.debug(
+                    "Retrying NoIP request for %d hostnames in %.2fs after: %s",
+                    len(hostnames),
+                    delay,
+                    attempt.failure,
+                )
+                self.metrics.retries += 1
+                await asyncio.sleep(delay)
+                attempt = await self._async_hedged_request(hostnames)
+
+            if attempt.failure is None:
+                breaker.record_success()
+            else:
+                breaker.record_failure(attempt.failure, account_level=attempt.account_level)
+            if attempt.account_level:
+                # Nothing NoIP said before the account was rejected still holds
+                self.cache.clear()
+            else:
+                for result in attempt.results.values():
+                    self.cache.put(result)
+            return attempt.results
+        finally:
+            # A cancelled trial request must not keep the circuit half-open forever
+            if is_trial:
+                breaker.release_trial()
+
+    def _hedge_delay(self) -> float | None:
+        """Return how long to wait before hedging a request, or None not to hedge."""
+        if not self.hedge_percentile:
+            return None
+        latency = self.metrics.overall_latency()
+        if latency.count < HEDGE_MIN_SAMPLES:
+            return None
+        delay = latency.percentile(self.hedge_percentile / 100)
+        # Never hedge later than the request would time out anyway
+        if delay is None or (self.timeout.total and delay >= self.timeout.total):
+            return None
+        return delay
+
+    async def _async_hedged_request(self, hostnames: list[str]) -> _Attempt:
+        """Send a request, and a duplicate if the first one is slower than usual."""
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._async_request(hostnames)
+
+        first = asyncio.ensure_future(self._async_request(hostnames))
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+        except BaseException:
+            # asyncio.wait does not cancel what it waits on
+            first.cancel()
+            raise
+        # Bounded so a slow NoIP does not get twice the load
+        if done or self.metrics.hedges >= HEDGE_BUDGET * self.metrics.requests:
+            return await first
+
+        _LOGGER.debug("Hedging NoIP request for %d hostnames after %.3fs", len(hostnames), delay)
+        self.metrics.hedges += 1
+        second = asyncio.ensure_future(self._async_request(hostnames))
+        try:
+            done, pending = await asyncio.wait(
+                {first, second}, return_when=asyncio.FIRST_COMPLETED
+            )
+        except BaseException:
+            first.cancel()
+            second.cancel()
+            raise
+        for task in pending:
+            task.cancel()
+        winner = first if first in done else second
+        if winner is second:
+            self.metrics.hedge_wins += 1
+        return winner.result()
+
+    async def _async_request(self, hostnames: list[str]) -> _Attempt:
+        """Send one dynupdate request and classify its outcome."""
+        joined = ",".join(hostnames)
+        metrics = self.metrics
+        started: float | None = None
+        received = 0
+        results: dict[str, HostStatus] | None = None
         try:
+            await self.rate_limiter.acquire()
             session = await self._get_session()
             headers = self._get_auth_header()
             headers["User-Agent"] = "Home Assistant NoIP Monitor/1.0"
             
             # NoIP API uses a specific endpoint for checking status
             params = {
-                "hostname": hostname,
+                "hostname": joined,
                 "myip": ""  # Empty to just check current IP
             }
-            
+
+            # Latency is measured from here so rate limiter waits are left out
+            metrics.request_started()
+            started = time.monotonic()
             async with session.get(
                 NOIP_API_BASE_URL,
                 headers=headers,
                 params=params,
-                timeout=aiohttp.ClientTimeout(total=30),
+                timeout=self.timeout,
             ) as response:
+                received = len(await response.read())
                 text = await response.text()
-                _LOGGER.debug("NoIP response for %s: %s", hostname, text)
-                
-                # Parse NoIP response
-                # Responses can be: "good <ip>", "nochg <ip>", "nohost", etc.
-                if response.status == 200:
-                    parts = text.strip().split()
-                    if len(parts) >= 2 and parts[0] in ["good", "nochg"]:
-                        ip_address = parts[1]
-                        return {
-                            "hostname": hostname,
-                            "ip": ip_address,
-                            "status": "connected",
-                            "response": parts[0],
-                        }
-                    elif "nohost" in text:
-                        return {
-                            "hostname": hostname,
-                            "ip": None,
-                            "status": "disconnected",
-                            "error": "Host not found",
-                        }
-                    elif "abuse" in text:
-                        return {
-                            "hostname": hostname,
-                            "ip": None,
-                            "status": "disconnected",
-                            "error": "Account blocked for abuse",
-                        }
-                    elif "badauth" in text:
-                        return {
-                            "hostname": hostname,
-                            "ip": None,
-                            "status": "disconnected",
-                            "error": "Invalid credentials",
-                        }
-                    else:
-                        return {
-                            "hostname": hostname,
-                            "ip": None,
-                            "status": "disconnected",
-                            "error": f"Unknown response: {text}",
-                        }
-                else:
-                    return {
-                        "hostname": hostname,
-                        "ip": None,
-                        "status": "disconnected",
-                        "error": f"HTTP {response.status}",
-                    }
+                _LOGGER.debug("NoIP response for %s: %s", joined, text)
+
+                if response.status != 200:
+                    error = f"HTTP {response.status}"
+                    results = _failures(hostnames, ResponseCode.HTTP_ERROR, error)
+                    if response.status in (401, 403):
+                        return _Attempt(results, error, account_level=True)
+                    if response.status == 429 or response.status >= 500:
+                        return _Attempt(results, error, retryable=True)
+                    return _Attempt(results)
+
+                results = _parse_batch_response(hostnames, text)
+                codes = {result.code for result in results.values()}
+                if codes & ACCOUNT_ERROR_CODES:
+                    return _Attempt(
+                        results,
+                        ", ".join(sorted(codes & ACCOUNT_ERROR_CODES)),
+                        account_level=True,
+                    )
+                if ResponseCode.SERVER_ERROR in codes:
+                    return _Attempt(results, str(ResponseCode.SERVER_ERROR), retryable=True)
+                return _Attempt(results)
                     
         except asyncio.TimeoutError:
-            _LOGGER.error("Timeout connecting to NoIP API for %s", hostname)
-            return {
-                "hostname": hostname,
-                "ip": None,
-                "status": "disconnected",
-                "error": "Timeout",
-            }
+            _LOGGER.warning("Timeout connecting to NoIP API for %s", joined)
+            results = _failures(hostnames, ResponseCode.TIMEOUT, "Timeout")
+            return _Attempt(results, "Timeout", retryable=True)
+        except aiohttp.ClientError as err:
+            _LOGGER.warning("Error connecting to NoIP API for %s: %s", joined, err)
+            results = _failures(hostnames, ResponseCode.ERROR, str(err))
+            return _Attempt(results, str(err), retryable=True)
         except Exception as err:
-            _LOGGER.error("Error fetching NoIP data for %s: %s", hostname, err)
-            return {
-                "hostname": hostname,
-                "ip": None,
-                "status": "disconnected",
-                "error": str(err),
-            }
+            _LOGGER.error("Error fetching NoIP data for %s: %s", joined, err)
+            results = _failures(hostnames, ResponseCode.ERROR, str(err))
+            return _Attempt(results, str(err))
+        finally:
+            if started is not None:
+                if results is None:
+                    # Cancelled mid-flight (or lost a hedge): nothing to classify
+                    metrics.request_abandoned()
+                else:
+                    host_codes = [result.code for result in results.values()]
+                    metrics.request_finished(
+                        request_outcome(host_codes),
+                        time.monotonic() - started,
+                        host_codes,
+                        bytes_sent=len(NOIP_API_BASE_URL) + len(joined),
+                        bytes_received=received,
+                    )
 
-    async def async_get_hosts(self) -> dict[str, dict[str, Any]]:
+    async def async_get_hosts(self) -> dict[str, HostStatus]:
         """Get all hosts from NoIP account."""
         # This is a simplified version - NoIP doesn't have a public API
         # to list all hosts, so we'll return empty and rely on user configuration
         return {}
 
-    async def async_validate_auth(self) -> bool:
+    async def async_validate_auth(self, force: bool = False) -> bool:
         """Validate authentication credentials.
         
+        Connection errors and timeouts are retried like lookups are. Unless
+        force is set, a fresh cached answer proves the credentials without a
+        request, since an account-level error empties the cache.
+
         Returns:
             bool: True if credentials are valid, False otherwise.
         """
-        try:
-            # Try with a dummy hostname to check if credentials are valid
-            session = await self._get_session()
-            headers = self._get_auth_header()
-            headers["User-Agent"] = "Home Assistant NoIP Monitor/1.0"
-            
-            async with session.get(
-                NOIP_API_BASE_URL,
-                headers=headers,
-                params={"hostname": "test"},
-                timeout=aiohttp.ClientTimeout(total=30),
-            ) as response:
-                text = await response.text()
-                _LOGGER.debug("NoIP auth validation response: %s", text)
-                
-                # If we get "badauth", credentials are invalid
-                if "badauth" in text:
-                    return False
+        if not force and self.cache.has_fresh():
+            return True
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(_backoff(attempt))
+            try:
+                # Try with a dummy hostname to check if credentials are valid
+                await self.rate_limiter.acquire()
+                session = await self._get_session()
+                headers = self._get_auth_header()
+                headers["User-Agent"] = "Home Assistant NoIP Monitor/1.0"
                 
-                # Any other response means credentials are OK
-                # (even "nohost" means auth worked)
-                return True
-                
-        except Exception as err:
-            _LOGGER.error("Error validating NoIP credentials: %s", err)
-            return False
+                async with session.get(
+                    NOIP_API_BASE_URL,
+                    headers=headers,
+                    params={"hostname": "test"},
+                    timeout=self.timeout,
+                ) as response:
+                    text = await response.text()
+                    _LOGGER.debug("NoIP auth validation response: %s", text)
+                    
+                    # If we get "badauth", credentials are invalid
+                    if parse_response_line("test", text).code is ResponseCode.BADAUTH:
+                        self.cache.clear()
+                        return False
+                    
+                    # Any other response means credentials are OK
+                    # (even "nohost" means auth worked)
+                    return True
+
+            except (asyncio.TimeoutError, aiohttp.ClientError) as err:
+                _LOGGER.warning(
+                    "Error validating NoIP credentials (attempt %d): %s", attempt + 1, err
+                )
+            except Exception as err:
+                _LOGGER.error("Error validating NoIP credentials: %s", err)
+                return False
+
+        return False
 
     async def close(self) -> None:
-        """Close the session."""
-        if self._session and not self._session.closed:
+        """Close the session if the client created it."""
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
+
+
+class _Attempt(NamedTuple):
+    """Outcome of one request, as seen by the retry loop and circuit breaker."""
+
+    results: dict[str, HostStatus]
+    failure: str | None = None
+    account_level: bool = False
+    retryable: bool = False
+
+
+def _backoff(retry: int) -> float:
+    """Return a jittered delay before the given retry (1 for the first)."""
+    window = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (retry - 1))
+    return random.uniform(0, window)
+
+
+def _failures(hostnames: list[str], code: ResponseCode, error: str) -> dict[str, HostStatus]:
+    """Build the same failed result for every hostname of a request."""
+    return {hostname: HostStatus(hostname, code, error=error) for hostname in hostnames}
+
+
+def parse_response_line(hostname: str, line: str) -> HostStatus:
+    """Classify a single NoIP response line for a hostname in one pass."""
+    # Responses can be: "good <ip>", "nochg <ip>", "nohost", etc.
+    keyword, _, argument = line.strip().partition(" ")
+    entry = RESPONSE_TABLE.get(keyword)
+    if entry is None:
+        return HostStatus(hostname, ResponseCode.UNKNOWN, error=f"Unknown response: {line}")
+
+    code, error = entry
+    if error is None:
+        # The address is the first token; anything after it is not part of it
+        fields = argument.split(None, 1)
+        if not fields:
+            return HostStatus(hostname, ResponseCode.UNKNOWN, error=f"Unknown response: {line}")
+        return HostStatus(hostname, code, ip=fields[0])
+    return HostStatus(hostname, code, error=error)
+
+
+def _parse_batch_response(hostnames: list[str], text: str) -> dict[str, HostStatus]:
+    """Map each line of a multi-host NoIP response back to its hostname."""
+    lines = [line for line in text.splitlines() if line.strip()]
+
+    # Account-level errors (badauth, abuse, ...) come back as a single line
+    if len(lines) == 1 and len(hostnames) > 1:
+        first = parse_response_line(hostnames[0], lines[0])
+        if first.code in ACCOUNT_ERROR_CODES or first.code is ResponseCode.SERVER_ERROR:
+            return _failures(hostnames, first.code, first.error or "")
+
+    results: dict[str, HostStatus] = {}
+    for index, hostname in enumerate(hostnames):
+        if index < len(lines):
+            results[hostname] = parse_response_line(hostname, lines[index])
+        else:
+            results[hostname] = HostStatus(
+                hostname, ResponseCode.UNKNOWN, error="Missing response line"
+            )
+    return results
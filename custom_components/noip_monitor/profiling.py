@@ -0,0 +1,135 @@
+"""On-demand profiling of refresh cycles for NoIP Monitor."""
+from __future__ import annotations
+
+import cProfile
+import pstats
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+from homeassistant.util import dt as dt_util
+
+_T = TypeVar("_T")
+
+# Functions of the synchronous profile reported per cycle
+PROFILE_TOP_FUNCTIONS = 30
+# Slowest lookup tasks reported per cycle
+PROFILE_TOP_TASKS = 10
+# Response parsers; parsing is synchronous, so the profile times it exactly
+PARSE_FUNCTIONS = frozenset({"_parse_batch_response", "parse_response"})
+
+
+class CycleProfiler:
+    """Profiles the next refresh cycles of a coordinator.
+
+    Each cycle gets a cProfile of the synchronous code run on the event loop
+    while it was in progress, the duration of its phases (spans) and the
+    duration of every lookup task. The coordinator only creates a profiler
+    when armed, so an idle one costs nothing.
+    """
+
+    def __init__(self, cycles: int, reports: Callable[[dict[str, Any]], None]) -> None:
+        """Initialize the profiler.
+
+        Args:
+            cycles: Number of refresh cycles to profile
+            reports: Called with the report of every profiled cycle
+        """
+        self.remaining = cycles
+        self._reports = reports
+        self._spans: dict[str, float] = {}
+        self._tasks: list[tuple[int, float]] = []
+
+    @property
+    def done(self) -> bool:
+        """Return whether every requested cycle has been profiled."""
+        return self.remaining <= 0
+
+    @contextmanager
+    def cycle(self) -> Iterator[None]:
+        """Profile one refresh cycle."""
+        self._spans = {}
+        self._tasks = []
+        profile: cProfile.Profile | None = cProfile.Profile()
+        try:
+            profile.enable()  # type: ignore[union-attr]
+        except ValueError:
+            # Another profiler is already active on this thread
+            profile = None
+        started_at = dt_util.utcnow()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            if profile is not None:
+                profile.disable()
+            self.remaining -= 1
+            self._reports(self._report(started_at.isoformat(), duration, profile))
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time one phase of the cycle; repeated phases add up."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._spans[name] = self._spans.get(name, 0.0) + time.perf_counter() - started
+
+    def time_task(
+        self, fetch: Callable[[list[str]], Awaitable[_T]]
+    ) -> Callable[[list[str]], Awaitable[_T]]:
+        """Wrap a batch lookup so the duration of each call is recorded."""
+
+        async def timed(hostnames: list[str]) -> _T:
+            started = time.perf_counter()
+            try:
+                return await fetch(hostnames)
+            finally:
+                self._tasks.append((len(hostnames), time.perf_counter() - started))
+
+        return timed
+
+    def _report(
+        self, started_at: str, duration: float, profile: cProfile.Profile | None
+    ) -> dict[str, Any]:
+        """Build the report of the cycle that just finished."""
+        spans = {name: round(seconds, 6) for name, seconds in self._spans.items()}
+        functions: list[dict[str, Any]] = []
+        if profile is not None:
+            # pstats keeps (calls, primitive calls, own time, cumulative time, callers)
+            stats: dict[tuple[str, int, str], tuple[Any, ...]] = pstats.Stats(
+                profile
+            ).stats  # type: ignore[attr-defined]
+            spans["parse"] = round(
+                sum(entry[3] for key, entry in stats.items() if key[2] in PARSE_FUNCTIONS), 6
+            )
+            top = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+            functions = [
+                {
+                    "function": f"{filename}:{line}({name})",
+                    "calls": entry[1],
+                    "tottime": round(entry[2], 6),
+                    "cumtime": round(entry[3], 6),
+                }
+                for (filename, line, name), entry in top[:PROFILE_TOP_FUNCTIONS]
+            ]
+
+        task_seconds = [seconds for _, seconds in self._tasks]
+        slowest = sorted(self._tasks, key=lambda task: task[1], reverse=True)
+        return {
+            "started": started_at,
+            "duration": round(duration, 6),
+            "spans": spans,
+            "tasks": {
+                "count": len(task_seconds),
+                "total": round(sum(task_seconds), 6),
+                "max": round(max(task_seconds), 6) if task_seconds else None,
+                "slowest": [
+                    {"hostnames": hostnames, "seconds": round(seconds, 6)}
+                    for hostnames, seconds in slowest[:PROFILE_TOP_TASKS]
+                ],
+            },
+            "profile": functions,
+        }
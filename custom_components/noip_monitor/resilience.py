@@ -0,0 +1,141 @@
+"""Rate limiting and circuit breaking for NoIP API calls."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+from enum import StrEnum
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+# Consecutive transient failures (timeouts, HTTP 5xx) that open the circuit
+FAILURE_THRESHOLD = 5
+# Seconds the circuit stays open before a trial request
+TRANSIENT_RESET_TIMEOUT = 300
+ACCOUNT_RESET_TIMEOUT = 1800
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is skipped because the circuit is open."""
+
+
+class CircuitState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class TokenBucket:
+    """Token-bucket rate limiter shared by every request of a client."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Initialize the limiter.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        # Waiters queue on the lock so tokens are handed out in order
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class CircuitBreaker:
+    """Circuit breaker guarding the NoIP account.
+
+    Account-level errors (badauth, abuse) open the circuit immediately; a
+    burst of transient failures opens it after FAILURE_THRESHOLD in a row.
+    Once the reset timeout has passed, one trial request is let through
+    (half-open): success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the breaker."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.reason: str | None = None
+        self.retry_at: datetime | None = None
+        self._opened_until = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        """Return whether requests are currently being skipped."""
+        if self.state is CircuitState.OPEN:
+            return time.monotonic() < self._opened_until
+        return self.state is CircuitState.HALF_OPEN and self._trial_in_flight
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent, starting a trial if due."""
+        if self.state is CircuitState.CLOSED:
+            return True
+        if self.is_open:
+            return False
+        # Reset timeout elapsed (or previous trial finished): let one request through
+        self.state = CircuitState.HALF_OPEN
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful request."""
+        if self.state is not CircuitState.CLOSED:
+            _LOGGER.info("NoIP API circuit closed")
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.reason = None
+        self.retry_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self, reason: str, account_level: bool = False) -> None:
+        """Record a failed request, opening the circuit when warranted."""
+        self.failures += 1
+        self._trial_in_flight = False
+        if account_level:
+            self._open(reason, ACCOUNT_RESET_TIMEOUT)
+        elif self.state is CircuitState.HALF_OPEN or self.failures >= FAILURE_THRESHOLD:
+            self._open(reason, TRANSIENT_RESET_TIMEOUT)
+
+    def release_trial(self) -> None:
+        """Allow a new trial request once the current one has finished."""
+        self._trial_in_flight = False
+
+    def _open(self, reason: str, timeout: float) -> None:
+        """Open the circuit for the given number of seconds."""
+        _LOGGER.warning(
+            "NoIP API circuit opened for %d seconds: %s", timeout, reason
+        )
+        self.state = CircuitState.OPEN
+        self.reason = reason
+        self._opened_until = time.monotonic() + timeout
+        self.retry_at = datetime.now(UTC) + timedelta(seconds=timeout)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": str(self.state),
+            "failures": self.failures,
+            "reason": self.reason,
+            "retry_at": self.retry_at.isoformat() if self.retry_at else None,
+        }
@@ -0,0 +1,100 @@
+"""Adaptive per-hostname polling scheduler for NoIP Monitor."""
+from __future__ import annotations
+
+import heapq
+from collections.abc import Iterable
+
+BACKOFF_FACTOR = 2.0
+# Superseded heap entries tolerated beyond one per hostname before the heap is rebuilt
+COMPACT_SLACK = 64
+
+
+class HostScheduler:
+    """Next-due priority queue of hostnames with adaptive polling intervals.
+
+    Stable hosts back off towards the maximum interval; a change or an error
+    brings a host back to the minimum interval. Times are monotonic seconds.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float) -> None:
+        """Initialize the scheduler."""
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self._heap: list[tuple[float, str]] = []
+        self._due: dict[str, float] = {}
+        self._interval: dict[str, float] = {}
+
+    def __contains__(self, hostname: object) -> bool:
+        """Return whether a hostname is scheduled."""
+        return hostname in self._due
+
+    def __len__(self) -> int:
+        """Return the number of scheduled hostnames."""
+        return len(self._due)
+
+    def sync(self, hostnames: Iterable[str], now: float) -> None:
+        """Track exactly the given hostnames; new ones are due immediately.
+
+        Hostnames popped as due but never recorded are rescheduled as well.
+        """
+        wanted = set(hostnames)
+        for hostname in self._interval.keys() - wanted:
+            self.remove(hostname)
+        for hostname in wanted - self._due.keys():
+            self._interval[hostname] = self.min_interval
+            self._push(hostname, now)
+
+    def remove(self, hostname: str) -> None:
+        """Stop scheduling a hostname; its heap entry is dropped lazily."""
+        self._due.pop(hostname, None)
+        self._interval.pop(hostname, None)
+
+    def pop_due(self, now: float) -> list[str]:
+        """Return the hostnames due at or before now, in due order."""
+        due: list[str] = []
+        while self._heap and self._heap[0][0] <= now:
+            when, hostname = heapq.heappop(self._heap)
+            # Skip entries superseded by a reschedule or removal
+            if self._due.get(hostname) != when:
+                continue
+            del self._due[hostname]
+            due.append(hostname)
+        return due
+
+    def record(self, hostname: str, now: float, changed: bool, failed: bool) -> None:
+        """Reschedule a hostname after a lookup, adapting its interval."""
+        if hostname not in self._interval:
+            return
+        if changed or failed:
+            interval = self.min_interval
+        else:
+            interval = min(self._interval[hostname] * BACKOFF_FACTOR, self.max_interval)
+        self._interval[hostname] = interval
+        self._push(hostname, now + interval)
+
+    def mark_due(self, hostname: str, now: float) -> None:
+        """Make a hostname due now, back at the minimum interval."""
+        if hostname not in self._interval:
+            return
+        self._interval[hostname] = self.min_interval
+        self._push(hostname, now)
+
+    def interval(self, hostname: str) -> float | None:
+        """Return the current polling interval of a hostname."""
+        return self._interval.get(hostname)
+
+    def next_due(self) -> float | None:
+        """Return when the next hostname is due, if any."""
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _push(self, hostname: str, when: float) -> None:
+        """Schedule a hostname at the given time."""
+        self._due[hostname] = when
+        heapq.heappush(self._heap, (when, hostname))
+        # Rescheduling before an entry is due leaves the old one behind; drop
+        # them once they outnumber the live entries so the heap stays bounded
+        if len(self._heap) > 2 * len(self._due) + COMPACT_SLACK:
+            self._heap = [(due, name) for name, due in self._due.items()]
+            heapq.heapify(self._heap)
@@ -2,11 +2,21 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable, Collection
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -14,10 +24,103 @@ from .const import DOMAIN, STATE_DISCONNECTED
 
 if TYPE_CHECKING:
     from . import NoIPDataUpdateCoordinator
+    from .aggregates import HostAggregates
+    from .metrics import Metrics
+    from .models import HostStatus
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class NoIPMetricSensorDescription(SensorEntityDescription):
+    """Describes a sensor exposing one runtime metric."""
+
+    value_fn: Callable[[Metrics], float | int | None]
+
+
+@dataclass(frozen=True, kw_only=True)
+class NoIPAggregateSensorDescription(SensorEntityDescription):
+    """Describes a sensor exposing one account-wide hostname total."""
+
+    value_fn: Callable[[HostAggregates], int]
+    attributes_fn: Callable[[HostAggregates], dict[str, Any]] | None = None
+
+
+def _p95_latency_ms(metrics: Metrics) -> float | None:
+    """Return the 95th percentile request latency in milliseconds."""
+    p95 = metrics.overall_latency().percentile(0.95)
+    if p95 is None or p95 == float("inf"):
+        return None
+    return p95 * 1000
+
+
+METRIC_SENSORS: tuple[NoIPMetricSensorDescription, ...] = (
+    NoIPMetricSensorDescription(
+        key="cycle_duration",
+        name="Last refresh duration",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda metrics: metrics.last_cycle_duration,
+    ),
+    NoIPMetricSensorDescription(
+        key="requests",
+        name="API requests",
+        icon="mdi:counter",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda metrics: metrics.requests,
+    ),
+    NoIPMetricSensorDescription(
+        key="latency_p95",
+        name="Request latency p95",
+        icon="mdi:timer-sand",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=_p95_latency_ms,
+    ),
+)
+
+AGGREGATE_SENSORS: tuple[NoIPAggregateSensorDescription, ...] = (
+    NoIPAggregateSensorDescription(
+        key="connected_hosts",
+        name="Connected hostnames",
+        icon="mdi:lan-connect",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregates: aggregates.connected,
+    ),
+    NoIPAggregateSensorDescription(
+        key="disconnected_hosts",
+        name="Disconnected hostnames",
+        icon="mdi:lan-disconnect",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregates: aggregates.disconnected,
+        attributes_fn=lambda aggregates: {
+            str(code): count for code, count in aggregates.disconnected_by_code.items()
+        },
+    ),
+    NoIPAggregateSensorDescription(
+        key="changed_hosts",
+        name="Hostnames changed in last refresh",
+        icon="mdi:swap-horizontal",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregates: aggregates.changed_last_cycle,
+    ),
+)
+
+# Unique ID suffixes of the account-level sensors (hostname sensors use the hostname)
+CIRCUIT_SENSOR_KEY = "circuit_breaker"
+ACCOUNT_SENSOR_KEYS = frozenset(
+    {
+        CIRCUIT_SENSOR_KEY,
+        *(description.key for description in METRIC_SENSORS),
+        *(description.key for description in AGGREGATE_SENSORS),
+    }
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -26,53 +129,95 @@ async def async_setup_entry(
     """Set up NoIP Monitor sensors from a config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
 
-    # Wait for first data update
-    await coordinator.async_config_entry_first_refresh()
+    # Sensors start from the restored snapshot, or from the configured hostnames
+    # when there is none yet; the first refresh runs in the background
+    if coordinator.data is None:
+        _LOGGER.debug("No cached data yet; creating sensors for the configured hostnames")
 
-    # Create sensors for each hostname
-    entities = []
-    if coordinator.data:
-        _LOGGER.info("Creating sensors for %d hostnames", len(coordinator.data))
-        for hostname in coordinator.data:
-            _LOGGER.debug("Creating sensor for hostname: %s", hostname)
-            entities.append(NoIPSensor(coordinator, entry, hostname))
-    else:
-        _LOGGER.warning("No data available from coordinator. No sensors will be created. "
-                       "Please configure hostnames in the integration options.")
+    async_add_entities(
+        [
+            NoIPCircuitSensor(coordinator, entry),
+            *(
+                NoIPMetricSensor(coordinator, entry, description)
+                for description in METRIC_SENSORS
+            ),
+            *(
+                NoIPAggregateSensor(coordinator, entry, description)
+                for description in AGGREGATE_SENSORS
+            ),
+        ]
+    )
 
-    async_add_entities(entities)
+    # Per-entry index of hostname sensors
+    entities: dict[str, NoIPSensor] = {}
+    hass.data[DOMAIN][f"{entry.entry_id}_entities"] = entities
+    hostnames_version: int | None = None
 
-    # Add listener to add new sensors when options change
     @callback
     def _async_add_remove_sensors() -> None:
-        """Add or remove sensors based on coordinator data."""
-        current_hostnames = set(coordinator.data.keys()) if coordinator.data else set()
-        
-        # Get existing sensor hostnames
-        existing_entities = [
-            entity for entity in hass.data[DOMAIN].get(f"{entry.entry_id}_entities", [])
-        ]
-        existing_hostnames = {entity.hostname for entity in existing_entities}
+        """Add or remove sensors when the set of hostnames changes."""
+        nonlocal hostnames_version
+        if coordinator.hostnames_version == hostnames_version:
+            return
+        hostnames_version = coordinator.hostnames_version
+
+        # Sensors follow the configured hostnames, not the results of the last
+        # refresh: a hostname skipped while the circuit was open, or not looked
+        # up yet, keeps its sensor. With none configured and nothing known yet,
+        # nothing is removed
+        current_hostnames = set(coordinator.monitored_hostnames())
+        if not current_hostnames and coordinator.data is None:
+            hostnames_version = None
+            return
 
         # Add new sensors
-        new_entities = []
-        for hostname in current_hostnames - existing_hostnames:
-            new_entities.append(NoIPSensor(coordinator, entry, hostname))
-        
+        new_entities = [
+            NoIPSensor(coordinator, entry, hostname)
+            for hostname in current_hostnames - entities.keys()
+        ]
         if new_entities:
+            _LOGGER.info("Creating sensors for %d hostnames", len(new_entities))
+            for entity in new_entities:
+                entities[entity.hostname] = entity
             async_add_entities(new_entities)
-            if f"{entry.entry_id}_entities" not in hass.data[DOMAIN]:
-                hass.data[DOMAIN][f"{entry.entry_id}_entities"] = []
-            hass.data[DOMAIN][f"{entry.entry_id}_entities"].extend(new_entities)
 
-    # Store initial entities
-    if entities:
-        hass.data[DOMAIN][f"{entry.entry_id}_entities"] = entities
+        # Remove sensors of hostnames that are no longer monitored
+        for hostname in entities.keys() - current_hostnames:
+            del entities[hostname]
+        _async_remove_stale_sensors(hass, entry, current_hostnames)
+
+    _async_add_remove_sensors()
 
     # Register coordinator listener
     entry.async_on_unload(coordinator.async_add_listener(_async_add_remove_sensors))
 
 
+@callback
+def _async_remove_stale_sensors(
+    hass: HomeAssistant, entry: ConfigEntry, hostnames: Collection[str]
+) -> None:
+    """Remove registry entries of hostname sensors that are no longer monitored."""
+    registry = er.async_get(hass)
+    prefix = f"{entry.entry_id}_"
+    for registry_entry in er.async_entries_for_config_entry(registry, entry.entry_id):
+        key = registry_entry.unique_id.removeprefix(prefix)
+        if key in ACCOUNT_SENSOR_KEYS or key in hostnames:
+            continue
+        _LOGGER.info("Removing sensor for hostname no longer monitored: %s", key)
+        registry.async_remove(registry_entry.entity_id)
+
+
+def _device_info(entry: ConfigEntry) -> DeviceInfo:
+    """Return the device grouping all sensors of a config entry."""
+    return {
+        "identifiers": {(DOMAIN, entry.entry_id)},
+        "name": f"NoIP Monitor ({entry.data['username']})",
+        "manufacturer": "NoIP",
+        "model": "Dynamic DNS Monitor",
+        "entry_type": "service",
+    }
+
+
 class NoIPSensor(CoordinatorEntity, SensorEntity):
     """Representation of a NoIP Monitor sensor."""
 
@@ -90,31 +235,38 @@ class NoIPSensor(CoordinatorEntity, SensorEntity):
         self.hostname = hostname
         self._attr_unique_id = f"{entry.entry_id}_{hostname}"
         self._attr_name = hostname
+        self._last_available: bool | None = None
         
         # Set device info to group all sensors under one device
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, entry.entry_id)},
-            "name": f"NoIP Monitor ({entry.data['username']})",
-            "manufacturer": "NoIP",
-            "model": "Dynamic DNS Monitor",
-            "entry_type": "service",
-        }
+        self._attr_device_info = _device_info(entry)
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the availability written when the entity was added."""
+        await super().async_added_to_hass()
+        self._last_available = self.available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this hostname's result or availability changed."""
+        available = self.available
+        if self.hostname not in self.coordinator.changed_hosts and available == self._last_available:
+            return
+        self._last_available = available
+        self.async_write_ha_state()
 
     @property
     def native_value(self) -> str | None:
-        """Return the state of the sensor."""
-        if not self.coordinator.data:
-            return STATE_DISCONNECTED
+        """Return the state of the sensor, unknown until the first lookup."""
+        if self.coordinator.data is None:
+            return None
 
-        host_data = self.coordinator.data.get(self.hostname)
-        if not host_data:
+        host: HostStatus | None = self.coordinator.data.get(self.hostname)
+        if host is None:
+            return None
+        if not host.connected:
             return STATE_DISCONNECTED
 
-        if host_data.get("status") == "connected" and host_data.get("ip"):
-            ip_value: str = host_data["ip"]
-            return ip_value
-        
-        return STATE_DISCONNECTED
+        return host.ip
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -122,18 +274,18 @@ class NoIPSensor(CoordinatorEntity, SensorEntity):
         if not self.coordinator.data:
             return {}
 
-        host_data = self.coordinator.data.get(self.hostname, {})
+        host: HostStatus | None = self.coordinator.data.get(self.hostname)
         
         attributes = {
             "hostname": self.hostname,
-            "status": host_data.get("status", "unknown"),
+            "status": host.status if host is not None else "unknown",
         }
 
-        if host_data.get("response"):
-            attributes["response"] = host_data["response"]
+        if host is not None and host.response:
+            attributes["response"] = host.response
         
-        if host_data.get("error"):
-            attributes["error"] = host_data["error"]
+        if host is not None and host.error:
+            attributes["error"] = host.error
 
         return attributes
 
@@ -148,3 +300,110 @@ class NoIPSensor(CoordinatorEntity, SensorEntity):
     def available(self) -> bool:
         """Return if entity is available."""
         return bool(self.coordinator.last_update_success)
+
+
+class NoIPCircuitSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor showing the state of the NoIP API circuit breaker."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:electric-switch"
+    coordinator: NoIPDataUpdateCoordinator
+
+    def __init__(self, coordinator: NoIPDataUpdateCoordinator, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_{CIRCUIT_SENSOR_KEY}"
+        self._attr_name = "API circuit"
+        self._attr_device_info = _device_info(entry)
+        self._last_snapshot: dict[str, Any] | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the circuit breaker changed."""
+        snapshot = self.coordinator.client.circuit_breaker.as_dict()
+        if snapshot == self._last_snapshot:
+            return
+        self._last_snapshot = snapshot
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> str:
+        """Return the circuit breaker state."""
+        return str(self.coordinator.client.circuit_breaker.state)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the circuit breaker details."""
+        attributes = self.coordinator.client.circuit_breaker.as_dict()
+        attributes.pop("state")
+        return attributes
+
+
+class NoIPMetricSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor exposing one runtime metric, disabled by default."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    coordinator: NoIPDataUpdateCoordinator
+    entity_description: NoIPMetricSensorDescription
+
+    def __init__(
+        self,
+        coordinator: NoIPDataUpdateCoordinator,
+        entry: ConfigEntry,
+        description: NoIPMetricSensorDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = _device_info(entry)
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the current metric value."""
+        return self.entity_description.value_fn(self.coordinator.metrics)
+
+
+class NoIPAggregateSensor(CoordinatorEntity, SensorEntity):
+    """Sensor exposing one hostname total of the config entry."""
+
+    _attr_has_entity_name = True
+    coordinator: NoIPDataUpdateCoordinator
+    entity_description: NoIPAggregateSensorDescription
+
+    def __init__(
+        self,
+        coordinator: NoIPDataUpdateCoordinator,
+        entry: ConfigEntry,
+        description: NoIPAggregateSensorDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = _device_info(entry)
+        self._last_snapshot: tuple[int, dict[str, Any]] | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the total or its breakdown changed."""
+        snapshot = (self.native_value, self.extra_state_attributes)
+        if snapshot == self._last_snapshot:
+            return
+        self._last_snapshot = snapshot
+        self.async_write_ha_state()
+
+    @property
+    def native_value(self) -> int:
+        """Return the current total."""
+        return self.entity_description.value_fn(self.coordinator.aggregates)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the breakdown of the total, if any."""
+        if self.entity_description.attributes_fn is None:
+            return {}
+        return self.entity_description.attributes_fn(self.coordinator.aggregates)
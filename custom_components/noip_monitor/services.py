@@ -0,0 +1,189 @@
+"""Services for the NoIP Monitor integration."""
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_CYCLES,
+    ATTR_FORCE,
+    ATTR_HOSTNAMES,
+    DOMAIN,
+    MAX_PROFILE_CYCLES,
+    SERVICE_GET_IP_HISTORY,
+    SERVICE_PROFILE,
+    SERVICE_REFRESH,
+)
+
+if TYPE_CHECKING:
+    from . import NoIPDataUpdateCoordinator
+
+GET_IP_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_HOSTNAMES): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_HOSTNAMES): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_FORCE, default=False): cv.boolean,
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PROFILE_CYCLES)
+        ),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+
+def _coordinators(hass: HomeAssistant) -> list[NoIPDataUpdateCoordinator]:
+    """Return the coordinators of every loaded config entry."""
+    domain_data = hass.data.get(DOMAIN, {})
+    return [
+        domain_data[entry.entry_id]
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.entry_id in domain_data
+    ]
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_get_ip_history(call: ServiceCall) -> ServiceResponse:
+        """Return the recorded IP transitions of the requested hostnames."""
+        wanted = set(call.data.get(ATTR_HOSTNAMES, []))
+        hosts: dict[str, list[dict[str, str]]] = {}
+        for coordinator in _coordinators(hass):
+            for hostname in coordinator.data or {}:
+                if wanted and hostname not in wanted:
+                    continue
+                hosts[hostname] = [
+                    {
+                        "timestamp": dt_util.utc_from_timestamp(transition.timestamp).isoformat(),
+                        "old_ip": transition.old_ip,
+                        "new_ip": transition.new_ip,
+                    }
+                    for transition in coordinator.history.get(hostname)
+                ]
+        return {"hosts": hosts}
+
+    async def async_refresh(call: ServiceCall) -> ServiceResponse:
+        """Look up the requested hostnames now and return their results."""
+        targets = _refresh_targets(hass, call)
+        results = await asyncio.gather(
+            *(
+                coordinator.async_refresh_hosts(hostnames, call.data[ATTR_FORCE])
+                for coordinator, hostnames in targets
+            )
+        )
+        return {
+            "hosts": {
+                hostname: host.as_dict()
+                for entry_results in results
+                for hostname, host in entry_results.items()
+            }
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        async_refresh,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_profile(call: ServiceCall) -> None:
+        """Profile the next refresh cycles of one or every config entry."""
+        entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+        coordinators = [
+            coordinator
+            for coordinator in _coordinators(hass)
+            if entry_id is None or coordinator.entry.entry_id == entry_id
+        ]
+        if not coordinators:
+            raise ServiceValidationError(f"{entry_id} is not a loaded NoIP Monitor entry")
+        for coordinator in coordinators:
+            coordinator.async_arm_profiler(call.data[ATTR_CYCLES])
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_IP_HISTORY,
+        async_get_ip_history,
+        schema=GET_IP_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _refresh_targets(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[tuple[NoIPDataUpdateCoordinator, list[str]]]:
+    """Return the hostnames to refresh per coordinator.
+
+    Hostnames and sensor entity IDs can be combined; without either, every
+    monitored hostname is refreshed.
+    """
+    coordinators = _coordinators(hass)
+    hostnames: list[str] = call.data.get(ATTR_HOSTNAMES, [])
+    entity_ids: list[str] = call.data.get(ATTR_ENTITY_ID, [])
+    if not hostnames and not entity_ids:
+        return [
+            (coordinator, coordinator.monitored_hostnames())
+            for coordinator in coordinators
+        ]
+
+    by_entry = {coordinator.entry.entry_id: coordinator for coordinator in coordinators}
+    wanted: dict[str, set[str]] = {entry_id: set() for entry_id in by_entry}
+    registry = er.async_get(hass)
+    for entity_id in entity_ids:
+        registry_entry = registry.async_get(entity_id)
+        if (
+            registry_entry is None
+            or registry_entry.platform != DOMAIN
+            or registry_entry.config_entry_id not in by_entry
+        ):
+            raise ServiceValidationError(f"{entity_id} is not a NoIP Monitor sensor")
+        entry_id = registry_entry.config_entry_id
+        wanted[entry_id].add(registry_entry.unique_id.removeprefix(f"{entry_id}_"))
+
+    for entry_id in wanted:
+        wanted[entry_id].update(hostnames)
+
+    targets = []
+    for entry_id, entry_hostnames in wanted.items():
+        coordinator = by_entry[entry_id]
+        monitored = [
+            hostname
+            for hostname in coordinator.monitored_hostnames()
+            if hostname in entry_hostnames
+        ]
+        if monitored:
+            targets.append((coordinator, monitored))
+    if not targets:
+        raise ServiceValidationError("None of the given hostnames or entities is monitored")
+    return targets
@@ -0,0 +1,149 @@
+"""Domain-wide request budget and lookup sharing for NoIP Monitor."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from itertools import count
+from typing import TYPE_CHECKING
+
+from .const import DOMAIN, MAX_CONCURRENCY_LIMIT, MAX_RATE_LIMIT
+from .models import HostStatus
+from .resilience import TokenBucket
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+DISPATCHER_KEY = "dispatcher"
+
+# Budget shared by every config entry, on top of each entry's own limits; a
+# single entry can use all of it, several entries split it
+GLOBAL_MAX_CONCURRENCY = MAX_CONCURRENCY_LIMIT
+GLOBAL_RATE_LIMIT = MAX_RATE_LIMIT  # requests per minute
+GLOBAL_RATE_BURST = 20
+# Seconds between the first refreshes of consecutive config entries
+STAGGER_DELAY = 10
+# Results younger than this, plus the stagger spread of the registered entries,
+# are handed to other entries instead of fetched again
+SHARE_WINDOW = 15
+
+LookupKey = tuple[str, str]
+
+
+class LookupDispatcher:
+    """Coordinates the lookups of every config entry of the domain.
+
+    Lookups of the same hostname through the same backend (in practice
+    the same DNS resolver, as a NoIP account can only be added once) are
+    single-flight: an entry asking for a hostname another entry is already
+    fetching, or fetched within the share window, gets that result instead
+    of sending its own request.
+
+    Entries keep the offset their staggered first refresh gave them, so
+    the window spans the stagger of every registered entry: the last one
+    still reuses what the first one fetched in the same cycle.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the dispatcher."""
+        self.semaphore = asyncio.Semaphore(GLOBAL_MAX_CONCURRENCY)
+        self.rate_limiter = TokenBucket(GLOBAL_RATE_LIMIT / 60, GLOBAL_RATE_BURST)
+        self._slots: dict[str, int] = {}
+        self._in_flight: dict[LookupKey, asyncio.Future[HostStatus | None]] = {}
+        self._recent: dict[LookupKey, tuple[float, HostStatus]] = {}
+
+    def register(self, entry_id: str) -> float:
+        """Register a config entry and return how long its first refresh should wait."""
+        taken = set(self._slots.values())
+        slot = next(index for index in count() if index not in taken)
+        self._slots[entry_id] = slot
+        return float(slot * STAGGER_DELAY)
+
+    def unregister(self, entry_id: str) -> None:
+        """Release the start slot of an unloaded config entry."""
+        self._slots.pop(entry_id, None)
+
+    @property
+    def share_window(self) -> float:
+        """Return how long a fetched result is shared with other entries."""
+        return SHARE_WINDOW + max(self._slots.values(), default=0) * STAGGER_DELAY
+
+    async def async_fetch(
+        self,
+        backend_key: str,
+        hostnames: list[str],
+        fetch: Callable[[list[str]], Awaitable[dict[str, HostStatus]]],
+        share: bool = True,
+    ) -> dict[str, HostStatus]:
+        """Look up hostnames with fetch, sharing lookups with other entries.
+
+        Hostnames missing from the result of fetch (skipped while the
+        circuit is open) are missing from the returned results as well.
+        Without share, results from the share window are not reused, so
+        the caller gets a fresh lookup; lookups already in flight are still
+        joined, and its own results are still shared with other entries.
+        """
+        now = time.monotonic()
+        self._prune(now)
+        loop = asyncio.get_running_loop()
+
+        results: dict[str, HostStatus] = {}
+        own: list[str] = []
+        joined: dict[str, asyncio.Future[HostStatus | None]] = {}
+        for hostname in hostnames:
+            key = (backend_key, hostname)
+            recent = self._recent.get(key)
+            if recent is not None and share:
+                results[hostname] = recent[1]
+            elif (future := self._in_flight.get(key)) is not None:
+                joined[hostname] = future
+            else:
+                self._in_flight[key] = loop.create_future()
+                own.append(hostname)
+
+        if len(own) < len(hostnames):
+            _LOGGER.debug(
+                "Sharing %d of %d lookups with other entries",
+                len(hostnames) - len(own),
+                len(hostnames),
+            )
+
+        fetched: dict[str, HostStatus] = {}
+        try:
+            if own:
+                fetched = await fetch(own)
+        finally:
+            # Resolve our lookups even when cancelled, so joined entries never hang
+            finished = time.monotonic()
+            for hostname in own:
+                key = (backend_key, hostname)
+                result = fetched.get(hostname)
+                self._in_flight.pop(key).set_result(result)
+                if result is not None:
+                    self._recent[key] = (finished, result)
+
+        results.update(fetched)
+        for hostname, future in joined.items():
+            result = await asyncio.shield(future)
+            if result is not None:
+                results[hostname] = result
+        return results
+
+    def _prune(self, now: float) -> None:
+        """Forget shared results older than the share window."""
+        window = self.share_window
+        expired = [key for key, (at, _) in self._recent.items() if now - at >= window]
+        for key in expired:
+            del self._recent[key]
+
+
+def get_dispatcher(hass: HomeAssistant) -> LookupDispatcher:
+    """Return the dispatcher of the domain, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    dispatcher: LookupDispatcher | None = domain_data.get(DISPATCHER_KEY)
+    if dispatcher is None:
+        dispatcher = domain_data[DISPATCHER_KEY] = LookupDispatcher()
+    return dispatcher
@@ -0,0 +1,142 @@
+"""Refresh triggers for NoIP Monitor: a linked entity or event signalling a WAN change."""
+from __future__ import annotations
+
+import ipaddress
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.util import dt as dt_util
+
+from .const import ATTR_HOSTNAMES
+
+_LOGGER = logging.getLogger(__name__)
+
+# Called with the previous WAN IP, if known, and the hostnames named by the signal, if any
+TriggerCallback = Callable[[str | None, list[str] | None], None]
+
+
+def _as_ip(value: str | None) -> str | None:
+    """Return value if it is an IP address, else None."""
+    if value is None:
+        return None
+    try:
+        return str(ipaddress.ip_address(value.strip()))
+    except ValueError:
+        return None
+
+
+class RefreshTrigger:
+    """Listens to a linked entity and/or event and reports network changes.
+
+    An entity whose state is an IP address (such as a router's external IP
+    sensor) triggers when that address changes, and reports the previous
+    one so only the hostnames pointing at it need a refresh. Any other
+    entity triggers on every state change, except when it appears or comes
+    back from unavailable or unknown. An event triggers every time it
+    fires; a "hostnames" list in its data narrows the refresh.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entity_id: str | None,
+        event_type: str | None,
+        on_trigger: TriggerCallback,
+    ) -> None:
+        """Initialize the trigger.
+
+        Args:
+            hass: Home Assistant instance
+            entity_id: Entity whose state changes signal a WAN change
+            event_type: Event whose firing signals a WAN change
+            on_trigger: Called on every signal
+        """
+        self.hass = hass
+        self.entity_id = entity_id
+        self.event_type = event_type
+        self._on_trigger = on_trigger
+        self._last_ip: str | None = None
+        self.fired = 0
+        self.last_fired: str | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Start listening and return the function that stops it."""
+        unsubs: list[CALLBACK_TYPE] = []
+        if self.entity_id:
+            if (state := self.hass.states.get(self.entity_id)) is not None:
+                self._last_ip = _as_ip(state.state)
+            unsubs.append(
+                async_track_state_change_event(
+                    self.hass, [self.entity_id], self._async_state_changed
+                )
+            )
+        if self.event_type:
+            unsubs.append(self.hass.bus.async_listen(self.event_type, self._async_event_fired))
+
+        @callback
+        def _stop() -> None:
+            for unsub in unsubs:
+                unsub()
+
+        return _stop
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Handle a state change of the linked entity."""
+        new_state = event.data.get("new_state")
+        old_state = event.data.get("old_state")
+        if new_state is None or new_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            # Going offline says nothing about the next address
+            return
+
+        new_ip = _as_ip(new_state.state)
+        if new_ip is not None:
+            # Compare with the last address seen, so a brief outage does not
+            # count; the first address seen is only recorded
+            old_ip, self._last_ip = self._last_ip, new_ip
+            if old_ip is None or old_state is None or new_ip == old_ip:
+                return
+            _LOGGER.info("%s reports WAN IP %s (was %s)", self.entity_id, new_ip, old_ip)
+            self._fire(old_ip, None)
+            return
+
+        if (
+            old_state is None
+            or old_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN)
+            or old_state.state == new_state.state
+        ):
+            # Appearing or coming back online is not a change
+            return
+        _LOGGER.info("%s changed to %s", self.entity_id, new_state.state)
+        self._fire(None, None)
+
+    @callback
+    def _async_event_fired(self, event: Event) -> None:
+        """Handle the linked event."""
+        hostnames = event.data.get(ATTR_HOSTNAMES)
+        if isinstance(hostnames, str):
+            hostnames = [hostnames]
+        _LOGGER.info("%s fired", self.event_type)
+        self._fire(None, list(hostnames) if hostnames else None)
+
+    @callback
+    def _fire(self, old_ip: str | None, hostnames: list[str] | None) -> None:
+        """Report a signal to the coordinator."""
+        self.fired += 1
+        self.last_fired = dt_util.utcnow().isoformat()
+        self._on_trigger(old_ip, hostnames)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trigger state for diagnostics."""
+        return {
+            "entity_id": self.entity_id,
+            "event_type": self.event_type,
+            "last_ip": self._last_ip,
+            "fired": self.fired,
+            "last_fired": self.last_fired,
+        }
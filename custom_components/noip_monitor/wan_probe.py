@@ -0,0 +1,50 @@
+"""Public (WAN) IP detection for NoIP Monitor."""
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+PROBE_TIMEOUT = 10  # seconds
+
+
+class WANProbe:
+    """Detect the current public IP with a plain-text IP-echo service."""
+
+    def __init__(
+        self, session: aiohttp.ClientSession, url: str, timeout: float = PROBE_TIMEOUT
+    ) -> None:
+        """Initialize the probe.
+
+        Args:
+            session: Shared aiohttp session
+            url: Service answering with the caller's address as plain text
+            timeout: Seconds to wait for the answer
+        """
+        self._session = session
+        self.url = url
+        self.timeout = timeout
+
+    async def async_get_ip(self) -> str | None:
+        """Return the current public IP, or None if it could not be detected."""
+        try:
+            async with self._session.get(
+                self.url, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            ) as response:
+                if response.status != 200:
+                    _LOGGER.warning("WAN IP probe %s answered HTTP %s", self.url, response.status)
+                    return None
+                text = (await response.text()).strip()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.warning("WAN IP probe %s failed: %s", self.url, err)
+            return None
+
+        try:
+            return str(ipaddress.ip_address(text))
+        except ValueError:
+            _LOGGER.warning("WAN IP probe %s returned an invalid address: %.40s", self.url, text)
+            return None
@@ -0,0 +1 @@
+"""Tests for the NoIP Monitor integration."""
@@ -0,0 +1,61 @@
+"""Shared fixtures for the NoIP Monitor tests."""
+from __future__ import annotations
+
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = "custom_components.noip_monitor"
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+# The package __init__ sets the integration up and needs Home Assistant. The
+# modules tested here only import each other, so without Home Assistant the
+# package is registered without running its __init__.
+if importlib.util.find_spec("homeassistant") is None:
+    for name, path in (
+        ("custom_components", ROOT / "custom_components"),
+        (PACKAGE, ROOT / "custom_components" / "noip_monitor"),
+    ):
+        if name not in sys.modules:
+            module = types.ModuleType(name)
+            module.__path__ = [str(path)]
+            sys.modules[name] = module
+
+# Tests that run the integration in Home Assistant need its test harness
+if importlib.util.find_spec("pytest_homeassistant_custom_component") is None:
+    collect_ignore = ["integration"]
+
+
+class FakeClock:
+    """Stand-in for the time module whose monotonic clock only moves when told."""
+
+    def __init__(self, now: float = 1000.0) -> None:
+        """Initialize the clock."""
+        self.now = now
+
+    def monotonic(self) -> float:
+        """Return the current time."""
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward."""
+        self.now += seconds
+
+
+if importlib.util.find_spec("pytest_socket") is None:
+
+    @pytest.fixture
+    def socket_enabled() -> None:
+        """Stand-in for the pytest-socket fixture; sockets are open without it."""
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Return a clock tests can install in place of a module's time import."""
+    return FakeClock()
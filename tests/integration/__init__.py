@@ -0,0 +1 @@
+"""Tests that run the integration in Home Assistant."""
@@ -0,0 +1,104 @@
+"""Fixtures for the tests that run the integration in Home Assistant."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+import custom_components.noip_monitor as integration
+from custom_components.noip_monitor.const import DOMAIN
+from custom_components.noip_monitor.models import HostStatus, ResponseCode
+from custom_components.noip_monitor.noip_api import NoIPClient
+
+DEFAULT_IP = "1.1.1.1"
+
+
+class FakeNoIP:
+    """Stand-in for the NoIP lookups of every NoIPClient."""
+
+    def __init__(self) -> None:
+        """Answer every hostname with DEFAULT_IP until told otherwise."""
+        self.ips: dict[str, str] = {}
+        # Hostnames whose batch fails with the given exception
+        self.errors: dict[str, Exception] = {}
+        self.requests: list[list[str]] = []
+        self.forced: list[bool] = []
+        # While set, lookups wait for it
+        self.gate: asyncio.Event | None = None
+
+    async def async_get_hosts_ip(
+        self, hostnames: list[str], force: bool = False
+    ) -> dict[str, HostStatus]:
+        """Answer one batch."""
+        self.requests.append(list(hostnames))
+        self.forced.append(force)
+        if self.gate is not None:
+            await self.gate.wait()
+        for hostname in hostnames:
+            if hostname in self.errors:
+                raise self.errors[hostname]
+        return {
+            hostname: HostStatus(hostname, ResponseCode.NOCHG, ip=self.ips.get(hostname, DEFAULT_IP))
+            for hostname in hostnames
+        }
+
+    @property
+    def looked_up(self) -> list[str]:
+        """Return every hostname looked up so far, in order."""
+        return [hostname for batch in self.requests for hostname in batch]
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Let Home Assistant load the integration from custom_components."""
+
+
+@pytest.fixture(autouse=True)
+def no_debounce() -> Iterator[None]:
+    """Send on-demand refreshes without waiting for more requests."""
+    with patch.object(integration, "REFRESH_DEBOUNCE", 0):
+        yield
+
+
+@pytest.fixture
+def noip() -> Iterator[FakeNoIP]:
+    """Replace the NoIP lookups with a FakeNoIP."""
+    fake = FakeNoIP()
+    with patch.object(NoIPClient, "async_get_hosts_ip", fake.async_get_hosts_ip):
+        yield fake
+
+
+def make_entry(hass: HomeAssistant, **options: Any) -> MockConfigEntry:
+    """Add a config entry with the given options to Home Assistant."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="user",
+        data={"username": "user", "password": "pass"},
+        options=options,
+        minor_version=2,
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+async def async_wait_background(hass: HomeAssistant) -> None:
+    """Wait for the background tasks of the integration, such as the first refresh."""
+    await hass.async_block_till_done()
+    while tasks := [
+        task for task in hass._background_tasks if task.get_name().startswith(DOMAIN)
+    ]:
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await hass.async_block_till_done()
+
+
+async def async_setup(hass: HomeAssistant, **options: Any) -> MockConfigEntry:
+    """Set an entry with the given options up and wait for its first refresh."""
+    entry = make_entry(hass, **options)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_background(hass)
+    return entry
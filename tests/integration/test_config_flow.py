@@ -0,0 +1,49 @@
+"""Tests for the options flow."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.noip_monitor.const import (
+    CONF_HOSTNAMES,
+    CONF_MAX_INTERVAL,
+    CONF_MIN_INTERVAL,
+)
+
+from .conftest import FakeNoIP, async_setup
+
+
+def suggested_values(result: Any) -> dict[str, Any]:
+    """Return the value each field of a form is pre-filled with."""
+    values = {}
+    for key in result["data_schema"].schema:
+        if "suggested_value" in (key.description or {}):
+            values[str(key)] = key.description["suggested_value"]
+        elif callable(key.default):
+            values[str(key)] = key.default()
+    return values
+
+
+async def test_rejected_settings_keep_the_input(hass: HomeAssistant, noip: FakeNoIP) -> None:
+    """A form rejected by validation shows what the user typed, not the saved options."""
+    entry = await async_setup(hass, **{CONF_HOSTNAMES: ["a.ddns.net"]})
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "settings"}
+    )
+    assert result["type"] == FlowResultType.FORM
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_HOSTNAMES: "a.ddns.net, bad host!", CONF_MIN_INTERVAL: 7, CONF_MAX_INTERVAL: 90},
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {CONF_HOSTNAMES: "invalid_hostnames"}
+    values = suggested_values(result)
+    assert values[CONF_HOSTNAMES] == "a.ddns.net, bad host!"
+    assert values[CONF_MIN_INTERVAL] == 7
+    assert values[CONF_MAX_INTERVAL] == 90
+    assert entry.options[CONF_HOSTNAMES] == ["a.ddns.net"]
@@ -0,0 +1,239 @@
+"""Tests for the NoIP Monitor coordinator."""
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, cast
+from unittest.mock import patch
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+import custom_components.noip_monitor as integration
+from custom_components.noip_monitor import NoIPDataUpdateCoordinator
+from custom_components.noip_monitor.const import (
+    CONF_CACHE_TTL,
+    CONF_HOSTNAMES,
+    CONF_MIN_INTERVAL,
+    DOMAIN,
+)
+from custom_components.noip_monitor.models import HostStatus, ResponseCode
+from custom_components.noip_monitor.sensor import NoIPSensor
+
+from .conftest import DEFAULT_IP, FakeNoIP, async_setup, async_wait_background
+
+HOSTNAMES = ["a.ddns.net", "b.ddns.net", "c.ddns.net"]
+
+
+def _coordinator(hass: HomeAssistant, entry_id: str) -> NoIPDataUpdateCoordinator:
+    """Return the coordinator of a config entry."""
+    coordinator: NoIPDataUpdateCoordinator = hass.data[DOMAIN][entry_id]
+    return coordinator
+
+
+async def test_refresh_is_single_flight(hass: HomeAssistant, noip: FakeNoIP) -> None:
+    """Concurrent requests for the same hostname share one lookup."""
+    entry = await async_setup(hass, **{CONF_HOSTNAMES: HOSTNAMES})
+    coordinator = _coordinator(hass, entry.entry_id)
+    noip.requests.clear()
+    noip.gate = asyncio.Event()
+
+    first = hass.async_create_task(
+        coordinator.async_refresh_hosts(["a.ddns.net"], force=True)
+    )
+    await asyncio.sleep(0.01)
+    assert noip.requests == [["a.ddns.net"]]
+    # Joins the lookup in flight instead of starting another one
+    second = hass.async_create_task(
+        coordinator.async_refresh_hosts(["a.ddns.net"], force=True)
+    )
+    await asyncio.sleep(0.01)
+    noip.gate.set()
+
+    assert (await first).keys() == (await second).keys() == {"a.ddns.net"}
+    assert noip.requests == [["a.ddns.net"]]
+
+
+async def test_refresh_skips_shared_results(hass: HomeAssistant, noip: FakeNoIP) -> None:
+    """An on-demand refresh looks up again right after the scheduled one, even unforced."""
+    entry = await async_setup(hass, **{CONF_HOSTNAMES: HOSTNAMES, CONF_CACHE_TTL: 0})
+    coordinator = _coordinator(hass, entry.entry_id)
+    noip.requests.clear()
+    noip.forced.clear()
+    noip.ips["a.ddns.net"] = "2.2.2.2"
+
+    results = await coordinator.async_refresh_hosts(["a.ddns.net"])
+
+    assert noip.requests == [["a.ddns.net"]]
+    assert noip.forced == [False]
+    assert results["a.ddns.net"].ip == "2.2.2.2"
+
+
+async def test_refresh_debounces_requests(hass: HomeAssistant, noip: FakeNoIP) -> None:
+    """Requests within the debounce delay are sent together; unknown hostnames are ignored."""
+    entry = await async_setup(hass, **{CONF_HOSTNAMES: HOSTNAMES})
+    coordinator = _coordinator(hass, entry.entry_id)
+    noip.requests.clear()
+
+    with patch.object(integration, "REFRESH_DEBOUNCE", 0.05):
+        results = await asyncio.gather(
+            coordinator.async_refresh_hosts(["a.ddns.net"]),
+            coordinator.async_refresh_hosts(["b.ddns.net", "unknown.ddns.net"], force=True),
+        )
+
+    assert [set(result) for result in results] == [{"a.ddns.net"}, {"b.ddns.net"}]
+    assert noip.requests == [["a.ddns.net", "b.ddns.net"]]
+    # A forced request forces the whole batch it is sent with
+    assert noip.forced[-1] is True
+
+
+async def test_refresh_waiters_are_released_on_unload(
+    hass: HomeAssistant, noip: FakeNoIP
+) -> None:
+    """Unloading while a lookup is in flight resolves the waiting callers."""
+    entry = await async_setup(hass, **{CONF_HOSTNAMES: HOSTNAMES})
+    coordinator = _coordinator(hass, entry.entry_id)
+    noip.gate = asyncio.Event()
+
+    waiter = hass.async_create_task(
+        coordinator.async_refresh_hosts(["a.ddns.net"], force=True)
+    )
+    await asyncio.sleep(0.01)
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+    assert await asyncio.wait_for(waiter, 1) == {}
+    assert not coordinator._refreshing
+
+
+async def test_refresh_merges_without_rescheduling(
+    hass: HomeAssistant, noip: FakeNoIP
+) -> None:
+    """On-demand results are merged without moving the regular refresh."""
+    entry = await async_setup(hass, **{CONF_HOSTNAMES: HOSTNAMES})
+    coordinator = _coordinator(hass, entry.entry_id)
+    now = time.monotonic()
+    for hostname in HOSTNAMES:
+        coordinator.scheduler.record(hostname, now, changed=False, failed=False)
+    backed_off = coordinator.scheduler.interval("b.ddns.net")
+    assert backed_off is not None
+    assert backed_off > coordinator.scheduler.min_interval
+    unsub_refresh = coordinator._unsub_refresh
+
+    noip.ips["a.ddns.net"] = "2.2.2.2"
+    results = await coordinator.async_refresh_hosts(["a.ddns.net", "b.ddns.net"], force=True)
+
+    assert results["a.ddns.net"].ip == "2.2.2.2"
+    assert coordinator.data["a.ddns.net"].ip == "2.2.2.2"
+    assert coordinator.data["b.ddns.net"].ip == DEFAULT_IP
+    assert coordinator.changed_hosts == {"a.ddns.net"}
+    assert hass.states.get("sensor.noip_monitor_user_a_ddns_net").state == "2.2.2.2"
+    # The changed hostname is back at the minimum interval, the unchanged one keeps its own
+    assert coordinator.scheduler.interval("a.ddns.net") == coordinator.scheduler.min_interval
+    assert coordinator.scheduler.interval("b.ddns.net") == backed_off
+    assert coordinator._unsub_refresh is unsub_refresh
+
+
+async def test_merge_detects_changed_hostnames(hass: HomeAssistant, noip: FakeNoIP) -> None:
+    """Only hostnames whose result differs, or that were removed, count as changed."""
+    entry = await async_setup(hass, **{CONF_HOSTNAMES: HOSTNAMES})
+    coordinator = _coordinator(hass, entry.entry_id)
+    assert coordinator.changed_hosts == set(HOSTNAMES)
+    version = coordinator.hostnames_version
+    data = coordinator.data
+
+    # Same results again: nothing changed
+    coordinator.data = coordinator._merge_results(HOSTNAMES, dict(data))
+    assert coordinator.changed_hosts == set()
+
+    # A new address, a failed lookup and a hostname left out of the results
+    changed = {
+        "a.ddns.net": HostStatus("a.ddns.net", ResponseCode.GOOD, ip="2.2.2.2"),
+        "b.ddns.net": HostStatus("b.ddns.net", ResponseCode.TIMEOUT, error="Timeout"),
+    }
+    coordinator.data = coordinator._merge_results(HOSTNAMES, changed)
+    assert coordinator.changed_hosts == {"a.ddns.net", "b.ddns.net"}
+    assert coordinator.data["c.ddns.net"] is data["c.ddns.net"]
+    assert coordinator.hostnames_version == version
+
+    # A hostname no longer monitored is dropped and counts as changed
+    coordinator.data = coordinator._merge_results(HOSTNAMES[:2], {})
+    assert coordinator.changed_hosts == {"c.ddns.net"}
+    assert "c.ddns.net" not in coordinator.data
+    assert coordinator.hostnames_version == version + 1
+
+
+async def test_only_changed_sensors_write_state(hass: HomeAssistant, noip: FakeNoIP) -> None:
+    """A refresh writes the state of the hostnames that changed, not of every sensor."""
+    entry = await async_setup(hass, **{CONF_HOSTNAMES: HOSTNAMES})
+    coordinator = _coordinator(hass, entry.entry_id)
+    noip.ips["a.ddns.net"] = "2.2.2.2"
+
+    with patch.object(NoIPSensor, "async_write_ha_state", autospec=True) as write:
+        await coordinator.async_refresh_hosts(HOSTNAMES, force=True)
+
+    assert [call.args[0].hostname for call in write.call_args_list] == ["a.ddns.net"]
+
+
+async def test_can_apply_in_place(hass: HomeAssistant, noip: FakeNoIP) -> None:
+    """Only a change limited to the hostname list can be applied in place."""
+    entry = await async_setup(hass, **{CONF_HOSTNAMES: HOSTNAMES, CONF_MIN_INTERVAL: 5})
+    coordinator = _coordinator(hass, entry.entry_id)
+
+    def edited(data: dict[str, Any] | None = None, **options: Any) -> ConfigEntry:
+        return cast(
+            ConfigEntry,
+            SimpleNamespace(data=data or entry.data, options={**entry.options, **options}),
+        )
+
+    assert coordinator.can_apply_in_place(edited(**{CONF_HOSTNAMES: ["d.ddns.net"]}))
+    assert not coordinator.can_apply_in_place(edited(**{CONF_MIN_INTERVAL: 10}))
+    assert not coordinator.can_apply_in_place(edited({**entry.data, "password": "changed"}))
+
+
+async def test_hostname_edit_is_applied_in_place(hass: HomeAssistant, noip: FakeNoIP) -> None:
+    """Editing the hostnames looks up the added ones only and keeps the coordinator."""
+    entry = await async_setup(hass, **{CONF_HOSTNAMES: HOSTNAMES})
+    coordinator = _coordinator(hass, entry.entry_id)
+    kept = coordinator.data["b.ddns.net"]
+    noip.requests.clear()
+
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, CONF_HOSTNAMES: ["b.ddns.net", "c.ddns.net", "d.ddns.net"]}
+    )
+    await async_wait_background(hass)
+
+    assert _coordinator(hass, entry.entry_id) is coordinator
+    assert noip.requests == [["d.ddns.net"]]
+    assert set(coordinator.data) == {"b.ddns.net", "c.ddns.net", "d.ddns.net"}
+    assert coordinator.data["b.ddns.net"] is kept
+    assert "a.ddns.net" not in coordinator.scheduler
+    assert hass.states.get("sensor.noip_monitor_user_d_ddns_net").state == DEFAULT_IP
+    assert hass.states.get("sensor.noip_monitor_user_a_ddns_net") is None
+
+
+async def test_other_option_changes_reload(hass: HomeAssistant, noip: FakeNoIP) -> None:
+    """Any other option change rebuilds the coordinator."""
+    entry = await async_setup(hass, **{CONF_HOSTNAMES: HOSTNAMES, CONF_MIN_INTERVAL: 5})
+    coordinator = _coordinator(hass, entry.entry_id)
+
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, CONF_MIN_INTERVAL: 10}
+    )
+    await async_wait_background(hass)
+
+    assert _coordinator(hass, entry.entry_id) is not coordinator
+    assert _coordinator(hass, entry.entry_id).update_interval is not None
+
+
+async def test_unload_saves_the_snapshot(
+    hass: HomeAssistant, noip: FakeNoIP, hass_storage: dict[str, Any]
+) -> None:
+    """The coordinator belongs to its entry, which saves the snapshot on unload."""
+    entry = await async_setup(hass, **{CONF_HOSTNAMES: HOSTNAMES})
+    coordinator = _coordinator(hass, entry.entry_id)
+    assert coordinator.config_entry is entry
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    stored = hass_storage[f"{DOMAIN}.{entry.entry_id}"]["data"]
+    assert set(stored["hosts"]) == set(HOSTNAMES)
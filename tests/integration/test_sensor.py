@@ -0,0 +1,69 @@
+"""Tests for the sensor platform."""
+from __future__ import annotations
+
+from homeassistant.const import STATE_UNKNOWN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.noip_monitor.const import CONF_BATCH_SIZE, CONF_HOSTNAMES, DOMAIN
+from custom_components.noip_monitor.resilience import CircuitOpenError
+
+from .conftest import DEFAULT_IP, FakeNoIP, async_wait_background, make_entry
+
+HOSTNAMES = ["a.ddns.net", "b.ddns.net", "c.ddns.net"]
+
+
+async def test_sensors_follow_the_configured_hostnames(
+    hass: HomeAssistant, noip: FakeNoIP
+) -> None:
+    """Hostnames skipped by an open circuit keep their sensors and registry entries."""
+    entry = make_entry(hass, **{CONF_HOSTNAMES: HOSTNAMES, CONF_BATCH_SIZE: 1})
+    registry = er.async_get(hass)
+    renamed = registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        f"{entry.entry_id}_b.ddns.net",
+        suggested_object_id="office_router",
+        config_entry=entry,
+    )
+    noip.errors = {
+        "b.ddns.net": CircuitOpenError("open"),
+        "c.ddns.net": CircuitOpenError("open"),
+    }
+
+    # No snapshot: the first refresh is the only source of data
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_background(hass)
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert set(coordinator.data) == {"a.ddns.net"}
+    assert registry.async_get(renamed.entity_id) is not None
+    assert hass.states.get(renamed.entity_id).state == STATE_UNKNOWN
+    assert hass.states.get("sensor.noip_monitor_user_a_ddns_net").state == DEFAULT_IP
+    assert hass.states.get("sensor.noip_monitor_user_c_ddns_net").state == STATE_UNKNOWN
+
+    # The circuit closes again: the skipped hostnames get their results
+    noip.errors.clear()
+    await coordinator.async_refresh_hosts(HOSTNAMES, force=True)
+    await async_wait_background(hass)
+    assert hass.states.get(renamed.entity_id).state == DEFAULT_IP
+
+
+async def test_removed_hostnames_lose_their_sensors(
+    hass: HomeAssistant, noip: FakeNoIP
+) -> None:
+    """Hostnames no longer configured are removed from the registry."""
+    entry = make_entry(hass, **{CONF_HOSTNAMES: HOSTNAMES})
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_wait_background(hass)
+
+    hass.config_entries.async_update_entry(
+        entry, options={**entry.options, CONF_HOSTNAMES: ["a.ddns.net"]}
+    )
+    await async_wait_background(hass)
+    await hass.data[DOMAIN][entry.entry_id].async_refresh()
+    await async_wait_background(hass)
+
+    registry = er.async_get(hass)
+    assert registry.async_get("sensor.noip_monitor_user_a_ddns_net") is not None
+    assert registry.async_get("sensor.noip_monitor_user_b_ddns_net") is None
@@ -0,0 +1,118 @@
+"""Tests for the refresh trigger."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+import pytest
+from homeassistant.core import HomeAssistant
+
+from custom_components.noip_monitor.const import (
+    CONF_HOSTNAMES,
+    CONF_TRIGGER_ENTITY,
+    CONF_TRIGGER_EVENT,
+    DOMAIN,
+)
+from custom_components.noip_monitor.trigger import RefreshTrigger
+
+from .conftest import FakeNoIP, async_setup, async_wait_background
+
+Signal = tuple[str | None, list[str] | None]
+
+
+@pytest.fixture
+def signals(hass: HomeAssistant) -> Iterator[list[Signal]]:
+    """Run a trigger on sensor.wan and return the signals it reports."""
+    reported: list[Signal] = []
+    trigger = RefreshTrigger(
+        hass, "sensor.wan", "wan_changed", lambda old_ip, hostnames: reported.append((old_ip, hostnames))
+    )
+    stop = trigger.async_start()
+    yield reported
+    stop()
+
+
+async def test_first_address_is_only_recorded(
+    hass: HomeAssistant, signals: list[Signal]
+) -> None:
+    """The first address seen does not trigger; a later change reports the previous one."""
+    hass.states.async_set("sensor.wan", "1.1.1.1")
+    await hass.async_block_till_done()
+    assert signals == []
+
+    hass.states.async_set("sensor.wan", "2.2.2.2")
+    await hass.async_block_till_done()
+    assert signals == [("1.1.1.1", None)]
+
+
+@pytest.mark.parametrize("outage", ["unavailable", "unknown"])
+async def test_outages(hass: HomeAssistant, signals: list[Signal], outage: str) -> None:
+    """An outage only triggers when the entity comes back with another address."""
+    hass.states.async_set("sensor.wan", "1.1.1.1")
+    hass.states.async_set("sensor.wan", outage)
+    hass.states.async_set("sensor.wan", "1.1.1.1")
+    await hass.async_block_till_done()
+    assert signals == []
+
+    hass.states.async_set("sensor.wan", outage)
+    hass.states.async_set("sensor.wan", "2.2.2.2")
+    await hass.async_block_till_done()
+    assert signals == [("1.1.1.1", None)]
+
+
+@pytest.mark.parametrize("outage", ["unavailable", "unknown"])
+async def test_other_entities(hass: HomeAssistant, signals: list[Signal], outage: str) -> None:
+    """A non-IP entity triggers on a change, but not when it appears or recovers."""
+    hass.states.async_set("sensor.wan", "connected")
+    hass.states.async_set("sensor.wan", outage)
+    hass.states.async_set("sensor.wan", "connected")
+    await hass.async_block_till_done()
+    assert signals == []
+
+    hass.states.async_set("sensor.wan", "reconnecting")
+    await hass.async_block_till_done()
+    assert signals == [(None, None)]
+
+
+async def test_event(hass: HomeAssistant, signals: list[Signal]) -> None:
+    """The event triggers every time, narrowed to the hostnames in its data."""
+    hass.bus.async_fire("wan_changed", {})
+    hass.bus.async_fire("wan_changed", {"hostnames": "a.ddns.net"})
+    await hass.async_block_till_done()
+    assert signals == [(None, None), (None, ["a.ddns.net"])]
+
+
+async def test_trigger_refreshes_hostnames_at_the_old_address(
+    hass: HomeAssistant, noip: FakeNoIP
+) -> None:
+    """Only hostnames pointing at the previous address are refreshed; lagging ones are rechecked soon."""
+    hass.states.async_set("sensor.wan", "1.1.1.1")
+    noip.ips["c.ddns.net"] = "9.9.9.9"
+    entry = await async_setup(
+        hass,
+        **{
+            CONF_HOSTNAMES: ["a.ddns.net", "b.ddns.net", "c.ddns.net"],
+            CONF_TRIGGER_ENTITY: "sensor.wan",
+            CONF_TRIGGER_EVENT: "wan_changed",
+        },
+    )
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    noip.requests.clear()
+    noip.forced.clear()
+
+    # a.ddns.net is updated already, b.ddns.net still points at the old address
+    noip.ips["a.ddns.net"] = "2.2.2.2"
+    hass.states.async_set("sensor.wan", "2.2.2.2")
+    await async_wait_background(hass)
+
+    assert sorted(noip.looked_up) == ["a.ddns.net", "b.ddns.net"]
+    assert noip.forced == [True] * len(noip.requests)
+    assert coordinator.data["a.ddns.net"].ip == "2.2.2.2"
+    assert coordinator.scheduler.interval("b.ddns.net") == coordinator.scheduler.min_interval
+    assert coordinator.trigger.fired == 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    noip.requests.clear()
+    hass.bus.async_fire("wan_changed", {})
+    await async_wait_background(hass)
+    assert noip.requests == []
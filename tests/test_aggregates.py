@@ -0,0 +1,30 @@
+"""Tests for the account-wide hostname totals."""
+from __future__ import annotations
+
+from custom_components.noip_monitor.aggregates import HostAggregates
+from custom_components.noip_monitor.models import HostStatus, ResponseCode
+
+CONNECTED = HostStatus("a", ResponseCode.NOCHG, ip="1.1.1.1")
+NOHOST = HostStatus("a", ResponseCode.NOHOST, error="Host not found")
+TIMEOUT = HostStatus("a", ResponseCode.TIMEOUT, error="Timeout")
+
+
+def test_updates_move_hostnames_between_totals() -> None:
+    """Each update replaces the old contribution of a hostname with its new one."""
+    totals = HostAggregates()
+    totals.update(None, CONNECTED)
+    totals.update(None, NOHOST)
+    assert (totals.connected, totals.disconnected) == (1, 1)
+
+    totals.update(CONNECTED, TIMEOUT)
+    assert (totals.connected, totals.disconnected) == (0, 2)
+    assert totals.as_dict()["disconnected_by_code"] == {"nohost": 1, "timeout": 1}
+
+
+def test_removed_hostnames_leave_no_empty_codes() -> None:
+    """Codes drop out of the breakdown once no hostname has them."""
+    totals = HostAggregates()
+    totals.update(None, NOHOST)
+    totals.update(NOHOST, None)
+    assert totals.disconnected == 0
+    assert totals.as_dict()["disconnected_by_code"] == {}
@@ -0,0 +1,84 @@
+"""Tests for the NoIP client's result cache."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.noip_monitor import cache
+from custom_components.noip_monitor.cache import ResultCache
+from custom_components.noip_monitor.models import HostStatus, ResponseCode
+
+from .conftest import FakeClock
+
+
+@pytest.fixture(autouse=True)
+def _fake_time(monkeypatch: pytest.MonkeyPatch, clock: FakeClock) -> None:
+    """Run the cache on the fake clock."""
+    monkeypatch.setattr(cache, "time", clock)
+
+
+def _ok(hostname: str, ip: str = "1.2.3.4") -> HostStatus:
+    return HostStatus(hostname, ResponseCode.NOCHG, ip=ip)
+
+
+def test_entries_expire_after_the_ttl(clock: FakeClock) -> None:
+    """A result is served until its TTL has passed, then dropped."""
+    results = ResultCache(ttl=60)
+    results.put(_ok("a"))
+    clock.advance(59)
+    assert results.get("a") == _ok("a")
+    clock.advance(1)
+    assert results.get("a") is None
+    assert len(results) == 0
+    assert (results.hits, results.misses) == (1, 1)
+
+
+def test_nohost_is_cached_but_failures_are_not() -> None:
+    """Answers about the hostname are cached; failed requests are not."""
+    results = ResultCache(ttl=60)
+    nohost = HostStatus("a", ResponseCode.NOHOST, error="Host not found")
+    results.put(nohost)
+    assert results.get("a") == nohost
+
+    for code in (ResponseCode.TIMEOUT, ResponseCode.ERROR, ResponseCode.SERVER_ERROR):
+        results.put(HostStatus("b", code, error="failed"))
+        assert results.get("b") is None
+
+
+def test_failure_replaces_a_cached_result() -> None:
+    """A failed lookup drops the result it would otherwise have replaced."""
+    results = ResultCache(ttl=60)
+    results.put(_ok("a"))
+    results.put(HostStatus("a", ResponseCode.TIMEOUT, error="Timeout"))
+    assert results.get("a") is None
+
+
+def test_least_recently_used_is_evicted() -> None:
+    """Beyond the size bound, the entry used longest ago goes first."""
+    results = ResultCache(ttl=60, size=2)
+    results.put(_ok("a"))
+    results.put(_ok("b"))
+    assert results.get("a") is not None
+    results.put(_ok("c"))
+    assert results.get("b") is None
+    assert results.get("a") is not None
+    assert results.get("c") is not None
+
+
+def test_zero_ttl_disables_the_cache() -> None:
+    """With a TTL of 0 nothing is stored."""
+    results = ResultCache(ttl=0)
+    results.put(_ok("a"))
+    assert len(results) == 0
+
+
+def test_has_fresh_and_clear(clock: FakeClock) -> None:
+    """has_fresh ignores expired entries, and clear drops everything."""
+    results = ResultCache(ttl=60)
+    assert not results.has_fresh()
+    results.put(_ok("a"))
+    assert results.has_fresh()
+    clock.advance(60)
+    assert not results.has_fresh()
+    results.put(_ok("b"))
+    results.clear()
+    assert not results.has_fresh()
@@ -0,0 +1,107 @@
+"""Tests for the DNS backend, against the stand-in resolver."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from benchmarks.stub_server import StubDNSServer
+from custom_components.noip_monitor.dns_backend import (
+    DNSResolverClient,
+    build_query,
+    parse_resolver,
+)
+from custom_components.noip_monitor.models import HostStatus, ResponseCode
+
+# The Home Assistant test harness blocks sockets unless asked
+pytestmark = pytest.mark.usefixtures("socket_enabled")
+
+
+def _resolve(
+    server: StubDNSServer, hostnames: list[str], timeout: float = 2.0
+) -> dict[str, HostStatus]:
+    """Resolve hostnames through a fresh client against the running stub."""
+
+    async def run() -> dict[str, HostStatus]:
+        address = await server.start()
+        client = DNSResolverClient(address, timeout=timeout)
+        try:
+            return await client.async_get_hosts_ip(hostnames)
+        finally:
+            await client.close()
+            await server.stop()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    ("resolver", "expected"),
+    [
+        ("1.1.1.1", ("1.1.1.1", 53)),
+        ("1.1.1.1:5353", ("1.1.1.1", 5353)),
+        ("[2606:4700::1111]:53", ("2606:4700::1111", 53)),
+        ("2606:4700::1111", ("2606:4700::1111", 53)),
+    ],
+)
+def test_parse_resolver(resolver: str, expected: tuple[str, int]) -> None:
+    """Resolver settings are split into host and port."""
+    assert parse_resolver(resolver) == expected
+
+
+def test_query_round_trips_through_the_stub() -> None:
+    """The stub decodes the name build_query encoded."""
+    server = StubDNSServer(records={"host.ddns.net": "10.0.0.1"})
+    response = server.answer(build_query(0x1234, "host.ddns.net"))
+    assert response is not None
+    assert response[:2] == b"\x12\x34"
+
+
+def test_resolves_every_outcome() -> None:
+    """Addresses, NXDOMAIN and empty answers map to their statuses."""
+    server = StubDNSServer(
+        records={"a.ddns.net": "10.0.0.1", "b.ddns.net": "10.0.0.2"},
+        cnames={"b.ddns.net": "target.example.net"},
+        empty={"empty.ddns.net"},
+    )
+    results = _resolve(server, ["a.ddns.net", "b.ddns.net", "gone.ddns.net", "empty.ddns.net"])
+
+    assert results["a.ddns.net"] == HostStatus("a.ddns.net", ResponseCode.DNS, ip="10.0.0.1")
+    # The A record follows a CNAME whose owner name is compressed
+    assert results["b.ddns.net"].ip == "10.0.0.2"
+    assert results["gone.ddns.net"].code is ResponseCode.NOHOST
+    assert results["empty.ddns.net"].code is ResponseCode.NOHOST
+    assert results["empty.ddns.net"].error == "No address record"
+    assert server.queries == 4
+
+
+def test_dropped_and_misdirected_queries_time_out() -> None:
+    """Unanswered queries, and answers with another ID, time out alone."""
+    server = StubDNSServer(
+        records={"a.ddns.net": "10.0.0.1", "wrong.ddns.net": "10.0.0.3"},
+        drop={"lost.ddns.net"},
+        misdirected={"wrong.ddns.net"},
+    )
+    results = _resolve(server, ["a.ddns.net", "lost.ddns.net", "wrong.ddns.net"], timeout=0.2)
+
+    assert results["a.ddns.net"].ip == "10.0.0.1"
+    assert results["lost.ddns.net"].code is ResponseCode.TIMEOUT
+    assert results["wrong.ddns.net"].code is ResponseCode.TIMEOUT
+
+
+def test_metrics_and_pending_cleanup() -> None:
+    """A batch is one request in the metrics, and timed-out IDs are released."""
+    server = StubDNSServer(records={"a.ddns.net": "10.0.0.1"}, drop={"lost.ddns.net"})
+
+    async def run() -> None:
+        client = DNSResolverClient(await server.start(), timeout=0.2)
+        try:
+            await client.async_get_hosts_ip(["a.ddns.net", "lost.ddns.net"])
+            assert client.metrics.requests == 1
+            assert client.metrics.in_flight == 0
+            assert client._protocol is not None
+            assert client._protocol.pending == {}
+        finally:
+            await client.close()
+            await server.stop()
+
+    asyncio.run(run())
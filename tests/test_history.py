@@ -0,0 +1,47 @@
+"""Tests for the per-hostname IP change history."""
+from __future__ import annotations
+
+from custom_components.noip_monitor.history import HistoryTracker, IPHistory, IPTransition
+
+
+def test_ring_buffer_keeps_the_latest_transitions() -> None:
+    """Once full, the oldest transition is overwritten."""
+    history = IPHistory(2)
+    for index in range(3):
+        history.append(IPTransition(float(index), f"10.0.0.{index}", f"10.0.0.{index + 1}"))
+    assert [transition.timestamp for transition in history] == [1.0, 2.0]
+    assert len(history) == 2
+
+
+def test_first_address_is_not_a_transition() -> None:
+    """Only a different address after the first one is recorded."""
+    tracker = HistoryTracker(5)
+    assert tracker.record("a", "1.1.1.1", 1.0) is None
+    assert tracker.record("a", "1.1.1.1", 2.0) is None
+    transition = tracker.record("a", "2.2.2.2", 3.0)
+    assert transition == IPTransition(3.0, "1.1.1.1", "2.2.2.2")
+    assert tracker.get("a") == [transition]
+    assert tracker.get("b") == []
+
+
+def test_round_trip_keeps_the_latest_depth() -> None:
+    """load restores as_dict, trimmed to the tracker's depth."""
+    tracker = HistoryTracker(3)
+    for index, ip in enumerate(["1.1.1.1", "2.2.2.2", "3.3.3.3", "4.4.4.4"]):
+        tracker.record("a", ip, float(index))
+
+    restored = HistoryTracker(2)
+    restored.load(tracker.as_dict())
+    assert [t.new_ip for t in restored.get("a")] == ["3.3.3.3", "4.4.4.4"]
+    # The last address survives, so the next change is still a transition
+    assert restored.record("a", "5.5.5.5", 9.0) == IPTransition(9.0, "4.4.4.4", "5.5.5.5")
+
+
+def test_remove_forgets_hostnames() -> None:
+    """Removed hostnames lose both their history and their last address."""
+    tracker = HistoryTracker(3)
+    tracker.record("a", "1.1.1.1", 1.0)
+    tracker.record("a", "2.2.2.2", 2.0)
+    tracker.remove(["a"])
+    assert tracker.get("a") == []
+    assert tracker.record("a", "3.3.3.3", 3.0) is None
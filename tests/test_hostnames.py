@@ -0,0 +1,39 @@
+"""Tests for hostname list parsing."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.noip_monitor.hostnames import normalize_hostname, parse_hostnames
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [
+        ("Example.DDNS.net", "example.ddns.net"),
+        (" host.ddns.net. ", "host.ddns.net"),
+        ("bücher.ddns.net", "xn--bcher-kva.ddns.net"),
+        ("localhost", None),
+        ("-bad.ddns.net", None),
+        ("bad_.ddns.net", None),
+        ("a" * 64 + ".ddns.net", None),
+    ],
+)
+def test_normalize_hostname(raw: str, expected: str | None) -> None:
+    """Hostnames are lowercased, IDNA-encoded and validated label by label."""
+    assert normalize_hostname(raw) == expected
+
+
+def test_parse_hostnames() -> None:
+    """Separators, comments, duplicates and invalid entries are all handled."""
+    parsed = parse_hostnames(
+        [
+            "a.ddns.net, B.ddns.net;c.ddns.net  # trailing comment",
+            "# whole line comment",
+            "a.ddns.net not_valid not_valid",
+            "known.ddns.net",
+        ],
+        known=["known.ddns.net"],
+    )
+    assert parsed.valid == ["a.ddns.net", "b.ddns.net", "c.ddns.net"]
+    assert parsed.invalid == ["not_valid"]
+    assert parsed.duplicates == 2
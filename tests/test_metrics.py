@@ -0,0 +1,112 @@
+"""Tests for the runtime metrics."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.noip_monitor.metrics import (
+    LATENCY_BUCKETS,
+    LatencyHistogram,
+    Metrics,
+    request_outcome,
+)
+from custom_components.noip_monitor.models import ResponseCode
+
+
+def _histogram(*samples: float) -> LatencyHistogram:
+    """Return a histogram holding the given samples."""
+    histogram = LatencyHistogram()
+    for seconds in samples:
+        histogram.observe(seconds)
+    return histogram
+
+
+def test_empty_histogram_has_no_percentile() -> None:
+    """Without samples there is no percentile."""
+    assert LatencyHistogram().percentile(0.95) is None
+    assert LatencyHistogram().as_dict()["mean"] is None
+
+
+@pytest.mark.parametrize(
+    ("fraction", "bound"),
+    [(0.5, 0.025), (0.9, 0.025), (0.95, 0.5), (1.0, 0.5)],
+)
+def test_percentile_is_the_bucket_upper_bound(fraction: float, bound: float) -> None:
+    """The percentile is the upper bound of the bucket holding that rank."""
+    histogram = _histogram(*[0.01] * 9, 0.3)
+    assert histogram.percentile(fraction) == bound
+
+
+def test_samples_on_a_bound_fall_in_that_bucket() -> None:
+    """A sample equal to a bucket bound is counted in that bucket."""
+    histogram = _histogram(0.05)
+    assert histogram.counts[LATENCY_BUCKETS.index(0.05)] == 1
+    assert histogram.percentile(0.5) == 0.05
+
+
+def test_slow_samples_land_in_the_infinite_bucket() -> None:
+    """Samples beyond the last finite bound report an infinite percentile."""
+    histogram = _histogram(0.01, 45.0, 60.0)
+    assert histogram.percentile(0.5) == float("inf")
+    assert histogram.percentile(0.3) == 0.025
+    assert histogram.as_dict()["buckets"]["+Inf"] == 2
+
+
+def test_merge() -> None:
+    """Merging adds the counts, the sample count and the total."""
+    histogram = _histogram(0.01, 0.2)
+    histogram.merge(_histogram(0.2, 3.0))
+    assert histogram.count == 4
+    assert histogram.total == pytest.approx(3.41)
+    assert histogram.counts[LATENCY_BUCKETS.index(0.25)] == 2
+
+
+@pytest.mark.parametrize(
+    ("codes", "outcome"),
+    [
+        ([ResponseCode.NOCHG, ResponseCode.GOOD], ResponseCode.GOOD),
+        ([ResponseCode.NOCHG, ResponseCode.NOHOST], ResponseCode.NOHOST),
+        ([ResponseCode.NOHOST, ResponseCode.TIMEOUT], ResponseCode.TIMEOUT),
+        ([ResponseCode.SERVER_ERROR, ResponseCode.BADAUTH], ResponseCode.BADAUTH),
+        ([], ResponseCode.UNKNOWN),
+    ],
+)
+def test_request_outcome(codes: list[ResponseCode], outcome: ResponseCode) -> None:
+    """A request is filed under its most significant outcome."""
+    assert request_outcome(codes) is outcome
+
+
+def test_in_flight_accounting() -> None:
+    """Finished and abandoned requests leave flight; only finished ones are counted."""
+    metrics = Metrics()
+    metrics.request_started()
+    metrics.request_started()
+    assert (metrics.in_flight, metrics.in_flight_peak) == (2, 2)
+
+    metrics.request_finished(
+        ResponseCode.NOCHG,
+        0.04,
+        [ResponseCode.NOCHG, ResponseCode.NOHOST],
+        bytes_sent=100,
+        bytes_received=30,
+    )
+    metrics.request_abandoned()
+    metrics.request_started()
+    metrics.request_finished(ResponseCode.TIMEOUT, 12.0)
+
+    assert (metrics.in_flight, metrics.in_flight_peak) == (0, 2)
+    assert metrics.requests == 2
+    assert metrics.host_outcomes == {ResponseCode.NOCHG: 1, ResponseCode.NOHOST: 1}
+    assert (metrics.bytes_sent, metrics.bytes_received) == (100, 30)
+    assert set(metrics.latency) == {ResponseCode.NOCHG, ResponseCode.TIMEOUT}
+    assert metrics.overall_latency().count == 2
+    assert metrics.overall_latency().percentile(1.0) == 30.0
+
+
+def test_cycles() -> None:
+    """Finished cycles are counted and their duration kept."""
+    metrics = Metrics()
+    metrics.cycle_finished(1.5)
+    metrics.cycle_finished(0.5)
+    assert metrics.cycles == 2
+    assert metrics.last_cycle_duration == 0.5
+    assert metrics.as_dict()["cycle_duration"]["count"] == 2
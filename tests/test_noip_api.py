@@ -0,0 +1,122 @@
+"""Tests for the NoIP response parser."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.noip_monitor.metrics import LatencyHistogram
+from custom_components.noip_monitor.models import HostStatus, ResponseCode
+from custom_components.noip_monitor.noip_api import (
+    HEDGE_MIN_SAMPLES,
+    NoIPClient,
+    _Attempt,
+    _parse_batch_response,
+    parse_response_line,
+)
+
+
+@pytest.mark.parametrize(
+    ("line", "code", "ip"),
+    [
+        ("good 1.2.3.4", ResponseCode.GOOD, "1.2.3.4"),
+        ("nochg 1.2.3.4\n", ResponseCode.NOCHG, "1.2.3.4"),
+        ("  nochg   1.2.3.4  ", ResponseCode.NOCHG, "1.2.3.4"),
+        ("good 1.2.3.4 extra", ResponseCode.GOOD, "1.2.3.4"),
+        ("nohost", ResponseCode.NOHOST, None),
+        ("badauth", ResponseCode.BADAUTH, None),
+        ("abuse", ResponseCode.ABUSE, None),
+        ("badagent", ResponseCode.BADAGENT, None),
+        ("911", ResponseCode.SERVER_ERROR, None),
+    ],
+)
+def test_parse_response_line(line: str, code: ResponseCode, ip: str | None) -> None:
+    """Each keyword maps to its code, and only the first token is the address."""
+    result = parse_response_line("host.ddns.net", line)
+    assert result.code is code
+    assert result.ip == ip
+    assert result.connected is (ip is not None)
+
+
+@pytest.mark.parametrize("line", ["good", "nochg ", "surprise 1.2.3.4", ""])
+def test_parse_response_line_unknown(line: str) -> None:
+    """Unknown keywords and success lines without an address are not trusted."""
+    result = parse_response_line("host.ddns.net", line)
+    assert result.code is ResponseCode.UNKNOWN
+    assert result.ip is None
+
+
+def test_batch_maps_lines_in_order() -> None:
+    """Lines are matched to hostnames by position, skipping blank lines."""
+    results = _parse_batch_response(["a.ddns.net", "b.ddns.net"], "nochg 1.1.1.1\n\nnohost\n")
+    assert results == {
+        "a.ddns.net": HostStatus("a.ddns.net", ResponseCode.NOCHG, ip="1.1.1.1"),
+        "b.ddns.net": HostStatus("b.ddns.net", ResponseCode.NOHOST, error="Host not found"),
+    }
+
+
+def test_batch_missing_line() -> None:
+    """A hostname without a response line gets an unknown result."""
+    hostnames = ["a.ddns.net", "b.ddns.net", "c.ddns.net"]
+    results = _parse_batch_response(hostnames, "good 1.1.1.1\nnohost")
+    assert results["c.ddns.net"].code is ResponseCode.UNKNOWN
+
+
+@pytest.mark.parametrize("line", ["badauth", "abuse", "911"])
+def test_batch_account_error_applies_to_every_hostname(line: str) -> None:
+    """A single account-level or server error line answers the whole request."""
+    hostnames = ["a.ddns.net", "b.ddns.net", "c.ddns.net"]
+    results = _parse_batch_response(hostnames, line)
+    codes = {result.code for result in results.values()}
+    assert list(results) == hostnames
+    assert codes == {parse_response_line("x", line).code}
+
+
+def test_hedge_delay_follows_the_latency_percentile() -> None:
+    """Requests are hedged at the latency percentile, never at the open-ended bucket."""
+    client = NoIPClient("user", "secret", hedge_percentile=95, connect_timeout=5, read_timeout=10)
+    histogram = client.metrics.latency[ResponseCode.NOCHG] = LatencyHistogram()
+    for _ in range(HEDGE_MIN_SAMPLES - 1):
+        histogram.observe(0.01)
+    # Too few samples to tell what is slow
+    assert client._hedge_delay() is None
+
+    histogram.observe(0.3)
+    assert client._hedge_delay() == 0.025
+
+    # Beyond the last finite bucket: the delay would be infinite
+    for _ in range(HEDGE_MIN_SAMPLES):
+        histogram.observe(45.0)
+    assert client.metrics.overall_latency().percentile(0.95) == float("inf")
+    assert client._hedge_delay() is None
+
+    client.hedge_percentile = 0
+    assert client._hedge_delay() is None
+
+
+def test_cancelling_a_hedged_request_cancels_it() -> None:
+    """A caller cancelled before the hedge delay does not orphan the request."""
+    cancelled: list[list[str]] = []
+
+    async def slow_request(hostnames: list[str]) -> _Attempt:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(hostnames)
+            raise
+        return _Attempt({})
+
+    async def run() -> None:
+        client = NoIPClient("user", "secret", hedge_percentile=95)
+        client._hedge_delay = lambda: 1.0  # type: ignore[method-assign]
+        client._async_request = slow_request  # type: ignore[method-assign]
+        task = asyncio.ensure_future(client._async_hedged_request(["a.ddns.net"]))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+        # Checked before asyncio.run cancels whatever is left over
+        assert cancelled == [["a.ddns.net"]]
+
+    asyncio.run(run())
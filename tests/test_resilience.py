@@ -0,0 +1,111 @@
+"""Tests for the rate limiter and circuit breaker."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.noip_monitor import resilience
+from custom_components.noip_monitor.resilience import (
+    ACCOUNT_RESET_TIMEOUT,
+    FAILURE_THRESHOLD,
+    TRANSIENT_RESET_TIMEOUT,
+    CircuitBreaker,
+    CircuitState,
+    TokenBucket,
+)
+
+from .conftest import FakeClock
+
+
+@pytest.fixture(autouse=True)
+def _fake_time(monkeypatch: pytest.MonkeyPatch, clock: FakeClock) -> None:
+    """Run the breaker and limiter on the fake clock."""
+    monkeypatch.setattr(resilience, "time", clock)
+
+
+def test_token_bucket_burst_then_waits(
+    monkeypatch: pytest.MonkeyPatch, clock: FakeClock
+) -> None:
+    """The bucket hands out its capacity at once, then waits for refills."""
+    slept: list[float] = []
+
+    async def fake_sleep(seconds: float) -> None:
+        slept.append(seconds)
+        clock.advance(seconds)
+
+    monkeypatch.setattr(resilience.asyncio, "sleep", fake_sleep)
+    bucket = TokenBucket(rate=2, capacity=3)
+
+    async def take(count: int) -> None:
+        for _ in range(count):
+            await bucket.acquire()
+
+    asyncio.run(take(3))
+    assert slept == []
+    asyncio.run(take(1))
+    assert slept == [pytest.approx(0.5)]
+
+
+def test_transient_failures_open_after_threshold(clock: FakeClock) -> None:
+    """The circuit opens after FAILURE_THRESHOLD transient failures in a row."""
+    breaker = CircuitBreaker()
+    for _ in range(FAILURE_THRESHOLD - 1):
+        breaker.record_failure("Timeout")
+    assert breaker.allow_request()
+    breaker.record_failure("Timeout")
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    clock.advance(TRANSIENT_RESET_TIMEOUT)
+    assert breaker.allow_request()
+    assert breaker.state is CircuitState.HALF_OPEN
+    # Only one trial request at a time
+    assert not breaker.allow_request()
+
+
+def test_success_resets_the_failure_count() -> None:
+    """A success in between keeps transient failures from adding up."""
+    breaker = CircuitBreaker()
+    for _ in range(FAILURE_THRESHOLD - 1):
+        breaker.record_failure("Timeout")
+    breaker.record_success()
+    breaker.record_failure("Timeout")
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_account_error_opens_immediately(clock: FakeClock) -> None:
+    """An account-level error opens the circuit for the longer reset timeout."""
+    breaker = CircuitBreaker()
+    breaker.record_failure("badauth", account_level=True)
+    assert not breaker.allow_request()
+    clock.advance(TRANSIENT_RESET_TIMEOUT)
+    assert not breaker.allow_request()
+    clock.advance(ACCOUNT_RESET_TIMEOUT - TRANSIENT_RESET_TIMEOUT)
+    assert breaker.allow_request()
+
+
+def test_trial_outcome(clock: FakeClock) -> None:
+    """A failed trial reopens the circuit and a successful one closes it."""
+    breaker = CircuitBreaker()
+    breaker.record_failure("badauth", account_level=True)
+    clock.advance(ACCOUNT_RESET_TIMEOUT)
+    assert breaker.allow_request()
+    breaker.record_failure("Timeout")
+    assert breaker.state is CircuitState.OPEN
+
+    clock.advance(TRANSIENT_RESET_TIMEOUT)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.as_dict()["reason"] is None
+
+
+def test_released_trial_allows_another() -> None:
+    """A cancelled trial does not keep the circuit half-open forever."""
+    breaker = CircuitBreaker()
+    breaker.state = CircuitState.HALF_OPEN
+    breaker._trial_in_flight = True
+    assert not breaker.allow_request()
+    breaker.release_trial()
+    assert breaker.allow_request()
@@ -0,0 +1,78 @@
+"""Tests for the adaptive polling scheduler."""
+from __future__ import annotations
+
+from custom_components.noip_monitor.scheduler import COMPACT_SLACK, HostScheduler
+
+
+def test_new_hostnames_are_due_immediately() -> None:
+    """Synced hostnames are due right away, in due order."""
+    scheduler = HostScheduler(60, 600)
+    scheduler.sync(["a", "b"], 0)
+    assert sorted(scheduler.pop_due(0)) == ["a", "b"]
+    assert scheduler.pop_due(1000) == []
+
+
+def test_stable_hostnames_back_off_to_the_maximum() -> None:
+    """Each unchanged lookup doubles the interval, up to the maximum."""
+    scheduler = HostScheduler(60, 300)
+    scheduler.sync(["a"], 0)
+    now = 0.0
+    intervals = []
+    for _ in range(5):
+        assert scheduler.pop_due(now) == ["a"]
+        scheduler.record("a", now, changed=False, failed=False)
+        intervals.append(scheduler.interval("a"))
+        now = scheduler.next_due() or 0.0
+    assert intervals == [120, 240, 300, 300, 300]
+
+
+def test_change_or_failure_resets_to_the_minimum() -> None:
+    """A changed or failed lookup brings the hostname back to the minimum interval."""
+    scheduler = HostScheduler(60, 600)
+    scheduler.sync(["a", "b"], 0)
+    scheduler.pop_due(0)
+    for hostname in ("a", "b"):
+        scheduler.record(hostname, 0, changed=False, failed=False)
+    scheduler.record("a", 200, changed=True, failed=False)
+    scheduler.record("b", 200, changed=False, failed=True)
+    assert scheduler.interval("a") == scheduler.interval("b") == 60
+    assert scheduler.next_due() == 260
+
+
+def test_sync_drops_removed_hostnames() -> None:
+    """Hostnames no longer synced are never returned as due."""
+    scheduler = HostScheduler(60, 600)
+    scheduler.sync(["a", "b"], 0)
+    scheduler.sync(["b"], 0)
+    assert "a" not in scheduler
+    assert scheduler.pop_due(0) == ["b"]
+
+
+def test_popped_but_unrecorded_hostnames_are_rescheduled() -> None:
+    """A hostname popped as due but never recorded is due again on the next sync."""
+    scheduler = HostScheduler(60, 600)
+    scheduler.sync(["a"], 0)
+    assert scheduler.pop_due(0) == ["a"]
+    scheduler.sync(["a"], 10)
+    assert scheduler.pop_due(10) == ["a"]
+
+
+def test_mark_due() -> None:
+    """mark_due makes a backed-off hostname due now."""
+    scheduler = HostScheduler(60, 600)
+    scheduler.sync(["a"], 0)
+    scheduler.pop_due(0)
+    scheduler.record("a", 0, changed=False, failed=False)
+    scheduler.mark_due("a", 5)
+    assert scheduler.pop_due(5) == ["a"]
+    assert scheduler.interval("a") == 60
+
+
+def test_heap_stays_bounded_under_rescheduling() -> None:
+    """Rescheduling before hostnames come due does not grow the heap without bound."""
+    scheduler = HostScheduler(60, 600)
+    scheduler.sync(["a", "b"], 0)
+    for now in range(1000):
+        scheduler.mark_due("a", now + 1)
+    assert len(scheduler._heap) <= 2 * len(scheduler) + COMPACT_SLACK + 1
+    assert scheduler.pop_due(2000) == ["b", "a"]
@@ -0,0 +1,76 @@
+"""Tests for the domain-wide lookup dispatcher."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.noip_monitor import shared
+from custom_components.noip_monitor.models import HostStatus, ResponseCode
+from custom_components.noip_monitor.shared import SHARE_WINDOW, STAGGER_DELAY, LookupDispatcher
+
+from .conftest import FakeClock
+
+BACKEND = "dns:127.0.0.1:53"
+
+
+@pytest.fixture(autouse=True)
+def _fake_time(monkeypatch: pytest.MonkeyPatch, clock: FakeClock) -> None:
+    """Run the dispatcher on the fake clock."""
+    monkeypatch.setattr(shared, "time", clock)
+
+
+class CountingFetch:
+    """Fetch callback that answers every hostname and counts the lookups."""
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        self.hostnames: list[str] = []
+
+    async def __call__(self, hostnames: list[str]) -> dict[str, HostStatus]:
+        """Answer the hostnames."""
+        self.hostnames.extend(hostnames)
+        return {h: HostStatus(h, ResponseCode.DNS, ip="10.0.0.1") for h in hostnames}
+
+
+def test_start_slots_are_staggered_and_reused() -> None:
+    """Entries get consecutive start slots, and released slots are reused."""
+    dispatcher = LookupDispatcher()
+    assert [dispatcher.register(entry) for entry in "abc"] == [
+        0,
+        STAGGER_DELAY,
+        2 * STAGGER_DELAY,
+    ]
+    dispatcher.unregister("b")
+    assert dispatcher.register("d") == STAGGER_DELAY
+
+
+def test_every_staggered_entry_shares_one_lookup(clock: FakeClock) -> None:
+    """The last staggered entry still reuses what the first one fetched."""
+    fetch = CountingFetch()
+
+    async def run() -> None:
+        dispatcher = LookupDispatcher()
+        delays = [dispatcher.register(entry) for entry in ("a", "b", "c")]
+        for delay in delays:
+            clock.now = 1000 + delay
+            await dispatcher.async_fetch(BACKEND, ["host.ddns.net"], fetch)
+
+    asyncio.run(run())
+    assert fetch.hostnames == ["host.ddns.net"]
+
+
+def test_results_expire_after_the_window(clock: FakeClock) -> None:
+    """Results older than the window are fetched again, and unshared lookups skip them."""
+    fetch = CountingFetch()
+
+    async def run() -> None:
+        dispatcher = LookupDispatcher()
+        dispatcher.register("a")
+        await dispatcher.async_fetch(BACKEND, ["host.ddns.net"], fetch)
+        await dispatcher.async_fetch(BACKEND, ["host.ddns.net"], fetch, share=False)
+        clock.advance(SHARE_WINDOW)
+        await dispatcher.async_fetch(BACKEND, ["host.ddns.net"], fetch)
+
+    asyncio.run(run())
+    assert fetch.hostnames == ["host.ddns.net"] * 3